@@ -0,0 +1,38 @@
+"""Unique (user_id, symbol) on watchlist_items and composite index on alerts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-02-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Databases created by create_all after the models gained these
+    # constraints already have them
+    inspector = sa.inspect(op.get_bind())
+    unique = {c["name"] for c in inspector.get_unique_constraints("watchlist_items")}
+    if "uq_watchlist_items_user_id_symbol" not in unique:
+        # The old SELECT-then-INSERT add path was racy, so keep the oldest row
+        # of any duplicate (user_id, symbol) pair before enforcing uniqueness
+        op.execute(
+            "DELETE FROM watchlist_items WHERE id NOT IN "
+            "(SELECT MIN(id) FROM watchlist_items GROUP BY user_id, symbol)"
+        )
+        with op.batch_alter_table("watchlist_items") as batch_op:
+            batch_op.create_unique_constraint(
+                "uq_watchlist_items_user_id_symbol", ["user_id", "symbol"]
+            )
+
+    if "ix_alerts_user_id_symbol" not in {i["name"] for i in inspector.get_indexes("alerts")}:
+        op.create_index("ix_alerts_user_id_symbol", "alerts", ["user_id", "symbol"])
+
+def downgrade():
+    op.drop_index("ix_alerts_user_id_symbol", table_name="alerts")
+    with op.batch_alter_table("watchlist_items") as batch_op:
+        batch_op.drop_constraint("uq_watchlist_items_user_id_symbol", type_="unique")
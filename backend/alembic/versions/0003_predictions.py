@@ -0,0 +1,36 @@
+"""Predictions table written by the nightly precompute job
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-03-03 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Databases created by create_all after the model was added already
+    # have the table
+    if "predictions" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "predictions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("window", sa.String(), nullable=False),
+        sa.Column("as_of", sa.DateTime(), nullable=False),
+        sa.Column("delta_pct", sa.Float(), nullable=False),
+        sa.Column("confidence", sa.Float(), nullable=False),
+        sa.Column("model_type", sa.String(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("symbol", "window", "as_of", name="uq_predictions_symbol_window_as_of"),
+    )
+
+def downgrade():
+    op.drop_table("predictions")
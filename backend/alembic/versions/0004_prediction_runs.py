@@ -0,0 +1,32 @@
+"""Prediction runs table marking claimed and completed precompute days
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-03-10 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Databases created by create_all after the model was added already
+    # have the table
+    if "prediction_runs" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "prediction_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("as_of", sa.DateTime(), nullable=False),
+        sa.Column("model_version", sa.String(), nullable=False),
+        sa.Column("heartbeat_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("as_of", "model_version", name="uq_prediction_runs_as_of_model_version"),
+    )
+
+def downgrade():
+    op.drop_table("prediction_runs")
@@ -0,0 +1,31 @@
+"""Worker leases table electing one worker per background job
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-03-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Databases created by create_all after the model was added already
+    # have the table
+    if "worker_leases" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "worker_leases",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("holder", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+
+def downgrade():
+    op.drop_table("worker_leases")
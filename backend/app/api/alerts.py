@@ -1,30 +1,33 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.user import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.schemas.auth import User as UserSchema
 from app.models.alert import Alert
 from app.schemas.alert import AlertResponse, AlertCreate, Alert as AlertSchema
 from app.core.deps import get_current_user
+from app.core.responses import fast_json
+from app.services.alert_index import AlertThresholdIndex
 
 router = APIRouter()
+alert_index = AlertThresholdIndex()
 
 @router.get("", response_model=AlertResponse)
 async def get_alerts(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's alerts"""
-    alerts = db.query(Alert).filter(
-        Alert.user_id == current_user.id
-    ).all()
+    result = await db.execute(select(Alert).where(Alert.user_id == current_user.id))
+    alerts = result.scalars().all()
     
-    return AlertResponse(items=[AlertSchema.from_orm(alert) for alert in alerts])
+    return fast_json(AlertResponse(items=[AlertSchema.model_validate(alert) for alert in alerts]))
 
 @router.post("", response_model=AlertSchema)
 async def create_alert(
     alert_data: AlertCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new alert"""
     # Validate rule structure
@@ -43,22 +46,24 @@ async def create_alert(
     )
     
     db.add(new_alert)
-    db.commit()
-    db.refresh(new_alert)
+    await db.commit()
+    await db.refresh(new_alert)
+    alert_index.add(new_alert.id, new_alert.symbol, new_alert.rule)
     
     return AlertSchema.from_orm(new_alert)
 
 @router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_alert(
     alert_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete an alert"""
-    alert = db.query(Alert).filter(
+    result = await db.execute(select(Alert).where(
         Alert.id == alert_id,
         Alert.user_id == current_user.id
-    ).first()
+    ))
+    alert = result.scalars().first()
     
     if not alert:
         raise HTTPException(
@@ -66,6 +71,7 @@ async def delete_alert(
             detail="Alert not found"
         )
     
-    db.delete(alert)
-    db.commit()
+    await db.delete(alert)
+    await db.commit()
+    alert_index.remove(alert_id)
 
@@ -1,51 +1,97 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.user import User
 from app.schemas.auth import UserLogin, Token, User as UserSchema
-from app.core.security import verify_password, create_access_token
+from app.core.executor import ExecutorSaturated
+from app.core.security import verify_password_async, get_password_hash_async, create_access_token
 from app.core.deps import get_current_user
 from datetime import timedelta
 from app.core.config import settings
 
 router = APIRouter()
 
+def _saturated() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent logins, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+def _invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 @router.post("/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token"""
     # For demo purposes, create a default user if none exists
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    result = await db.execute(select(User).where(User.email == user_credentials.email))
+    user = result.scalar_one_or_none()
+    if user:
+        user_data = UserSchema.from_orm(user)
+        hashed_password = user.hashed_password
+    # Return the pooled connection while bcrypt runs, so concurrent logins
+    # waiting on the hash pool cannot exhaust the connection pool
+    await db.rollback()
+    
+    # bcrypt runs in the password hash pool so the event loop stays responsive
+    try:
+        if not user:
+            hashed_password = await get_password_hash_async(user_credentials.password)
+        else:
+            password_ok = await verify_password_async(user_credentials.password, hashed_password)
+    except ExecutorSaturated:
+        raise _saturated()
     
     if not user:
         # Create demo user
-        from app.core.security import get_password_hash
         user = User(
             email=user_credentials.email,
-            hashed_password=get_password_hash(user_credentials.password)
+            hashed_password=hashed_password
         )
         db.add(user)
-        db.commit()
-        db.refresh(user)
-    elif not verify_password(user_credentials.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        try:
+            await db.commit()
+        except IntegrityError:
+            # A concurrent first login for the same email created the user
+            # while this one was hashing; check against the stored hash
+            await db.rollback()
+            result = await db.execute(select(User).where(User.email == user_credentials.email))
+            user = result.scalar_one()
+            user_data = UserSchema.from_orm(user)
+            hashed_password = user.hashed_password
+            await db.rollback()
+            try:
+                password_ok = await verify_password_async(user_credentials.password, hashed_password)
+            except ExecutorSaturated:
+                raise _saturated()
+            if not password_ok:
+                raise _invalid_credentials()
+        else:
+            await db.refresh(user)
+            user_data = UserSchema.from_orm(user)
+    elif not password_ok:
+        raise _invalid_credentials()
     
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id)}, expires_delta=access_token_expires
+        data={"sub": str(user_data.id)}, expires_delta=access_token_expires
     )
     
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user": UserSchema.from_orm(user)
+        "user": user_data
     }
 
 @router.get("/me", response_model=UserSchema)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: UserSchema = Depends(get_current_user)):
     """Get current user information"""
-    return UserSchema.from_orm(current_user)
+    return current_user
 
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.deps import get_stream_user
+from app.core.pubsub import PubSub, load_broker, prediction_topic, user_topic
+from app.db.session import get_async_db
+from app.models.watchlist import WatchlistItem
+from app.schemas.auth import User as UserSchema
+from app.services.prediction_precompute import load_precomputed
+from app.services.prediction_service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+pubsub = PubSub(load_broker(settings.PUBSUB_BROKER), queue_size=settings.PUBSUB_QUEUE_SIZE)
+
+async def _event_stream(topics: List[str]) -> AsyncIterator[str]:
+    """Relay events for topics until the client disconnects"""
+    subscription = pubsub.subscribe(topics)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    subscription.get(), timeout=settings.SSE_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment frames keep proxies from closing idle connections
+                yield ": keepalive\n\n"
+                continue
+            dropped = subscription.take_dropped()
+            if dropped:
+                # The client fell behind and lost the oldest events; it
+                # should refetch state instead of relying on the stream
+                yield pubsub.encode("lagged", {"dropped": dropped})
+            yield message
+    finally:
+        pubsub.unsubscribe(subscription)
+
+@router.get("/events")
+async def stream_events(
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols for prediction refreshes; defaults to the watchlist"),
+    current_user: UserSchema = Depends(get_stream_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stream alert triggers and prediction refreshes as server-sent events"""
+    if symbols is None:
+        result = await db.execute(
+            select(WatchlistItem.symbol).where(WatchlistItem.user_id == current_user.id)
+        )
+        symbol_list = list(result.scalars())
+    else:
+        symbol_list = [symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()]
+    # The session stays open for the lifetime of the stream, so hand its
+    # connection back to the pool now
+    await db.close()
+
+    await pubsub.start()
+    topics = [user_topic(current_user.id)] + [prediction_topic(symbol) for symbol in symbol_list]
+    return StreamingResponse(
+        _event_stream(topics),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def publish_prediction_refreshes(
+    prediction_service: PredictionService, session_factory: Optional[async_sessionmaker] = None
+) -> int:
+    """
+    Push the current 1d prediction to local subscribers of each symbol.
+    Every worker computes the (deterministic) predictions for its own
+    subscribers, so these events bypass the broker. Uncached symbols are
+    served from the precomputed table when session_factory is given, and
+    the rest are scored in one batch off the event loop.
+    """
+    topics = list(pubsub.topics("prediction:"))
+    if not topics:
+        return 0
+    symbols = [topic.split(":", 1)[1] for topic in topics]
+    now = datetime.now()
+    if session_factory is not None:
+        missing = prediction_service.missing(symbols, ("1d",), now)
+        if missing:
+            async with session_factory() as db:
+                await load_precomputed(db, prediction_service, missing, ("1d",), now)
+    loop = asyncio.get_running_loop()
+    items = await loop.run_in_executor(
+        None, prediction_service.get_predictions_batch, symbols, ("1d",), now
+    )
+    for topic, item in zip(topics, items):
+        pubsub.publish_local(topic, "prediction", item)
+    return len(topics)
+
+async def run_prediction_refreshes(
+    prediction_service: PredictionService, session_factory: Optional[async_sessionmaker] = None
+):
+    """Publish prediction refreshes after every daily rollover until cancelled"""
+    while True:
+        delay = prediction_service.next_rollover(datetime.now()) - time.time()
+        await asyncio.sleep(max(delay, 0) + 1)
+        try:
+            await publish_prediction_refreshes(prediction_service, session_factory)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Prediction refresh failed")
@@ -1,22 +1,68 @@
-from fastapi import APIRouter, Query, HTTPException, status
-from typing import Optional
-from app.schemas.news import NewsResponse
-from app.services.news_service import NewsService
+from fastapi import APIRouter, Query, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from app.core.http_cache import conditional_response
+from app.core.responses import fast_json
+from typing import Iterator, List, Optional
+from app.schemas.news import NewsItem, NewsResponse
+from app.services.news_service import NewsService, NewsCursor, decode_cursor, encode_cursor
 
 router = APIRouter()
 news_service = NewsService()
 
+def _parse_cursor(before: Optional[str]) -> Optional[NewsCursor]:
+    """Decode the opaque pagination cursor, rejecting malformed values"""
+    if before is None:
+        return None
+    try:
+        return decode_cursor(before)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def _next_cursor(items: List[NewsItem], limit: int) -> Optional[str]:
+    """A full page may have more items after it"""
+    return encode_cursor(items[-1]) if len(items) == limit else None
+
+def _check_not_modified(
+    request: Request, response: Response, symbol: Optional[str], limit: int, before: Optional[str]
+) -> Optional[Response]:
+    """ETag/Cache-Control for a news page; a 304 response if the client has it"""
+    now = datetime.utcnow()
+    version = f"{news_service.version(now)}:{symbol or ''}:{limit}:{before or ''}"
+    return conditional_response(
+        request, response, version, max_age=news_service.seconds_until_rebuild(now)
+    )
+
+def _stream_ndjson(items: Iterator[NewsItem], limit: Optional[int]) -> Iterator[bytes]:
+    """Serialize items one line at a time as they are produced"""
+    for count, item in enumerate(items):
+        if limit is not None and count >= limit:
+            break
+        yield item.model_dump_json().encode() + b"\n"
+
 @router.get("/tickers/{symbol}/news", response_model=NewsResponse)
 async def get_symbol_news(
+    request: Request,
+    response: Response,
     symbol: str,
-    limit: int = Query(20, ge=1, le=100, description="Maximum number of news items to return")
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of news items to return"),
+    before: Optional[str] = Query(None, description="Cursor from a previous page's nextCursor")
 ):
     """Get news for a specific ticker symbol"""
+    cursor = _parse_cursor(before)
+    symbol = symbol.upper()
+    not_modified = _check_not_modified(request, response, symbol, limit, before)
+    if not_modified is not None:
+        return not_modified
     try:
-        symbol = symbol.upper()
-        news_items = news_service.get_symbol_news(symbol, limit)
+        news_items = news_service.get_symbol_news(symbol, limit, before=cursor)
         
-        return NewsResponse(symbol=symbol, items=news_items)
+        return fast_json(NewsResponse(
+            symbol=symbol, items=news_items, nextCursor=_next_cursor(news_items, limit)
+        ), response)
         
     except Exception as e:
         raise HTTPException(
@@ -24,20 +70,39 @@ async def get_symbol_news(
             detail=f"Error fetching news: {str(e)}"
         )
 
+@router.get("/tickers/{symbol}/news/stream")
+async def stream_symbol_news(
+    symbol: str,
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of news items to stream"),
+    before: Optional[str] = Query(None, description="Only stream items older than this cursor")
+):
+    """Stream news for a ticker symbol as newline-delimited JSON"""
+    cursor = _parse_cursor(before)
+    items = news_service.iter_news(symbol=symbol.upper(), before=cursor)
+    return StreamingResponse(_stream_ndjson(items, limit), media_type="application/x-ndjson")
+
 @router.get("/news", response_model=NewsResponse)
 async def get_global_news(
+    request: Request,
+    response: Response,
     limit: int = Query(50, ge=1, le=100, description="Maximum number of news items to return"),
-    symbol: Optional[str] = Query(None, description="Filter by symbol")
+    symbol: Optional[str] = Query(None, description="Filter by symbol"),
+    before: Optional[str] = Query(None, description="Cursor from a previous page's nextCursor")
 ):
     """Get global news feed with optional symbol filter"""
+    cursor = _parse_cursor(before)
+    symbol = symbol.upper() if symbol else None
+    not_modified = _check_not_modified(request, response, symbol, limit, before)
+    if not_modified is not None:
+        return not_modified
     try:
         if symbol:
-            symbol = symbol.upper()
-            news_items = news_service.get_symbol_news(symbol, limit)
-            return NewsResponse(symbol=symbol, items=news_items)
+            news_items = news_service.get_symbol_news(symbol, limit, before=cursor)
         else:
-            news_items = news_service.get_news(limit=limit)
-            return NewsResponse(items=news_items)
+            news_items = news_service.get_news(limit=limit, before=cursor)
+        return fast_json(NewsResponse(
+            symbol=symbol, items=news_items, nextCursor=_next_cursor(news_items, limit)
+        ), response)
             
     except Exception as e:
         raise HTTPException(
@@ -45,3 +110,13 @@ async def get_global_news(
             detail=f"Error fetching news: {str(e)}"
         )
 
+@router.get("/news/stream")
+async def stream_global_news(
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of news items to stream"),
+    symbol: Optional[str] = Query(None, description="Filter by symbol"),
+    before: Optional[str] = Query(None, description="Only stream items older than this cursor")
+):
+    """Stream the global news feed as newline-delimited JSON"""
+    cursor = _parse_cursor(before)
+    items = news_service.iter_news(symbol=symbol.upper() if symbol else None, before=cursor)
+    return StreamingResponse(_stream_ndjson(items, limit), media_type="application/x-ndjson")
@@ -1,33 +1,127 @@
-from fastapi import APIRouter, HTTPException, status, Query
-from app.schemas.prediction import PredictionResponse
-from app.services.prediction_service import PredictionService
+from datetime import datetime
+import time
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.batching import BatcherSaturated, MicroBatcher
+from app.core.config import settings
+from app.core.executor import BoundedExecutor
+from app.core.http_cache import conditional_response
+from app.core.singleflight import SingleFlight
+from app.db.session import get_async_db
+from app.core.responses import fast_json
+from app.schemas.prediction import (
+    PredictionResponse,
+    PredictionBatchRequest,
+    PredictionBatchResponse,
+)
+from app.services.prediction_precompute import load_precomputed
+from app.services.prediction_service import PredictionService, SUPPORTED_WINDOWS
 
 router = APIRouter()
 prediction_service = PredictionService()
+# Concurrent single-prediction cache misses are scored together
+prediction_batcher = MicroBatcher(
+    prediction_service.predict_many,
+    max_batch_size=settings.PREDICTION_BATCH_MAX_SIZE,
+    max_wait=settings.PREDICTION_BATCH_MAX_WAIT_MS / 1000,
+    max_queue=settings.PREDICTION_BATCH_MAX_QUEUE,
+    executor=BoundedExecutor(settings.PREDICTION_BATCH_WORKERS, max_queue=0, name="prediction-batch"),
+    name="prediction",
+) if settings.PREDICTION_BATCH_ENABLED else None
+# Identical misses share one table lookup, batcher queue slot and result
+prediction_flight = SingleFlight("prediction_requests")
+
+async def _resolve_prediction(db: AsyncSession, symbol: str, window: str, now: datetime):
+    """Serve a cache miss from the precomputed predictions, else score it live"""
+    found = await load_precomputed(db, prediction_service, [symbol], [window], now)
+    prediction = found.get((symbol, window))
+    if prediction is not None:
+        return prediction
+    if prediction_batcher is None:
+        return prediction_service.get_prediction(symbol, window, now)
+    return await prediction_batcher.submit((symbol, window, now))
+
+@router.post("/predictions", response_model=PredictionBatchResponse)
+async def get_predictions_batch(
+    request: PredictionBatchRequest, db: AsyncSession = Depends(get_async_db)
+):
+    """Get predictions for many ticker symbols and windows in one request"""
+    try:
+        symbols = [symbol.strip().upper() for symbol in request.symbols if symbol.strip()]
+        if not symbols:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one symbol is required"
+            )
+
+        now = datetime.now()
+        missing = prediction_service.missing(symbols, request.windows, now)
+        if missing:
+            await load_precomputed(db, prediction_service, missing, request.windows, now)
+        items = prediction_service.get_predictions_batch(symbols, request.windows, now)
+        return fast_json({"items": items})
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error generating predictions: {str(e)}"
+        )
 
 @router.get("/{symbol}/prediction", response_model=PredictionResponse)
 async def get_prediction(
+    request: Request,
+    response: Response,
     symbol: str,
-    window: str = Query("1d", description="Prediction window")
+    window: str = Query("1d", description="Prediction window"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get prediction for a ticker symbol"""
+    """
+    Get prediction for a ticker symbol, from the nightly precomputed table
+    when available. Responses carry an ETag and are cacheable until the
+    daily rollover; If-None-Match is answered with 304 without generating
+    the prediction.
+    """
     try:
         # Convert symbol to uppercase for consistency
         symbol = symbol.upper()
-        
+
         # Validate window parameter
-        if window not in ["1d", "1w", "1m"]:
+        if window not in SUPPORTED_WINDOWS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Window must be one of: 1d, 1w, 1m"
             )
+
+        now = datetime.now()
+        version = prediction_service.version(symbol, window, now)
+        not_modified = conditional_response(
+            request,
+            response,
+            version,
+            max_age=prediction_service.next_rollover(now) - time.time(),
+        )
+        if not_modified is not None:
+            return not_modified
         
-        prediction = prediction_service.get_prediction(symbol, window)
+        prediction = prediction_service.cached(symbol, window, now)
+        if prediction is None:
+            prediction = await prediction_flight.do(
+                version, _resolve_prediction, db, symbol, window, now
+            )
         return prediction
-        
+
+    except HTTPException:
+        raise
+    except BatcherSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many pending predictions, please retry",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error generating prediction: {str(e)}"
         )
-
@@ -1,66 +1,94 @@
+from typing import Dict, Iterable, List, Set, Tuple
+import re
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.models.user import User
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.schemas.auth import User as UserSchema
 from app.models.watchlist import WatchlistItem
-from app.schemas.watchlist import WatchlistResponse, WatchlistCreate
+from app.schemas.watchlist import (
+    WatchlistResponse,
+    WatchlistCreate,
+    WatchlistBulkRequest,
+    WatchlistBulkResponse,
+)
 from app.core.deps import get_current_user
 
 router = APIRouter()
 
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9.\-]{0,14}$")
+
+def _insert_watchlist_items(db: AsyncSession):
+    """
+    INSERT statement for watchlist_items that skips rows violating the
+    (user_id, symbol) unique constraint where the dialect supports it
+    """
+    dialect_insert = _UPSERT_DIALECTS.get(db.bind.dialect.name)
+    if dialect_insert is None:
+        return insert(WatchlistItem)
+    return dialect_insert(WatchlistItem).on_conflict_do_nothing(
+        index_elements=["user_id", "symbol"]
+    )
+
 @router.get("", response_model=WatchlistResponse)
 async def get_watchlist(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's watchlist"""
-    watchlist_items = db.query(WatchlistItem).filter(
-        WatchlistItem.user_id == current_user.id
-    ).all()
+    result = await db.execute(
+        select(WatchlistItem.symbol).where(WatchlistItem.user_id == current_user.id)
+    )
     
-    symbols = [item.symbol for item in watchlist_items]
+    symbols = list(result.scalars())
     return WatchlistResponse(items=symbols)
 
 @router.post("", status_code=status.HTTP_200_OK)
 async def add_to_watchlist(
     watchlist_item: WatchlistCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add symbol to user's watchlist"""
-    # Check if already in watchlist
-    existing = db.query(WatchlistItem).filter(
-        WatchlistItem.user_id == current_user.id,
-        WatchlistItem.symbol == watchlist_item.symbol.upper()
-    ).first()
-    
-    if existing:
+    # One conflict-handled INSERT instead of SELECT-then-INSERT: the unique
+    # (user_id, symbol) constraint decides whether the symbol is new
+    try:
+        result = await db.execute(
+            _insert_watchlist_items(db).values(
+                user_id=current_user.id,
+                symbol=watchlist_item.symbol.upper()
+            )
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        added = False
+    else:
+        added = result.rowcount > 0
+
+    if not added:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Symbol already in watchlist"
         )
-    
-    # Add to watchlist
-    new_item = WatchlistItem(
-        user_id=current_user.id,
-        symbol=watchlist_item.symbol.upper()
-    )
-    db.add(new_item)
-    db.commit()
-    
+
     return {"message": "Symbol added to watchlist"}
 
 @router.delete("/{symbol}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_from_watchlist(
     symbol: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove symbol from user's watchlist"""
-    watchlist_item = db.query(WatchlistItem).filter(
+    result = await db.execute(select(WatchlistItem).where(
         WatchlistItem.user_id == current_user.id,
         WatchlistItem.symbol == symbol.upper()
-    ).first()
+    ))
+    watchlist_item = result.scalars().first()
     
     if not watchlist_item:
         raise HTTPException(
@@ -68,6 +96,130 @@ async def remove_from_watchlist(
             detail="Symbol not found in watchlist"
         )
     
-    db.delete(watchlist_item)
-    db.commit()
+    await db.delete(watchlist_item)
+    await db.commit()
+
+def _validate_symbols(symbols: Iterable[str]) -> Tuple[List[str], List[Dict[str, str]]]:
+    """
+    Normalize and validate requested symbols in one pass.
+    
+    Returns the distinct valid symbols in request order, and one result per
+    requested symbol where valid ones have no status yet.
+    """
+    valid = []
+    seen = set()
+    results = []
+    for raw in symbols:
+        symbol = raw.strip().upper()
+        if not _SYMBOL_PATTERN.match(symbol):
+            results.append({"symbol": raw, "status": "invalid"})
+        elif symbol in seen:
+            results.append({"symbol": symbol, "status": "duplicate"})
+        else:
+            seen.add(symbol)
+            valid.append(symbol)
+            results.append({"symbol": symbol, "status": None})
+    return valid, results
+
+def _fill_results(results: List[Dict[str, str]], statuses: Dict[str, str]) -> Dict:
+    for result in results:
+        if result["status"] is None:
+            result["status"] = statuses[result["symbol"]]
+    return {"results": results}
 
+async def _existing_symbols(db: AsyncSession, user_id: int, symbols: List[str] = None) -> Set[str]:
+    query = select(WatchlistItem.symbol).where(WatchlistItem.user_id == user_id)
+    if symbols is not None:
+        query = query.where(WatchlistItem.symbol.in_(symbols))
+    result = await db.execute(query)
+    return set(result.scalars())
+
+async def _bulk_insert(db: AsyncSession, user_id: int, symbols: List[str]) -> Set[str]:
+    """Insert symbols for user with one executemany; return those actually added"""
+    if not symbols:
+        return set()
+    rows = [{"user_id": user_id, "symbol": symbol} for symbol in symbols]
+    if db.bind.dialect.name in _UPSERT_DIALECTS and db.bind.dialect.insert_executemany_returning:
+        # Conflicting rows are skipped and not returned
+        result = await db.execute(
+            _insert_watchlist_items(db).returning(WatchlistItem.symbol), rows
+        )
+        return set(result.scalars())
+    
+    existing = await _existing_symbols(db, user_id, symbols)
+    rows = [row for row in rows if row["symbol"] not in existing]
+    if rows:
+        await db.execute(insert(WatchlistItem), rows)
+    return {row["symbol"] for row in rows}
+
+async def _bulk_delete(db: AsyncSession, user_id: int, symbols: Iterable[str]) -> Set[str]:
+    """Delete symbols for user with one DELETE; return those actually removed"""
+    symbols = list(symbols)
+    if not symbols:
+        return set()
+    statement = delete(WatchlistItem).where(
+        WatchlistItem.user_id == user_id,
+        WatchlistItem.symbol.in_(symbols)
+    )
+    if db.bind.dialect.delete_returning:
+        result = await db.execute(statement.returning(WatchlistItem.symbol))
+        return set(result.scalars())
+    
+    existing = await _existing_symbols(db, user_id, symbols)
+    await db.execute(statement)
+    return existing
+
+@router.post("/bulk/add", response_model=WatchlistBulkResponse)
+async def bulk_add_to_watchlist(
+    request: WatchlistBulkRequest,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Add many symbols to user's watchlist in one transaction"""
+    symbols, results = _validate_symbols(request.symbols)
+    added = await _bulk_insert(db, current_user.id, symbols)
+    await db.commit()
+    
+    statuses = {symbol: "added" if symbol in added else "exists" for symbol in symbols}
+    return _fill_results(results, statuses)
+
+@router.post("/bulk/remove", response_model=WatchlistBulkResponse)
+async def bulk_remove_from_watchlist(
+    request: WatchlistBulkRequest,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Remove many symbols from user's watchlist in one transaction"""
+    symbols, results = _validate_symbols(request.symbols)
+    removed = await _bulk_delete(db, current_user.id, symbols)
+    await db.commit()
+    
+    statuses = {symbol: "removed" if symbol in removed else "not_found" for symbol in symbols}
+    return _fill_results(results, statuses)
+
+@router.put("", response_model=WatchlistBulkResponse)
+async def replace_watchlist(
+    request: WatchlistBulkRequest,
+    current_user: UserSchema = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Replace user's watchlist with the given symbols in one transaction.
+    
+    Symbols no longer listed are reported with status "removed" after the
+    requested ones.
+    """
+    symbols, results = _validate_symbols(request.symbols)
+    existing = await _existing_symbols(db, current_user.id)
+    wanted = set(symbols)
+    
+    removed = await _bulk_delete(db, current_user.id, sorted(existing - wanted))
+    added = await _bulk_insert(db, current_user.id, [s for s in symbols if s not in existing])
+    await db.commit()
+    
+    statuses = {symbol: "added" if symbol in added else "exists" for symbol in symbols}
+    response = _fill_results(results, statuses)
+    response["results"].extend(
+        {"symbol": symbol, "status": "removed"} for symbol in sorted(removed)
+    )
+    return response
@@ -0,0 +1,118 @@
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional, Sequence, Set, Tuple
+import asyncio
+import time
+from app.core.executor import BoundedExecutor
+from app.core.metrics import batch_queue_depth, batch_rejected, batch_size, batch_wait
+
+class BatcherSaturated(RuntimeError):
+    """Raised when a MicroBatcher's queue is full"""
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-item calls into batched calls.
+
+    ``submit(item)`` queues the item and waits for its result. A batch is
+    dispatched once ``max_batch_size`` items are queued or ``max_wait``
+    seconds after the first one arrived, and ``process(items)`` must return
+    one result per item in order. Batches run in ``executor`` if given
+    (inline on the event loop otherwise), at most one per worker; while all
+    workers are busy, items keep queueing, so batches grow under load. At
+    most ``max_queue`` items wait, further submits fail fast with
+    BatcherSaturated. An exception from ``process`` fails every item in its
+    batch.
+    """
+
+    def __init__(
+        self,
+        process: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait: float = 0.002,
+        max_queue: int = 1024,
+        executor: Optional[BoundedExecutor] = None,
+        name: str = "batcher",
+    ):
+        self.process = process
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.max_queue = max_queue
+        self.executor = executor if executor is not None and executor.max_workers > 0 else None
+        self.name = name
+        self._concurrency = self.executor.max_workers if self.executor is not None else 1
+        self._pending: Deque[Tuple[Any, asyncio.Future, float]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = 0
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue item and return its result once its batch has run"""
+        if len(self._pending) >= self.max_queue:
+            batch_rejected.inc(self.name)
+            raise BatcherSaturated("Too many queued items")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        batch_queue_depth.set(self.name, value=len(self._pending))
+        if len(self._pending) >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._on_timer)
+        return await future
+
+    def _on_timer(self):
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self):
+        while self._pending and self._running < self._concurrency:
+            now = time.perf_counter()
+            batch = []
+            while self._pending and len(batch) < self.max_batch_size:
+                item, future, queued_at = self._pending.popleft()
+                # Skip callers that gave up (cancelled) while queued
+                if not future.done():
+                    batch.append((item, future))
+                    batch_wait.observe(now - queued_at, self.name)
+            if not batch:
+                continue
+            self._running += 1
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        batch_queue_depth.set(self.name, value=len(self._pending))
+        if not self._pending and self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+        batch_size.observe(len(items), self.name)
+        self.batches += 1
+        try:
+            if self.executor is not None:
+                results = await self.executor.run(self.process, items)
+            else:
+                results = self.process(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name} returned {len(results)} results for {len(items)} items")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._running -= 1
+            if self._pending:
+                # Items that queued while this batch ran have waited long enough
+                self._dispatch()
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._pending),
+            "running": self._running,
+            "batches": self.batches,
+        }
@@ -0,0 +1,116 @@
+from typing import Optional
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+_SKIP_CONTENT_TYPES = (b"text/event-stream", b"application/x-ndjson")
+
+def _accepted_encodings(header: bytes) -> set:
+    """Codings listed in Accept-Encoding, leaving out any with q=0"""
+    accepted = set()
+    for part in header.split(b","):
+        coding, *params = part.split(b";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.strip().partition(b"=")
+            if key == b"q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+class CompressionMiddleware:
+    """
+    Pure ASGI gzip/brotli compression for complete responses.
+
+    Only responses sent as a single body message of at least
+    ``minimum_size`` bytes are compressed; streamed responses (NDJSON,
+    server-sent events) pass through untouched so their chunks are not
+    held back. Brotli is used when the client accepts it and the optional
+    ``brotli`` package is installed, gzip otherwise. Compressed responses
+    get ``Vary: Accept-Encoding`` and their ETag is weakened, since the
+    bytes differ from the identity representation.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose(self, scope) -> Optional[bytes]:
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accepted = _accepted_encodings(value)
+                if brotli is not None and b"br" in accepted:
+                    return b"br"
+                if b"gzip" in accepted:
+                    return b"gzip"
+                return None
+        return None
+
+    def _compress(self, encoding: bytes, body: bytes) -> bytes:
+        if encoding == b"br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        return compressor.compress(body) + compressor.flush()
+
+    async def __call__(self, scope, receive, send):
+        encoding = self._choose(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", ())
+                skip = any(
+                    name == b"content-encoding"
+                    or (name == b"content-type" and value.startswith(_SKIP_CONTENT_TYPES))
+                    for name, value in headers
+                )
+                if skip:
+                    await send(message)
+                else:
+                    # Hold the headers until the first body shows whether
+                    # the response is complete and large enough
+                    start_message = message
+                return
+
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            held, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                await send(held)
+                await send(message)
+                return
+
+            compressed = self._compress(encoding, body)
+            headers = []
+            for name, value in held.get("headers", ()):
+                if name == b"content-length":
+                    continue
+                if name == b"etag" and not value.startswith(b"W/"):
+                    value = b"W/" + value
+                headers.append((name, value))
+            headers += [
+                (b"content-encoding", encoding),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", b"Accept-Encoding"),
+            ]
+            await send(dict(held, headers=headers))
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,15 +1,47 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     SECRET_KEY: str = "change_me_in_production"
     DATABASE_URL: str = "sqlite:///./feather.db"
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_SIZE: int = 10000
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:5174,http://localhost:5175,http://localhost:3000"
+    PREDICTION_CACHE_SIZE: int = 4096
+    PREDICTION_MODEL_PATH: Optional[str] = None
+    PRICE_STORE_PATH: Optional[str] = None
+    PRICE_STORE_MAX_OPEN: int = 4096
+    PREDICTION_BATCH_ENABLED: bool = True
+    PREDICTION_BATCH_MAX_SIZE: int = 64
+    PREDICTION_BATCH_MAX_WAIT_MS: float = 2.0
+    PREDICTION_BATCH_MAX_QUEUE: int = 1024
+    PREDICTION_BATCH_WORKERS: int = 1
+    PREDICTION_PRECOMPUTE_ENABLED: bool = False
+    PREDICTION_PRECOMPUTE_TIME: str = "22:00"
+    PREDICTION_PRECOMPUTE_BATCH_SIZE: int = 2000
+    PREDICTION_PRECOMPUTE_LEASE_SECONDS: int = 600
+    SENTIMENT_LEXICON_PATH: Optional[str] = None
+    ALERT_EVAL_INTERVAL_SECONDS: float = 60.0
+    ALERT_EVAL_BATCH_SIZE: int = 50000
+    ALERT_EVAL_LEASE_SECONDS: float = 180.0
+    PUBSUB_BROKER: Optional[str] = None
+    PUBSUB_QUEUE_SIZE: int = 100
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    METRICS_ENABLED: bool = True
     
     @property
     def cors_origins_list(self) -> List[str]:
-        return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
+        return [origin.strip() for origin in self.CORS_ORIGINS.split(",") if origin.strip()]
     
     class Config:
         env_file = ".env"
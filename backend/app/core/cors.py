@@ -0,0 +1,97 @@
+from typing import Iterable, List, Optional, Tuple
+
+Headers = List[Tuple[bytes, bytes]]
+
+_VARY_ORIGIN: Headers = [(b"vary", b"Origin")]
+
+class CORSMiddleware:
+    """
+    Pure ASGI CORS layer.
+
+    With a wildcard origin, requests without an Origin header pass straight
+    through; with an origin list they only gain ``Vary: Origin``. Preflight
+    requests are answered here without reaching the application, and other
+    cross-origin responses get their CORS headers appended to the
+    ``http.response.start`` message; the body is never touched or buffered,
+    so streaming responses are unaffected. All header values are encoded
+    once at startup. Credentials are not allowed, so ``"*"`` in
+    ``allow_origins`` admits every origin.
+    """
+
+    def __init__(
+        self,
+        app,
+        allow_origins: Iterable[str],
+        allow_methods: Iterable[str] = ("GET", "POST", "PUT", "DELETE", "OPTIONS"),
+        allow_headers: Iterable[str] = ("Content-Type", "Authorization", "X-Requested-With", "Accept", "Origin"),
+        expose_headers: Iterable[str] = ("ETag",),
+        max_age: int = 86400,
+    ):
+        self.app = app
+        origins = [origin.strip() for origin in allow_origins if origin.strip()]
+        self.allow_any_origin = "*" in origins
+        self.allow_origins = frozenset(origin.encode("latin-1") for origin in origins)
+        self.allow_methods = frozenset(method.upper().encode() for method in allow_methods)
+
+        self.response_headers: Headers = []
+        if expose_headers:
+            self.response_headers.append(
+                (b"access-control-expose-headers", ", ".join(expose_headers).encode())
+            )
+        self.preflight_headers: Headers = [
+            (b"access-control-allow-methods", b", ".join(sorted(self.allow_methods))),
+            (b"access-control-allow-headers", ", ".join(allow_headers).encode()),
+            (b"access-control-max-age", str(max_age).encode()),
+            (b"content-length", b"0"),
+        ]
+
+    def _origin_headers(self, origin: bytes) -> Optional[Headers]:
+        """Allow-Origin headers for origin, or None if it is not allowed"""
+        if self.allow_any_origin:
+            return [(b"access-control-allow-origin", b"*")]
+        if origin in self.allow_origins:
+            return [(b"access-control-allow-origin", origin), (b"vary", b"Origin")]
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        request_method = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                request_method = value
+
+        if origin is None:
+            if self.allow_any_origin:
+                await self.app(scope, receive, send)
+                return
+            # Responses differ by Origin, so shared caches must key on it
+            extra_headers = _VARY_ORIGIN
+        else:
+            origin_headers = self._origin_headers(origin)
+            if scope["method"] == "OPTIONS" and request_method is not None:
+                await self._preflight(origin_headers, request_method, send)
+                return
+            extra_headers = (
+                origin_headers + self.response_headers if origin_headers is not None else _VARY_ORIGIN
+            )
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + extra_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    async def _preflight(self, origin_headers: Optional[Headers], request_method: bytes, send):
+        if origin_headers is None or request_method.upper() not in self.allow_methods:
+            status, headers = 400, [(b"content-length", b"0")]
+        else:
+            status, headers = 200, origin_headers + self.preflight_headers
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
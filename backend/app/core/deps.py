@@ -1,18 +1,60 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import verify_token
+from sqlalchemy import event, select
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import verify_token, token_payload_cache
 from app.models.user import User
-from app.db.session import get_db
-from sqlalchemy.orm import Session
+from app.schemas.auth import User as UserSchema
+from app.db.session import get_async_db
+from sqlalchemy.ext.asyncio import AsyncSession
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-def get_current_user(
+# Snapshots (id, email, is_active) of authenticated users keyed by user id.
+# The cache is per process: invalidate_user only clears the local worker, and
+# other workers pick up changes once AUTH_CACHE_TTL_SECONDS has passed.
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user snapshot, e.g. after the user is deactivated"""
+    user_cache.pop(int(user_id))
+
+def clear_auth_cache() -> None:
+    """Drop all cached user snapshots and token payloads"""
+    user_cache.clear()
+    token_payload_cache.clear()
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> UserSchema:
     """Get the current authenticated user"""
-    token = credentials.credentials
+    return await _authenticate(credentials.credentials, db)
+
+async def get_stream_user(
+    access_token: Optional[str] = Query(None, description="Bearer token, for clients such as EventSource that cannot send headers"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+    db: AsyncSession = Depends(get_async_db)
+) -> UserSchema:
+    """Get the current user from the Authorization header or an access_token query parameter"""
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await _authenticate(token, db)
+
+async def _authenticate(token: str, db: AsyncSession) -> UserSchema:
     payload = verify_token(token)
     
     if payload is None:
@@ -22,21 +64,32 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user_id: int = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
     if user is None:
+        db_user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+        if db_user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user = UserSchema.model_validate(db_user)
+        user_cache.set(user.id, user)
+    
+    if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
+            detail="Inactive user",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
     return user
-
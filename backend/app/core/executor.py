@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+import asyncio
+import threading
+from app.core.metrics import executor_completed, executor_queued, executor_rejected, executor_running
+
+class ExecutorSaturated(RuntimeError):
+    """Raised when a BoundedExecutor's queue is full"""
+
+class BoundedExecutor:
+    """
+    Thread pool for blocking work called from async handlers.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a thread; further calls fail fast with ExecutorSaturated instead
+    of piling up. With ``max_workers=0`` calls run inline on the caller's
+    thread, which blocks the event loop and is only meant for comparison.
+    Occupancy and counters are published on ``/metrics`` labelled by ``name``.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str = "bounded"):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            if max_workers > 0 else None
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._queued = 0
+        self._running = 0
+        self.max_queued = 0
+        self.rejected = 0
+        self.completed = 0
+        # Create the series up front so idle pools still show on /metrics
+        executor_running.set(name, value=0)
+        executor_queued.set(name, value=0)
+        executor_rejected.inc(name, amount=0)
+        executor_completed.inc(name, amount=0)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args) in the pool and await its result"""
+        if self._executor is None:
+            self.completed += 1
+            executor_completed.inc(self.name)
+            return fn(*args)
+
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                executor_rejected.inc(self.name)
+                raise ExecutorSaturated("Too many pending tasks")
+            self._pending += 1
+            self._queued += 1
+            executor_queued.set(self.name, value=self._queued)
+            # Calls beyond the worker count must wait for a thread
+            self.max_queued = max(self.max_queued, self._pending - self.max_workers)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._call, fn, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                executor_completed.inc(self.name)
+
+    def _call(self, fn: Callable[..., Any], args: tuple) -> Any:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            executor_queued.set(self.name, value=self._queued)
+            executor_running.set(self.name, value=self._running)
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+                executor_running.set(self.name, value=self._running)
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of pool occupancy and counters"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": self._running,
+                "queued": self._queued,
+                "max_queued": self.max_queued,
+                "rejected": self.rejected,
+                "completed": self.completed,
+            }
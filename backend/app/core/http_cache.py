@@ -0,0 +1,43 @@
+from typing import Dict, Optional
+import hashlib
+from fastapi import Request, Response, status
+
+def make_etag(version: str) -> str:
+    """
+    Strong ETag for a response whose bytes are fully determined by version,
+    e.g. the inputs of a deterministic service call
+    """
+    return '"' + hashlib.blake2b(version.encode(), digest_size=12).hexdigest() + '"'
+
+def cache_headers(etag: str, max_age: int) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={max(int(max_age), 0)}"}
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match lists etag (weak comparison, RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+def conditional_response(
+    request: Request, response: Response, version: str, max_age: int
+) -> Optional[Response]:
+    """
+    Apply ETag and Cache-Control headers for version. Returns a 304 response
+    to send instead of the body when the client already has it, else None
+    after setting the headers on the endpoint's response.
+    """
+    etag = make_etag(version)
+    headers = cache_headers(etag, max_age)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
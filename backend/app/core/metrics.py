@@ -0,0 +1,350 @@
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow queries
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Route label for requests no route matched, so unknown paths cannot grow
+# the number of series
+UNMATCHED_ROUTE = "<unmatched>"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class _Metric:
+    """
+    Base for a metric family with a fixed set of label names.
+
+    Each label combination gets its own mutable child, created once; after
+    that an update is a dict lookup plus in-place arithmetic with no lock.
+    Updates come from several threads: the event loop, the micro-batcher
+    worker (``@timed`` on ``predict_many``) and sync-engine cursor events.
+    Two racing updates can lose an increment, so values are best-effort,
+    which monitoring tolerates.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> list:
+        raise NotImplementedError
+
+    def _child(self, labelvalues: Tuple[str, ...]) -> list:
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(labelvalues, self._new_child())
+        return child
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+class Counter(_Metric):
+    """Monotonic count per label combination"""
+
+    kind = "counter"
+
+    def _new_child(self) -> list:
+        return [0]
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._child(labelvalues)[0] += amount
+
+    def value(self, *labelvalues: str) -> float:
+        child = self._children.get(labelvalues)
+        return child[0] if child else 0
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(child[0])}"
+            for labels, child in list(self._children.items())
+        ]
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+
+    kind = "gauge"
+
+    def dec(self, *labelvalues: str, amount: float = 1) -> None:
+        self._child(labelvalues)[0] -= amount
+
+    def set(self, *labelvalues: str, value: float) -> None:
+        self._child(labelvalues)[0] = value
+
+class Histogram(_Metric):
+    """
+    Bucketed observations per label combination.
+
+    Observations are counted in their own bucket only; the cumulative
+    ``le`` counts Prometheus expects are summed at scrape time, so an
+    observation costs one bisect and two additions.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> list:
+        # Per-bucket counts, one overflow slot for +Inf, then the sum
+        return [0] * (len(self.buckets) + 1) + [0.0]
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        child = self._child(labelvalues)
+        child[bisect_left(self.buckets, value)] += 1
+        child[-1] += value
+
+    def count(self, *labelvalues: str) -> int:
+        child = self._children.get(labelvalues)
+        return sum(child[:-1]) if child else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        bounds = self.buckets + (float("inf"),)
+        for labels, child in list(self._children.items()):
+            child = list(child)
+            cumulative = 0
+            for bound, count in zip(bounds, child):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(child[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Named metric families rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered differently")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status",
+    ("method", "route", "status"),
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time until the response body is fully sent",
+    ("method", "route"),
+)
+http_in_flight = registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled", ("method",)
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time by operation",
+    ("operation",),
+)
+db_query_errors = registry.counter(
+    "db_query_errors_total", "SQL statements that raised, by operation", ("operation",)
+)
+service_call_duration = registry.histogram(
+    "service_call_duration_seconds", "Service method latency", ("service", "method"),
+)
+batch_size = registry.histogram(
+    "batcher_batch_size", "Items per dispatched micro-batch", ("batcher",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+batch_wait = registry.histogram(
+    "batcher_wait_seconds", "Time items queue before their batch starts", ("batcher",),
+)
+batch_queue_depth = registry.gauge(
+    "batcher_queue_depth", "Items waiting for a batch", ("batcher",)
+)
+batch_rejected = registry.counter(
+    "batcher_rejected_total", "Items rejected because the batch queue was full", ("batcher",)
+)
+executor_running = registry.gauge(
+    "executor_running", "Calls running on a BoundedExecutor thread", ("executor",)
+)
+executor_queued = registry.gauge(
+    "executor_queued", "Calls submitted to a BoundedExecutor but not yet started", ("executor",)
+)
+executor_rejected = registry.counter(
+    "executor_rejected_total", "Calls rejected because the executor queue was full", ("executor",)
+)
+executor_completed = registry.counter(
+    "executor_completed_total", "Calls finished by a BoundedExecutor", ("executor",)
+)
+singleflight_calls = registry.counter(
+    "singleflight_calls_total",
+    "Coalesced calls by role: leaders did the work, followers shared its result",
+    ("flight", "role"),
+)
+
+def timed(service: str, method: Optional[str] = None) -> Callable:
+    """Decorator recording a service method's latency in service_call_duration"""
+    def decorator(fn: Callable) -> Callable:
+        labels = (service, method or fn.__name__)
+        child = service_call_duration._child(labels)
+        buckets = service_call_duration.buckets
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                child[bisect_left(buckets, elapsed)] += 1
+                child[-1] += elapsed
+
+        return wrapper
+    return decorator
+
+def _operation(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "OTHER"
+
+def instrument_engine(engine) -> None:
+    """
+    Record per-statement timings and errors for a SQLAlchemy engine via
+    cursor execution events; pass ``async_engine.sync_engine`` for async
+    engines
+    """
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info["query_start"].pop()
+        db_query_duration.observe(time.perf_counter() - start, _operation(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        starts = context.connection.info.get("query_start") if context.connection else None
+        if starts:
+            starts.pop()
+        db_query_errors.inc(_operation(context.statement or ""))
+
+class MetricsMiddleware:
+    """
+    Pure ASGI request instrumentation.
+
+    Requests are labelled with the matched route's path template (e.g.
+    ``/api/tickers/{symbol}/prediction``) rather than the raw path, so the
+    number of series stays bounded. The template is looked up from the
+    endpoint the router stored in the scope, through a map built from the
+    application's routes on first use.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[Callable, str] = {}
+
+    def _route(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            application = scope.get("app")
+            for route in getattr(application, "routes", ()):
+                route_endpoint = getattr(route, "endpoint", None)
+                if route_endpoint is not None and hasattr(route, "path"):
+                    self._route_paths.setdefault(route_endpoint, route.path)
+            path = self._route_paths.setdefault(endpoint, UNMATCHED_ROUTE)
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec(method)
+            route = self._route(scope)
+            http_request_duration.observe(time.perf_counter() - start, method, route)
+            http_requests.inc(method, route, str(status_code))
@@ -0,0 +1,154 @@
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Set
+from collections import deque
+from datetime import datetime
+import asyncio
+import importlib
+import json
+
+Deliver = Callable[[str, str], None]
+
+def _json_default(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+def user_topic(user_id: int) -> str:
+    """Topic for events addressed to one user, such as triggered alerts"""
+    return f"user:{user_id}"
+
+def prediction_topic(symbol: str) -> str:
+    """Topic for refreshed predictions of one symbol"""
+    return f"prediction:{symbol}"
+
+class Subscription:
+    """
+    Bounded mailbox for one subscriber.
+
+    Publishers never wait on a subscriber: when the mailbox is full the
+    oldest message is dropped and counted in ``dropped``, so one slow client
+    cannot hold up delivery to the others. An idle subscription is a deque
+    and an Event, so a worker can keep thousands of them open cheaply.
+    """
+
+    def __init__(self, topics: Iterable[str], maxsize: int):
+        self.topics = frozenset(topics)
+        self.dropped = 0
+        self._messages: Deque[str] = deque()
+        self._maxsize = maxsize
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def put(self, message: str):
+        if len(self._messages) >= self._maxsize:
+            self._messages.popleft()
+            self.dropped += 1
+        self._messages.append(message)
+        self._ready.set()
+
+    async def get(self) -> str:
+        """Wait for and return the next message"""
+        while not self._messages:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._messages.popleft()
+
+    def take_dropped(self) -> int:
+        """Return and reset the number of messages dropped since the last call"""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+class LocalBroker:
+    """Broker for a single worker: published messages go straight to local subscribers"""
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def publish(self, topic: str, message: str):
+        self._deliver(topic, message)
+
+    async def stop(self):
+        pass
+
+class PubSub:
+    """
+    Topic-based fan-out of events to in-process subscribers.
+
+    Each event is encoded once, as a server-sent events frame, and handed to
+    the broker, which delivers it back to ``deliver`` in every worker;
+    subscribers then write the frame as is. LocalBroker covers a single
+    worker; a broker for several workers (Redis, NATS, Postgres
+    LISTEN/NOTIFY, ...) implements the same ``start(deliver)``,
+    ``publish(topic, message)`` and ``stop()`` coroutines and is selected
+    with the PUBSUB_BROKER setting.
+    """
+
+    def __init__(self, broker: Optional[Any] = None, queue_size: int = 100):
+        self.broker = broker or LocalBroker()
+        self.queue_size = queue_size
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._started = False
+
+    async def start(self):
+        if not self._started:
+            await self.broker.start(self.deliver)
+            self._started = True
+
+    async def stop(self):
+        if self._started:
+            await self.broker.stop()
+            self._started = False
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, self.queue_size)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def has_subscribers(self, topic: str) -> bool:
+        return topic in self._topics
+
+    def topics(self, prefix: str = "") -> Set[str]:
+        """Return the topics with local subscribers, optionally filtered by prefix"""
+        return {topic for topic in self._topics if topic.startswith(prefix)}
+
+    @staticmethod
+    def encode(event_type: str, data: Dict[str, Any]) -> str:
+        payload = json.dumps(data, default=_json_default, separators=(",", ":"))
+        return f"event: {event_type}\ndata: {payload}\n\n"
+
+    async def publish(self, topic: str, event_type: str, data: Dict[str, Any]):
+        """Publish an event to subscribers of topic in every worker"""
+        await self.start()
+        await self.broker.publish(topic, self.encode(event_type, data))
+
+    def publish_local(self, topic: str, event_type: str, data: Dict[str, Any]):
+        """Publish an event to subscribers of topic in this worker only"""
+        self.deliver(topic, self.encode(event_type, data))
+
+    def deliver(self, topic: str, message: str):
+        """Hand an already-encoded message to every local subscriber of topic"""
+        for subscription in self._topics.get(topic, ()):
+            subscription.put(message)
+
+    def stats(self) -> Dict[str, int]:
+        subscriptions = set().union(*self._topics.values()) if self._topics else set()
+        return {
+            "topics": len(self._topics),
+            "subscriptions": len(subscriptions),
+            "queued": sum(len(subscription) for subscription in subscriptions),
+        }
+
+def load_broker(path: Optional[str]) -> Any:
+    """Instantiate the broker class named by a "module:Class" path, or LocalBroker"""
+    if not path:
+        return LocalBroker()
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
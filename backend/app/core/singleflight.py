@@ -0,0 +1,76 @@
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+import threading
+from app.core.metrics import singleflight_calls
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight calls.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive with the same key while it runs wait for and share its result or
+    exception instead of repeating the work. The key is forgotten as soon as
+    the call finishes, so nothing is cached: later callers run it again.
+    ``call`` is for blocking functions and may be used from any thread,
+    ``do`` is for coroutine functions on the event loop. Shared results must
+    not be mutated.
+    """
+
+    def __init__(self, name: str = "singleflight"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def call(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn(*args), or wait for the identical call already running"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            self._count("follower")
+            return future.result()
+
+        self._count("leader")
+        try:
+            result = fn(*args)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Await fn(*args), or the identical call already running"""
+        task = self._tasks.get(key)
+        if task is None:
+            self._count("leader")
+            task = self._tasks[key] = asyncio.ensure_future(fn(*args))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        else:
+            self._count("follower")
+        # A caller that is cancelled must not cancel the work others share
+        return await asyncio.shield(task)
+
+    def _count(self, role: str):
+        if role == "leader":
+            self.leaders += 1
+        else:
+            self.followers += 1
+        singleflight_calls.inc(self.name, role)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": len(self._calls) + len(self._tasks),
+            "leaders": self.leaders,
+            "followers": self.followers,
+        }
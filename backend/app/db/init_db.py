@@ -1,7 +1,43 @@
+import os
+from alembic import command
+from alembic.config import Config
+from typing import Optional
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
 from app.db.session import engine, Base
-from app.models import user, watchlist, alert  # noqa: F401 - Imported to register models with SQLAlchemy
+from app.models import user, watchlist, alert, prediction, lease  # noqa: F401 - Imported to register models with SQLAlchemy
 
-def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+ALEMBIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "alembic")
 
+# Revision matching the schema create_all produced before migrations existed
+BASELINE_REVISION = "0001"
+
+def alembic_config(bind: Engine) -> Config:
+    """Alembic configuration for the application's database"""
+    config = Config()
+    config.set_main_option("script_location", ALEMBIC_DIR)
+    # ConfigParser interpolates "%", which URL-encoded passwords may contain
+    url = bind.url.render_as_string(hide_password=False)
+    config.set_main_option("sqlalchemy.url", url.replace("%", "%%"))
+    return config
+
+def init_db(bind: Optional[Engine] = None):
+    """
+    Create or upgrade the database schema with the Alembic migrations.
+
+    Databases created by create_all before migrations existed have tables but
+    no alembic_version; they are stamped at the baseline revision first, so
+    the upgrade adds what later revisions introduced (such as the unique
+    watchlist constraint). In-memory SQLite cannot be shared with Alembic's
+    connection and gets create_all instead.
+    """
+    bind = bind or engine
+    if bind.url.get_backend_name() == "sqlite" and bind.url.database in (None, "", ":memory:"):
+        Base.metadata.create_all(bind=bind)
+        return
+
+    tables = set(inspect(bind).get_table_names())
+    config = alembic_config(bind)
+    if tables and "alembic_version" not in tables:
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
@@ -1,8 +1,16 @@
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from app.api import auth, tickers, news, watchlist, alerts
+import asyncio
+from datetime import time
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from app.api import auth, tickers, news, watchlist, alerts, events
 from app.db.init_db import init_db
+from app.db.session import AsyncSessionLocal
+from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.cors import CORSMiddleware
+from app.core import metrics
+from app.services.alert_evaluator import AlertEvaluator
+from app.services.prediction_precompute import PredictionPrecomputer
 
 app = FastAPI(
     title="Feather API",
@@ -12,44 +20,18 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
-# Bulletproof CORS configuration - this WILL work
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=False,  # Set to False to allow wildcard origins
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-)
+# Compress complete responses of at least COMPRESSION_MIN_SIZE bytes;
+# streamed responses pass through
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
 
-# Additional CORS middleware for complete coverage
-@app.middleware("http")
-async def add_cors_headers(request: Request, call_next):
-    """Add CORS headers to all responses"""
-    # Handle preflight OPTIONS requests
-    if request.method == "OPTIONS":
-        response = JSONResponse(
-            content={},
-            headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Accept, Origin",
-                "Access-Control-Max-Age": "86400",
-            }
-        )
-        return response
-    
-    # Process the request
-    response = await call_next(request)
-    
-    # Add CORS headers to all responses
-    response.headers["Access-Control-Allow-Origin"] = "*"
-    response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
-    response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization, X-Requested-With, Accept, Origin"
-    # Removed Access-Control-Allow-Credentials to fix CORS wildcard issue
-    response.headers["Access-Control-Max-Age"] = "86400"
-    
-    return response
+# Single pure-ASGI CORS layer; it answers preflights itself and never
+# buffers or re-wraps response bodies
+app.add_middleware(CORSMiddleware, allow_origins=settings.cors_origins_list)
+
+# Outermost, so request timings include CORS and compression
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
 
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -57,11 +39,43 @@ app.include_router(tickers.router, prefix="/api/tickers", tags=["tickers"])
 app.include_router(news.router, prefix="/api", tags=["news"])
 app.include_router(watchlist.router, prefix="/api/watchlist", tags=["watchlist"])
 app.include_router(alerts.router, prefix="/api/alerts", tags=["alerts"])
+app.include_router(events.router, prefix="/api", tags=["events"])
+
+alert_evaluator = AlertEvaluator(
+    tickers.prediction_service, index=alerts.alert_index, pubsub=events.pubsub
+)
+prediction_precomputer = PredictionPrecomputer(tickers.prediction_service)
+background_tasks = []
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database, load the alert index and start background tasks on startup"""
     init_db()
+    async with AsyncSessionLocal() as db:
+        await alerts.alert_index.load(db)
+    await events.pubsub.start()
+    background_tasks.append(
+        asyncio.create_task(
+            events.run_prediction_refreshes(tickers.prediction_service, AsyncSessionLocal)
+        )
+    )
+    if settings.ALERT_EVAL_INTERVAL_SECONDS > 0:
+        alert_evaluator.start(AsyncSessionLocal, settings.ALERT_EVAL_INTERVAL_SECONDS)
+    if settings.PREDICTION_PRECOMPUTE_ENABLED:
+        prediction_precomputer.start(
+            AsyncSessionLocal, time.fromisoformat(settings.PREDICTION_PRECOMPUTE_TIME)
+        )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks"""
+    await alert_evaluator.stop()
+    await prediction_precomputer.stop()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await events.pubsub.stop()
 
 @app.get("/")
 async def root():
@@ -69,4 +83,9 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Request, database and service metrics in the Prometheus text format"""
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.session import Base
+
+class WorkerLease(Base):
+    """Lease that lets one worker at a time run a named background job"""
+    __tablename__ = "worker_leases"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+    holder = Column(String, nullable=False)
+    expires_at = Column(DateTime, nullable=False)  # Naive UTC
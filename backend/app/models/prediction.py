@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from app.db.session import Base
+from datetime import datetime
+
+class Prediction(Base):
+    __tablename__ = "predictions"
+    # Also serves as the index for serving lookups and per-symbol history
+    __table_args__ = (
+        UniqueConstraint("symbol", "window", "as_of", name="uq_predictions_symbol_window_as_of"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    symbol = Column(String, nullable=False)
+    window = Column(String, nullable=False)  # 1d, 1w, 1m
+    as_of = Column(DateTime, nullable=False)  # Start of the prediction day, naive UTC
+    delta_pct = Column(Float, nullable=False)  # Unrounded model output
+    confidence = Column(Float, nullable=False)
+    model_type = Column(String, nullable=False)
+    model_version = Column(String, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PredictionRun(Base):
+    """A precompute run for one day and model version, claimed by one worker"""
+    __tablename__ = "prediction_runs"
+    __table_args__ = (
+        UniqueConstraint("as_of", "model_version", name="uq_prediction_runs_as_of_model_version"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    as_of = Column(DateTime, nullable=False)
+    model_version = Column(String, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=False)  # Refreshed after each chunk, naive UTC
+    completed_at = Column(DateTime, nullable=True)  # Set once every symbol is stored
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from datetime import datetime
 
 class WatchlistItem(Base):
     __tablename__ = "watchlist_items"
+    # Also serves as the index for per-user lookups (leftmost column)
+    __table_args__ = (
+        UniqueConstraint("user_id", "symbol", name="uq_watchlist_items_user_id_symbol"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -13,4 +13,5 @@ class NewsItem(BaseModel):
 class NewsResponse(BaseModel):
     symbol: Optional[str] = None
     items: List[NewsItem]
+    nextCursor: Optional[str] = None
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Literal
+from pydantic import BaseModel, Field
+from typing import List, Literal
 from datetime import datetime
 
 class PredictionModel(BaseModel):
@@ -17,3 +17,12 @@ class PredictionResponse(BaseModel):
     prediction: Prediction
     model: PredictionModel
 
+class PredictionBatchRequest(BaseModel):
+    symbols: List[str] = Field(..., min_length=1, max_length=500)
+    windows: List[Literal["1d", "1w", "1m"]] = Field(default=["1d"], min_length=1)
+
+class PredictionBatchItem(PredictionResponse):
+    window: Literal["1d", "1w", "1m"]
+
+class PredictionBatchResponse(BaseModel):
+    items: List[PredictionBatchItem]
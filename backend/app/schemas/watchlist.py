@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import List, Literal
 
 class WatchlistItem(BaseModel):
     symbol: str
@@ -10,3 +10,12 @@ class WatchlistResponse(BaseModel):
 class WatchlistCreate(BaseModel):
     symbol: str
 
+class WatchlistBulkRequest(BaseModel):
+    symbols: List[str] = Field(..., max_length=500)
+
+class WatchlistBulkResult(BaseModel):
+    symbol: str
+    status: Literal["added", "exists", "removed", "not_found", "duplicate", "invalid"]
+
+class WatchlistBulkResponse(BaseModel):
+    results: List[WatchlistBulkResult]
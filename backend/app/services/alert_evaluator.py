@@ -0,0 +1,212 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import logging
+import time
+import uuid
+import numpy as np
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.pubsub import PubSub, user_topic
+from app.models.alert import Alert
+from app.services.alert_index import AlertThresholdIndex
+from app.services.prediction_service import PredictionService
+from app.services.worker_lease import claim_lease
+
+logger = logging.getLogger(__name__)
+
+# Alert metrics computed from the 1d prediction for the alert's symbol
+METRICS: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "predictedDeltaPct": lambda prediction: prediction["prediction"]["deltaPct"],
+    "predictedConfidence": lambda prediction: prediction["prediction"]["confidence"],
+}
+
+# Rule operators as ufuncs; index in this tuple is the operator code
+OPERATORS: Tuple[Tuple[str, np.ufunc], ...] = (
+    ("<=", np.less_equal),
+    (">=", np.greater_equal),
+    ("<", np.less),
+    (">", np.greater),
+    ("==", np.equal),
+    ("!=", np.not_equal),
+)
+_OPERATOR_CODES = {op: code for code, (op, _) in enumerate(OPERATORS)}
+
+class AlertEvaluator:
+    """
+    Scans every active alert and marks the ones whose rule holds as triggered.
+
+    Active alerts are streamed from the database in chunks of ``batch_size``
+    rows with the rule fields extracted in SQL. Each (symbol, metric) pair is
+    evaluated once per cycle, thresholds are compared with one vectorized
+    operation per operator, and all triggered alerts are updated with a
+    single UPDATE. Only the alerts that UPDATE actually moved to triggered
+    are dropped from ``index`` and pushed to their owners through ``pubsub``
+    if given, so an alert another cycle already triggered is not notified
+    twice. The background loop only evaluates while it holds the
+    ``alert_evaluator`` worker lease, so one worker scans at a time.
+    """
+
+    lease_name = "alert_evaluator"
+
+    def __init__(
+        self,
+        prediction_service: Optional[PredictionService] = None,
+        batch_size: Optional[int] = None,
+        index: Optional[AlertThresholdIndex] = None,
+        pubsub: Optional[PubSub] = None,
+        lease_seconds: Optional[float] = None,
+    ):
+        self.prediction_service = prediction_service or PredictionService()
+        self.batch_size = batch_size or settings.ALERT_EVAL_BATCH_SIZE
+        self.index = index
+        self.pubsub = pubsub
+        self.lease_seconds = lease_seconds or settings.ALERT_EVAL_LEASE_SECONDS
+        self.holder = uuid.uuid4().hex
+        self._task: Optional[asyncio.Task] = None
+
+    async def evaluate(self, db: AsyncSession) -> Dict[str, Any]:
+        """Run one evaluation cycle and return its statistics"""
+        start = time.perf_counter()
+        query = select(
+            Alert.id,
+            Alert.symbol,
+            Alert.rule["metric"].as_string(),
+            Alert.rule["op"].as_string(),
+            Alert.rule["value"].as_float(),
+            Alert.user_id,
+        ).where(Alert.is_active == "active")
+
+        metric_values: Dict[Tuple[str, str], float] = {}
+        triggered = []
+        notifications: List[Tuple[int, Dict[str, Any]]] = []
+        scanned = 0
+        # Core rows skip ORM result processing, which dominates at this volume
+        connection = await db.connection()
+        result = await connection.stream(query)
+        async for rows in result.partitions(self.batch_size):
+            scanned += len(rows)
+            ids, hit, values = self._evaluate_rows(rows, metric_values)
+            triggered.append(ids[hit])
+            if self.pubsub is not None:
+                for i in np.flatnonzero(hit).tolist():
+                    alert_id, symbol, metric, op, threshold, user_id = rows[i]
+                    notifications.append((user_id, {
+                        "id": alert_id,
+                        "symbol": symbol,
+                        "rule": {"metric": metric, "op": op, "value": threshold},
+                        "metricValue": float(values[i]),
+                    }))
+        hit_ids = np.concatenate(triggered) if triggered else np.zeros(0, dtype=np.int64)
+
+        triggered_at = datetime.utcnow()
+        triggered_ids: List[int] = []
+        if len(hit_ids):
+            # One UPDATE for the whole cycle. The ids are rendered inline, so
+            # the statement is not bound by the driver's parameter limit, and
+            # guarding on is_active leaves alerts disabled or triggered since
+            # the scan untouched; RETURNING reports the ones this cycle moved
+            ids = bindparam("ids", hit_ids.tolist(), expanding=True, literal_execute=True)
+            result = await db.execute(
+                update(Alert.__table__)
+                .where(Alert.id.in_(ids), Alert.is_active == "active")
+                .values(is_active="triggered", triggered_at=triggered_at)
+                .returning(Alert.id)
+            )
+            triggered_ids = list(result.scalars())
+        await db.commit()
+        if self.index is not None:
+            self.index.remove_many(triggered_ids)
+        moved = set(triggered_ids)
+        by_user: Dict[int, List[Dict[str, Any]]] = {}
+        for user_id, item in notifications:
+            if item["id"] in moved:
+                by_user.setdefault(user_id, []).append(item)
+        for user_id, items in by_user.items():
+            await self.pubsub.publish(
+                user_topic(user_id), "alerts", {"triggeredAt": triggered_at, "items": items}
+            )
+
+        return {
+            "scanned": scanned,
+            "metrics": len(metric_values),
+            "triggered": len(triggered_ids),
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _evaluate_rows(
+        self, rows, metric_values: Dict[Tuple[str, str], float]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the alert ids in rows, a mask of the alerts whose rule holds,
+        and the metric value each rule was compared against
+        """
+        ids, symbols, metrics, ops, thresholds, _ = zip(*rows)
+        ids = np.asarray(ids, dtype=np.int64)
+        thresholds = np.asarray(thresholds, dtype=np.float64)
+        op_codes = np.fromiter(
+            (_OPERATOR_CODES.get(op, -1) for op in ops), dtype=np.int64, count=len(ops)
+        )
+
+        # Look up each distinct (symbol, metric) once, then broadcast to rows
+        symbol_names, symbol_index = np.unique(np.asarray(symbols), return_inverse=True)
+        metric_names, metric_index = np.unique(np.asarray(metrics, dtype=str), return_inverse=True)
+        pairs, pair_index = np.unique(
+            symbol_index * len(metric_names) + metric_index, return_inverse=True
+        )
+        keys = [
+            (str(symbol_names[symbol_code]), str(metric_names[metric_code]))
+            for symbol_code, metric_code in (divmod(pair, len(metric_names)) for pair in pairs.tolist())
+        ]
+        # Predictions for all symbols still needed are scored in one batch
+        needed = list(dict.fromkeys(
+            symbol for symbol, metric in keys if metric in METRICS and (symbol, metric) not in metric_values
+        ))
+        predictions = dict(zip(needed, self.prediction_service.get_predictions_batch(needed, ("1d",))))
+        pair_values = np.empty(len(pairs), dtype=np.float64)
+        for i, (symbol, metric) in enumerate(keys):
+            value = metric_values.get((symbol, metric))
+            if value is None:
+                extract = METRICS.get(metric)
+                value = np.nan if extract is None else float(extract(predictions[symbol]))
+                metric_values[(symbol, metric)] = value
+            pair_values[i] = value
+        values = pair_values[pair_index]
+
+        hit = np.zeros(len(ids), dtype=bool)
+        for code, (_, compare) in enumerate(OPERATORS):
+            mask = op_codes == code
+            if mask.any():
+                hit[mask] = compare(values[mask], thresholds[mask])
+        # Unknown metrics and malformed rules never trigger
+        hit &= ~np.isnan(values) & ~np.isnan(thresholds)
+        return ids, hit, values
+
+    async def run(self, session_factory: async_sessionmaker, interval: float):
+        """Evaluate alerts every interval seconds while holding the lease, until cancelled"""
+        while True:
+            try:
+                async with session_factory() as db:
+                    if await claim_lease(db, self.lease_name, self.holder, self.lease_seconds):
+                        await self.evaluate(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Alert evaluation cycle failed")
+            await asyncio.sleep(interval)
+
+    def start(self, session_factory: async_sessionmaker, interval: float):
+        """Start the background evaluation loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(session_factory, interval))
+
+    async def stop(self):
+        """Cancel the background evaluation loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
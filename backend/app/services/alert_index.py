@@ -0,0 +1,157 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from bisect import bisect_left, bisect_right
+import threading
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.alert import Alert
+
+_IndexKey = Tuple[str, str, str]
+_AlertRow = Tuple[int, str, Optional[str], Optional[str], Optional[float]]
+
+class _Thresholds:
+    """Alert ids sorted by threshold, with the thresholds kept alongside for bisect"""
+
+    __slots__ = ("values", "ids")
+
+    def __init__(self, pairs: Iterable[Tuple[float, int]] = ()):
+        pairs = sorted(pairs)
+        self.values = [value for value, _ in pairs]
+        self.ids = [alert_id for _, alert_id in pairs]
+
+    def insert(self, value: float, alert_id: int):
+        position = bisect_right(self.values, value)
+        self.values.insert(position, value)
+        self.ids.insert(position, alert_id)
+
+    def remove(self, value: float, alert_id: int) -> bool:
+        position = bisect_left(self.values, value)
+        end = bisect_right(self.values, value, position)
+        for i in range(position, end):
+            if self.ids[i] == alert_id:
+                del self.values[i]
+                del self.ids[i]
+                return True
+        return False
+
+    def matching(self, op: str, value: float) -> List[int]:
+        """Ids of alerts whose rule ``value <op> threshold`` holds"""
+        values, ids = self.values, self.ids
+        if op == "<=":
+            return ids[bisect_left(values, value):]
+        if op == "<":
+            return ids[bisect_right(values, value):]
+        if op == ">=":
+            return ids[:bisect_right(values, value)]
+        if op == ">":
+            return ids[:bisect_left(values, value)]
+        if op == "==":
+            return ids[bisect_left(values, value):bisect_right(values, value)]
+        if op == "!=":
+            return ids[:bisect_left(values, value)] + ids[bisect_right(values, value):]
+        return []
+
+class AlertThresholdIndex:
+    """
+    In-memory index of active alert thresholds.
+
+    For every (symbol, metric, op) the thresholds are kept in a sorted list,
+    so ``matching_alerts`` finds the alerts a metric value crosses with one
+    bisect per operator instead of scanning every rule. The index is per
+    process: it is loaded from the alerts table at startup and kept current
+    by the handlers that create, delete or trigger alerts.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thresholds: Dict[_IndexKey, _Thresholds] = {}
+        self._ops: Dict[Tuple[str, str], List[str]] = {}
+        self._alerts: Dict[int, Tuple[_IndexKey, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    async def load(self, db: AsyncSession):
+        """Replace the index contents with the active alerts in the database"""
+        result = await db.execute(
+            select(
+                Alert.id,
+                Alert.symbol,
+                Alert.rule["metric"].as_string(),
+                Alert.rule["op"].as_string(),
+                Alert.rule["value"].as_float(),
+            ).where(Alert.is_active == "active")
+        )
+        self.load_rows(result.all())
+
+    def load_rows(self, rows: Iterable[_AlertRow]):
+        """Replace the index contents with (id, symbol, metric, op, value) rows"""
+        grouped: Dict[_IndexKey, List[Tuple[float, int]]] = {}
+        alerts = {}
+        for alert_id, symbol, metric, op, value in rows:
+            if metric is None or op is None or value is None:
+                continue
+            key = (symbol, metric, op)
+            grouped.setdefault(key, []).append((value, alert_id))
+            alerts[alert_id] = (key, value)
+
+        thresholds = {key: _Thresholds(pairs) for key, pairs in grouped.items()}
+        ops: Dict[Tuple[str, str], List[str]] = {}
+        for symbol, metric, op in thresholds:
+            ops.setdefault((symbol, metric), []).append(op)
+
+        with self._lock:
+            self._thresholds = thresholds
+            self._ops = ops
+            self._alerts = alerts
+
+    def add(self, alert_id: int, symbol: str, rule: Mapping[str, Any]):
+        """Index an active alert; an alert already indexed is replaced"""
+        key = (symbol, rule["metric"], rule["op"])
+        value = float(rule["value"])
+        with self._lock:
+            self._remove(alert_id)
+            thresholds = self._thresholds.get(key)
+            if thresholds is None:
+                thresholds = self._thresholds[key] = _Thresholds()
+                self._ops.setdefault(key[:2], []).append(key[2])
+            thresholds.insert(value, alert_id)
+            self._alerts[alert_id] = (key, value)
+
+    def remove(self, alert_id: int) -> bool:
+        """Drop an alert from the index, returning whether it was indexed"""
+        with self._lock:
+            return self._remove(alert_id)
+
+    def remove_many(self, alert_ids: Iterable[int]):
+        """Drop many alerts from the index"""
+        with self._lock:
+            for alert_id in alert_ids:
+                self._remove(alert_id)
+
+    def _remove(self, alert_id: int) -> bool:
+        entry = self._alerts.pop(alert_id, None)
+        if entry is None:
+            return False
+        key, value = entry
+        thresholds = self._thresholds[key]
+        thresholds.remove(value, alert_id)
+        if not thresholds.ids:
+            del self._thresholds[key]
+            ops = self._ops[key[:2]]
+            ops.remove(key[2])
+            if not ops:
+                del self._ops[key[:2]]
+        return True
+
+    def matching_alerts(self, symbol: str, metric: str, value: float) -> List[int]:
+        """Return the ids of active alerts on (symbol, metric) whose rule holds for value"""
+        with self._lock:
+            matches = []
+            for op in self._ops.get((symbol, metric), ()):
+                matches.extend(self._thresholds[(symbol, metric, op)].matching(op, value))
+            return matches
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """Return the indexed (symbol, metric) pairs"""
+        with self._lock:
+            return list(self._ops)
@@ -0,0 +1,205 @@
+from dataclasses import dataclass
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple, Union
+import json
+import os
+import numpy as np
+from app.core.config import settings
+from app.services.features import FEATURE_NAMES, LOOKBACK, build_features
+from app.services.market_data import StoredMarketData, SyntheticMarketData
+from app.services.price_store import PriceStore
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "artifacts", "svr_rf_ensemble.npz")
+
+class RBFSupportVectorRegressor:
+    """Kernel SVR inference: f(x) = sum_i coef_i * exp(-gamma * |x - sv_i|^2) + b"""
+
+    def __init__(self, support_vectors: np.ndarray, dual_coef: np.ndarray, intercept: float, gamma: float):
+        self.support_vectors = support_vectors
+        self.dual_coef = dual_coef
+        self.intercept = float(intercept)
+        self.gamma = float(gamma)
+        self._support_norms = (support_vectors ** 2).sum(axis=1)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        distances = (
+            (X ** 2).sum(axis=1)[:, None] + self._support_norms[None, :]
+            - 2.0 * X @ self.support_vectors.T
+        )
+        kernel = np.exp(-self.gamma * np.maximum(distances, 0.0))
+        return kernel @ self.dual_coef + self.intercept
+
+class RandomForestRegressor:
+    """
+    Regression forest inference over trees stored as flat node arrays of
+    shape (n_trees, n_nodes): split feature, threshold, left and right child
+    and node value. Leaves have an infinite threshold and point to
+    themselves, so every sample descends all trees in ``depth`` vectorized
+    steps with no per-tree or per-sample Python loop.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        depth: int,
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.depth = int(depth)
+
+    def predict_trees(self, X: np.ndarray) -> np.ndarray:
+        """Per-tree predictions, shape (n_trees, n_samples)"""
+        n_trees = self.feature.shape[0]
+        trees = np.arange(n_trees)[:, None]
+        samples = np.arange(X.shape[0])[None, :]
+        node = np.zeros((n_trees, X.shape[0]), dtype=np.int64)
+        for _ in range(self.depth):
+            go_left = X[samples, self.feature[trees, node]] <= self.threshold[trees, node]
+            node = np.where(go_left, self.left[trees, node], self.right[trees, node])
+        return self.value[trees, node]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.predict_trees(X).mean(axis=0)
+
+class EnsembleModel:
+    """
+    SVR and random forest averaged with a fixed weight, on standardized
+    features. Confidence grows with the size of the prediction relative to
+    the disagreement between trees and between the two models, from 0.5
+    (no signal) towards 0.95.
+    """
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        svr: RBFSupportVectorRegressor,
+        forest: RandomForestRegressor,
+        svr_weight: float,
+    ):
+        self.mean = mean
+        self.scale = scale
+        self.svr = svr
+        self.forest = forest
+        self.svr_weight = float(svr_weight)
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predicted return in percent and confidence for each row of X"""
+        Z = (X - self.mean) / self.scale
+        svr = self.svr.predict(Z)
+        trees = self.forest.predict_trees(Z)
+        forest = trees.mean(axis=0)
+        delta = self.svr_weight * svr + (1.0 - self.svr_weight) * forest
+        spread = trees.std(axis=0) + np.abs(svr - forest)
+        confidence = 0.5 + 0.45 * np.tanh(np.abs(delta) / np.maximum(spread, 1e-9))
+        return delta, confidence
+
+    def arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """Arrays to store under prefix in the artifact"""
+        forest = self.forest
+        return {
+            f"{prefix}/mean": self.mean,
+            f"{prefix}/scale": self.scale,
+            f"{prefix}/svr_weight": np.array(self.svr_weight),
+            f"{prefix}/svr/support_vectors": self.svr.support_vectors,
+            f"{prefix}/svr/dual_coef": self.svr.dual_coef,
+            f"{prefix}/svr/intercept": np.array(self.svr.intercept),
+            f"{prefix}/svr/gamma": np.array(self.svr.gamma),
+            f"{prefix}/forest/feature": forest.feature,
+            f"{prefix}/forest/threshold": forest.threshold,
+            f"{prefix}/forest/left": forest.left,
+            f"{prefix}/forest/right": forest.right,
+            f"{prefix}/forest/value": forest.value,
+            f"{prefix}/forest/depth": np.array(forest.depth),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays, prefix: str) -> "EnsembleModel":
+        def get(name):
+            return arrays[f"{prefix}/{name}"]
+
+        svr = RBFSupportVectorRegressor(
+            get("svr/support_vectors"), get("svr/dual_coef"), get("svr/intercept"), get("svr/gamma")
+        )
+        forest = RandomForestRegressor(
+            get("forest/feature"), get("forest/threshold"), get("forest/left"),
+            get("forest/right"), get("forest/value"), get("forest/depth"),
+        )
+        return cls(get("mean"), get("scale"), svr, forest, get("svr_weight"))
+
+@dataclass
+class EnsembleBundle:
+    """One EnsembleModel per prediction window plus artifact metadata"""
+    version: str
+    models: Dict[str, EnsembleModel]
+    metadata: Dict
+
+def save_ensemble(path: str, bundle: EnsembleBundle) -> None:
+    metadata = dict(bundle.metadata, version=bundle.version, windows=sorted(bundle.models))
+    arrays = {"metadata": np.array(json.dumps(metadata))}
+    for window, model in bundle.models.items():
+        arrays.update(model.arrays(window))
+    np.savez_compressed(path, **arrays)
+
+def load_ensemble(path: str) -> EnsembleBundle:
+    """Load an artifact written by save_ensemble (no pickled objects)"""
+    with np.load(path, allow_pickle=False) as arrays:
+        metadata = json.loads(str(arrays["metadata"]))
+        if tuple(metadata["features"]) != FEATURE_NAMES:
+            raise ValueError(f"{path} was trained on different features")
+        models = {window: EnsembleModel.from_arrays(arrays, window) for window in metadata["windows"]}
+    return EnsembleBundle(version=metadata["version"], models=models, metadata=metadata)
+
+class EnsemblePredictor:
+    """Scores many symbols at once: one feature matrix and one predict call per window"""
+
+    def __init__(
+        self, bundle: EnsembleBundle, market_data: Optional[Union[SyntheticMarketData, StoredMarketData]] = None
+    ):
+        self.bundle = bundle
+        self.market_data = market_data or SyntheticMarketData()
+
+    @property
+    def version(self) -> str:
+        return self.bundle.version
+
+    @property
+    def windows(self) -> Tuple[str, ...]:
+        return tuple(self.bundle.models)
+
+    def features(self, symbols: Sequence[str], as_of: date) -> np.ndarray:
+        """Features from the closes up to the day before as_of"""
+        closes = self.market_data.closes(symbols, as_of - timedelta(days=1), LOOKBACK)
+        return build_features(closes)
+
+    def predict(
+        self, symbols: Sequence[str], window: str, as_of: date
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Predicted return in percent and confidence per symbol"""
+        return self.bundle.models[window].predict(self.features(symbols, as_of))
+
+@lru_cache(maxsize=None)
+def load_predictor(path: Optional[str] = None) -> EnsemblePredictor:
+    """
+    The predictor for path (default: PREDICTION_MODEL_PATH or the bundled
+    artifact), loaded once per process. Features come from the price store
+    at PRICE_STORE_PATH when set, with synthetic history for symbols it
+    does not cover.
+    """
+    market_data = None
+    if settings.PRICE_STORE_PATH:
+        market_data = StoredMarketData(
+            PriceStore(settings.PRICE_STORE_PATH, max_open=settings.PRICE_STORE_MAX_OPEN),
+            fallback=SyntheticMarketData(),
+        )
+    return EnsemblePredictor(
+        load_ensemble(path or settings.PREDICTION_MODEL_PATH or DEFAULT_MODEL_PATH), market_data
+    )
@@ -0,0 +1,232 @@
+"""
+Train the SVR/RF prediction ensemble and write the bundled artifact.
+
+The models are fit in NumPy (no scikit-learn at runtime or build time) on
+history from SyntheticMarketData: features as of each sample day and the
+log return over the following 1, 5 or 21 trading days as the target. The
+last days are held out to pick the SVR/forest blend weight and report
+validation error.
+
+Regenerate the artifact from the backend directory:
+    python -m app.services.ensemble_training --version 1.0.0
+"""
+from datetime import date
+from typing import Dict, Tuple
+import argparse
+import numpy as np
+from app.services.ensemble import (
+    DEFAULT_MODEL_PATH,
+    EnsembleBundle,
+    EnsembleModel,
+    RandomForestRegressor,
+    RBFSupportVectorRegressor,
+    save_ensemble,
+)
+from app.services.features import FEATURE_NAMES, LOOKBACK, build_features
+from app.services.market_data import SyntheticMarketData
+
+HORIZONS = {"1d": 1, "1w": 5, "1m": 21}
+
+def training_set(
+    market_data: SyntheticMarketData, n_symbols: int, n_days: int, end: date, horizon: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Features, targets (percent return over horizon) and sample day index"""
+    symbols = [f"TRAIN{i:04d}" for i in range(n_symbols)]
+    closes = market_data.closes(symbols, end, n_days + LOOKBACK + horizon)
+    log_closes = np.log(closes)
+    X, y, day = [], [], []
+    for t in range(LOOKBACK - 1, LOOKBACK - 1 + n_days):
+        X.append(build_features(closes[:, t - LOOKBACK + 1:t + 1]))
+        y.append((log_closes[:, t + horizon] - log_closes[:, t]) * 100.0)
+        day.append(np.full(n_symbols, t))
+    return np.concatenate(X), np.concatenate(y), np.concatenate(day)
+
+def fit_svr(
+    Z: np.ndarray,
+    y: np.ndarray,
+    rng: np.random.Generator,
+    n_support: int = 256,
+    epsilon: float = 0.1,
+    alpha: float = 1e-3,
+    iterations: int = 300,
+    learning_rate: float = 0.05,
+) -> RBFSupportVectorRegressor:
+    """
+    Fit an RBF-kernel SVR on a random basis of n_support training points by
+    Adam on the epsilon-insensitive loss with an RKHS-norm penalty
+    """
+    gamma = 1.0 / Z.shape[1]
+    support = Z[rng.choice(len(Z), n_support, replace=False)]
+    svr = RBFSupportVectorRegressor(support, np.zeros(n_support), float(np.median(y)), gamma)
+    kernel = np.exp(-gamma * np.maximum(
+        (Z ** 2).sum(1)[:, None] + svr._support_norms[None, :] - 2.0 * Z @ support.T, 0.0
+    ))
+    support_kernel = np.exp(-gamma * np.maximum(
+        svr._support_norms[:, None] + svr._support_norms[None, :] - 2.0 * support @ support.T, 0.0
+    ))
+
+    params = np.append(svr.dual_coef, svr.intercept)
+    moment, velocity = np.zeros_like(params), np.zeros_like(params)
+    for step in range(1, iterations + 1):
+        residual = kernel @ params[:-1] + params[-1] - y
+        slope = np.sign(residual) * (np.abs(residual) > epsilon) / len(y)
+        grad = np.append(kernel.T @ slope + 2.0 * alpha * support_kernel @ params[:-1], slope.sum())
+        moment = 0.9 * moment + 0.1 * grad
+        velocity = 0.999 * velocity + 0.001 * grad ** 2
+        params -= learning_rate * (moment / (1 - 0.9 ** step)) / (
+            np.sqrt(velocity / (1 - 0.999 ** step)) + 1e-8
+        )
+
+    keep = np.abs(params[:-1]) > 1e-6 * np.abs(params[:-1]).max()
+    return RBFSupportVectorRegressor(support[keep], params[:-1][keep], params[-1], gamma)
+
+def _fit_tree(
+    Z: np.ndarray, y: np.ndarray, max_depth: int, min_leaf: int, max_features: int, rng: np.random.Generator
+) -> Dict[str, list]:
+    """Fit one CART regression tree; returns flat node lists"""
+    tree = {"feature": [], "threshold": [], "left": [], "right": [], "value": []}
+
+    def leaf(value: float) -> int:
+        node = len(tree["value"])
+        tree["feature"].append(0)
+        tree["threshold"].append(np.inf)
+        tree["left"].append(node)
+        tree["right"].append(node)
+        tree["value"].append(value)
+        return node
+
+    def build(rows: np.ndarray, depth: int) -> int:
+        targets = y[rows]
+        node = leaf(float(targets.mean()))
+        n = len(rows)
+        if depth == max_depth or n < 2 * min_leaf:
+            return node
+
+        total = targets.sum()
+        best_score, best_feature, best_threshold = total ** 2 / n + 1e-12, None, None
+        split = np.arange(min_leaf - 1, n - min_leaf)
+        for feature in rng.choice(Z.shape[1], max_features, replace=False):
+            values = Z[rows, feature]
+            order = np.argsort(values, kind="stable")
+            ordered = values[order]
+            left_sum = np.cumsum(targets[order])[split]
+            left_count = split + 1
+            # Maximizing this is minimizing the children's squared error
+            score = left_sum ** 2 / left_count + (total - left_sum) ** 2 / (n - left_count)
+            score[ordered[split] >= ordered[split + 1]] = -np.inf
+            i = int(np.argmax(score))
+            if score[i] > best_score:
+                best_score, best_feature = score[i], int(feature)
+                best_threshold = (ordered[split[i]] + ordered[split[i] + 1]) / 2.0
+
+        if best_feature is None:
+            return node
+        goes_left = Z[rows, best_feature] <= best_threshold
+        tree["feature"][node] = best_feature
+        tree["threshold"][node] = best_threshold
+        tree["left"][node] = build(rows[goes_left], depth + 1)
+        tree["right"][node] = build(rows[~goes_left], depth + 1)
+        return node
+
+    build(np.arange(len(y)), 0)
+    return tree
+
+def fit_forest(
+    Z: np.ndarray,
+    y: np.ndarray,
+    rng: np.random.Generator,
+    n_trees: int = 40,
+    max_depth: int = 6,
+    min_leaf: int = 50,
+    max_features: int = 4,
+) -> RandomForestRegressor:
+    """Bagged CART trees on bootstrap samples, padded into one node array per field"""
+    trees = []
+    for _ in range(n_trees):
+        sample = rng.integers(0, len(y), len(y))
+        trees.append(_fit_tree(Z[sample], y[sample], max_depth, min_leaf, max_features, rng))
+
+    n_nodes = max(len(tree["value"]) for tree in trees)
+    padded_nodes = np.arange(n_nodes)
+    arrays = {
+        "feature": np.zeros((n_trees, n_nodes), dtype=np.int64),
+        "threshold": np.full((n_trees, n_nodes), np.inf),
+        "left": np.tile(padded_nodes, (n_trees, 1)),
+        "right": np.tile(padded_nodes, (n_trees, 1)),
+        "value": np.zeros((n_trees, n_nodes)),
+    }
+    for t, tree in enumerate(trees):
+        for name, values in tree.items():
+            arrays[name][t, :len(values)] = values
+    return RandomForestRegressor(depth=max_depth, **arrays)
+
+def _r2(y: np.ndarray, prediction: np.ndarray) -> float:
+    return 1.0 - ((y - prediction) ** 2).sum() / ((y - y.mean()) ** 2).sum()
+
+def train_window(
+    market_data: SyntheticMarketData, horizon: int, n_symbols: int, n_days: int, end: date, seed: int
+) -> Tuple[EnsembleModel, Dict[str, float]]:
+    rng = np.random.default_rng(seed)
+    X, y, day = training_set(market_data, n_symbols, n_days, end, horizon)
+    # Hold out the last days, leaving a horizon-long gap so targets do not overlap
+    cutoff = day.max() - n_days // 5
+    train = day < cutoff - horizon
+    holdout = day >= cutoff
+
+    mean, scale = X[train].mean(axis=0), X[train].std(axis=0) + 1e-9
+    Z = (X - mean) / scale
+    svr = fit_svr(Z[train], y[train], rng)
+    forest = fit_forest(Z[train], y[train], rng)
+
+    svr_holdout, forest_holdout = svr.predict(Z[holdout]), forest.predict(Z[holdout])
+    weights = np.linspace(0.0, 1.0, 11)
+    errors = [
+        ((w * svr_holdout + (1 - w) * forest_holdout - y[holdout]) ** 2).mean() for w in weights
+    ]
+    weight = float(weights[int(np.argmin(errors))])
+    model = EnsembleModel(mean, scale, svr, forest, weight)
+
+    delta, _ = model.predict(X[holdout])
+    report = {
+        "samples": int(train.sum()),
+        "svr_weight": weight,
+        "support_vectors": int(len(svr.dual_coef)),
+        "holdout_r2_svr": round(_r2(y[holdout], svr_holdout), 4),
+        "holdout_r2_forest": round(_r2(y[holdout], forest_holdout), 4),
+        "holdout_r2": round(_r2(y[holdout], delta), 4),
+        "holdout_direction_accuracy": round(float((np.sign(delta) == np.sign(y[holdout])).mean()), 4),
+    }
+    return model, report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--version", default="1.0.0")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--days", type=int, default=150)
+    parser.add_argument("--end", default="2024-06-28", help="last day of training history")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    market_data = SyntheticMarketData()
+    end = date.fromisoformat(args.end)
+    models, reports = {}, {}
+    for offset, (window, horizon) in enumerate(HORIZONS.items()):
+        models[window], reports[window] = train_window(
+            market_data, horizon, args.symbols, args.days, end, args.seed + offset
+        )
+        print(window, reports[window])
+
+    metadata = {
+        "features": list(FEATURE_NAMES),
+        "training_end": args.end,
+        "symbols": args.symbols,
+        "days": args.days,
+        "seed": args.seed,
+        "report": reports,
+    }
+    save_ensemble(args.output, EnsembleBundle(version=args.version, models=models, metadata=metadata))
+    print(f"wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import numpy as np
+
+RETURN_LAGS = 5
+LONG_WINDOW = 21
+SHORT_WINDOW = 5
+
+# Closes needed per symbol to build one feature row
+LOOKBACK = LONG_WINDOW + 1
+
+FEATURE_NAMES = (
+    *(f"return_lag{lag}" for lag in range(RETURN_LAGS)),
+    "return_5d",
+    "return_21d",
+    "volatility_5d",
+    "volatility_21d",
+    "volatility_ratio",
+)
+
+def build_features(closes: np.ndarray) -> np.ndarray:
+    """
+    Feature matrix for the last day of each row of ``closes`` (shape
+    (n_symbols, n_days), n_days >= LOOKBACK): the last RETURN_LAGS daily log
+    returns, 5 and 21 day cumulative returns, 5 and 21 day realized
+    volatility and their ratio. Returns are in percent. One row per symbol,
+    columns in FEATURE_NAMES order.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    if closes.ndim != 2 or closes.shape[1] < LOOKBACK:
+        raise ValueError(f"closes must have shape (n_symbols, >= {LOOKBACK})")
+    returns = np.diff(np.log(closes[:, -LOOKBACK:]), axis=1) * 100.0
+
+    short = returns[:, -SHORT_WINDOW:]
+    volatility_short = short.std(axis=1)
+    volatility_long = returns.std(axis=1)
+    return np.column_stack([
+        returns[:, ::-1][:, :RETURN_LAGS],
+        short.sum(axis=1),
+        returns.sum(axis=1),
+        volatility_short,
+        volatility_long,
+        volatility_short / np.maximum(volatility_long, 1e-9),
+    ])
@@ -0,0 +1,185 @@
+from typing import Dict, List, Sequence, Tuple, Union
+from itertools import repeat
+import numpy as np
+
+# Byte translation table mapping ASCII punctuation and whitespace to spaces.
+# ASCII letters, digits, "_" and all non-ASCII (UTF-8) bytes are word bytes.
+_SPACE = 0x20
+_TOKEN_TABLE = bytes(
+    byte if (chr(byte).isalnum() or byte == ord("_") or byte >= 0x80) else _SPACE
+    for byte in range(256)
+)
+
+def tokenize(text: str) -> List[bytes]:
+    """Split lowercased text into word tokens as UTF-8 bytes"""
+    return text.lower().encode().translate(_TOKEN_TABLE).split()
+
+# Inflected forms of the built-in sentiment keywords. Listed explicitly
+# rather than derived with suffix rules, which produce non-words such as
+# "wined" or "beated" and miss irregular forms such as "won" or "fell".
+INFLECTIONS: Dict[str, Tuple[str, ...]] = {
+    "beat": ("beats", "beating", "beaten"),
+    "exceed": ("exceeds", "exceeded", "exceeding"),
+    "profit": ("profits", "profited", "profiting"),
+    "gain": ("gains", "gained", "gaining"),
+    "rise": ("rises", "rose", "risen", "rising"),
+    "success": ("successes",),
+    "win": ("wins", "won", "winning"),
+    "surge": ("surges", "surged", "surging"),
+    "miss": ("misses", "missed", "missing"),
+    "decline": ("declines", "declined", "declining"),
+    "loss": ("losses",),
+    "fall": ("falls", "fell", "fallen", "falling"),
+    "fail": ("fails", "failed", "failing"),
+    "drop": ("drops", "dropped", "dropping"),
+    "crash": ("crashes", "crashed", "crashing"),
+    "plunge": ("plunges", "plunged", "plunging"),
+}
+
+def inflections(word: str) -> List[str]:
+    """
+    Return word with its inflected forms from ``INFLECTIONS``, so "beat"
+    also matches "beats" and "rise" matches "rose". Words not in the table
+    only match themselves.
+    """
+    return [word, *INFLECTIONS.get(word, ())]
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Patterns are single words or multi-word phrases. A keyword may also be
+    a list of alternative forms that all report the same keyword index.
+    Text is split into
+    word tokens (see ``tokenize``), so matches always fall on token
+    boundaries ("up" does not match "upgrade"), and all patterns are found
+    in one linear pass over the tokens regardless of how many patterns are
+    loaded.
+    """
+
+    def __init__(self, keywords: Sequence[Union[str, Sequence[str]]], inflect: bool = True):
+        """
+        Compile keywords; each match reports the index of its keyword in
+        ``keywords``. Single-word string keywords also match their
+        ``inflections`` when ``inflect`` is set.
+        """
+        self.keywords = list(keywords)
+        self.vocab: Dict[bytes, int] = {}
+        self._goto: List[Dict[int, int]] = [{}]
+        self._outputs: List[Tuple[int, ...]] = [()]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            if isinstance(keyword, str):
+                tokens = tokenize(keyword)
+                if inflect and len(tokens) == 1:
+                    forms = inflections(tokens[0].decode())
+                else:
+                    forms = [keyword]
+            else:
+                forms = keyword
+            for form in forms:
+                tokens = tokenize(form)
+                if tokens:
+                    self._add_pattern(tokens, keyword_id)
+
+        self._fail = self._build_failure_links()
+
+    def _add_pattern(self, tokens: List[bytes], keyword_id: int):
+        state = 0
+        for token in tokens:
+            token_id = self.vocab.setdefault(token, len(self.vocab))
+            next_state = self._goto[state].get(token_id)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._outputs.append(())
+                self._goto[state][token_id] = next_state
+            state = next_state
+        if keyword_id not in self._outputs[state]:
+            self._outputs[state] += (keyword_id,)
+
+    def _build_failure_links(self) -> List[int]:
+        """Breadth-first construction of failure links, merging outputs"""
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for token_id, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and token_id not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                target = self._goto[fallback].get(token_id, 0)
+                fail[next_state] = target if target != next_state else 0
+                self._outputs[next_state] += tuple(
+                    keyword_id for keyword_id in self._outputs[fail[next_state]]
+                    if keyword_id not in self._outputs[next_state]
+                )
+        return fail
+
+    def _step(self, state: int, token_id: int) -> int:
+        goto, fail = self._goto, self._fail
+        while state and token_id not in goto[state]:
+            state = fail[state]
+        return goto[state].get(token_id, 0)
+
+    def find(self, text: str) -> List[int]:
+        """Return the keyword index of every match in text, in order"""
+        matches = []
+        state = 0
+        vocab_get = self.vocab.get
+        for token in tokenize(text):
+            token_id = vocab_get(token)
+            if token_id is None:
+                # No pattern contains this token, so every match restarts
+                state = 0
+                continue
+            state = self._step(state, token_id)
+            matches.extend(self._outputs[state])
+        return matches
+
+    def find_batch(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Match many texts at once.
+
+        Returns ``(rows, keyword_ids)`` arrays with one entry per match, where
+        ``rows`` indexes into texts. All texts are tokenized in a single
+        buffer, tokens are mapped to vocabulary ids in bulk, and the
+        automaton only steps through tokens that occur in some pattern.
+        """
+        encoded = [text.lower().encode() for text in texts]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        # Byte offset of each text in the joined buffer (+1 for separator)
+        text_starts = np.cumsum(lengths + 1) - (lengths + 1)
+        buffer = b" ".join(encoded).translate(_TOKEN_TABLE)
+        tokens = buffer.split()
+
+        token_ids = np.fromiter(
+            map(self.vocab.get, tokens, repeat(-1)), dtype=np.int64, count=len(tokens)
+        )
+        positions = np.flatnonzero(token_ids >= 0)
+        if not len(positions):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Byte offset where each token starts, then the text it belongs to
+        is_word = np.frombuffer(buffer, dtype=np.uint8) != _SPACE
+        token_starts = np.flatnonzero(is_word & ~np.concatenate(([False], is_word[:-1])))
+        token_rows = np.searchsorted(text_starts, token_starts[positions], side="right") - 1
+
+        # The automaton restarts wherever a non-vocabulary token or a text
+        # boundary separates two vocabulary tokens
+        restart = np.ones(len(positions), dtype=bool)
+        restart[1:] = (np.diff(positions) != 1) | (np.diff(token_rows) != 0)
+
+        rows = []
+        keyword_ids = []
+        outputs = self._outputs
+        state = 0
+        for row, token_id, reset in zip(
+            token_rows.tolist(), token_ids[positions].tolist(), restart.tolist()
+        ):
+            state = self._step(0 if reset else state, token_id)
+            for keyword_id in outputs[state]:
+                rows.append(row)
+                keyword_ids.append(keyword_id)
+
+        return np.asarray(rows, dtype=np.int64), np.asarray(keyword_ids, dtype=np.int64)
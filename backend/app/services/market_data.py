@@ -0,0 +1,93 @@
+from datetime import date
+from typing import Optional, Sequence
+import numpy as np
+from app.services.price_store import PriceStore, is_storable, to_timestamp
+from app.services.rng import stable_hash_array, uniform_array
+
+_EPOCH = date(2000, 1, 1)
+_DAY_SALT = np.uint64(0xD1B54A32D192ED03)
+_WEEK_SALT = np.uint64(0x8CB92BA72F3D8DD7)
+
+class SyntheticMarketData:
+    """
+    Deterministic daily closes for any symbol, without network access.
+
+    Each day's return is a pure function of (symbol, day) built from the
+    counter-based generator in app.services.rng, so any window of history
+    can be produced for many symbols at once with array operations and is
+    identical in every process. Returns carry short-term momentum (a moving
+    average of past shocks) and weekly volatility regimes, which gives the
+    prediction model real structure to learn from.
+    """
+
+    def __init__(self, momentum: float = 0.35, momentum_lags: int = 8, base_volatility: float = 0.015):
+        self.momentum = momentum
+        self.momentum_lags = momentum_lags
+        self.base_volatility = base_volatility
+
+    def _normal(self, seeds: np.ndarray) -> np.ndarray:
+        """Standard normal draws, one per seed (Box-Muller)"""
+        u1 = uniform_array(seeds, 0, np.finfo(np.float64).tiny, 1.0)
+        u2 = uniform_array(seeds, 1)
+        return np.sqrt(-2.0 * np.log(u1)) * np.cos(2.0 * np.pi * u2)
+
+    def returns(self, symbols: Sequence[str], end: date, length: int) -> np.ndarray:
+        """Daily log returns, shape (len(symbols), length), the last for day ``end``"""
+        symbol_seeds = stable_hash_array(symbols)[:, None]
+        last = (end - _EPOCH).days
+        lags = self.momentum_lags
+        days = np.arange(last - length - lags + 1, last + 1, dtype=np.uint64)
+
+        shocks = self._normal(symbol_seeds ^ (days * _DAY_SALT))
+        # Momentum: each return also carries decaying echoes of recent shocks
+        mixed = shocks[:, lags:].copy()
+        for lag in range(1, lags + 1):
+            mixed += self.momentum ** lag * shocks[:, lags - lag:shocks.shape[1] - lag]
+
+        weeks = days[lags:] // np.uint64(7)
+        regime = self._normal(symbol_seeds ^ (weeks * _WEEK_SALT))
+        level = uniform_array(symbol_seeds[:, 0], 2, 0.6, 1.6)[:, None]
+        volatility = self.base_volatility * level * np.exp(0.35 * regime)
+        return volatility * mixed / np.sqrt(1.0 / (1.0 - self.momentum ** 2))
+
+    def closes(self, symbols: Sequence[str], end: date, length: int) -> np.ndarray:
+        """
+        Daily closes, shape (len(symbols), length), the last for day ``end``.
+        Each call rebases the window at a per-symbol starting price, so only
+        relative moves within a window are meaningful.
+        """
+        returns = self.returns(symbols, end, length - 1)
+        symbol_seeds = stable_hash_array(symbols)
+        start = uniform_array(symbol_seeds, 3, np.log(10.0), np.log(500.0))
+        log_prices = np.concatenate([np.zeros((len(symbols), 1)), np.cumsum(returns, axis=1)], axis=1)
+        return np.exp(start[:, None] + log_prices)
+
+class StoredMarketData:
+    """
+    Daily closes read from a PriceStore. Symbols with fewer than the
+    requested bars up to ``end``, or that the store cannot name (such as
+    ``BRK/B``), are served by ``fallback`` if one is given, otherwise they
+    raise KeyError.
+    """
+
+    def __init__(self, store: PriceStore, fallback: Optional[SyntheticMarketData] = None):
+        self.store = store
+        self.fallback = fallback
+
+    def closes(self, symbols: Sequence[str], end: date, length: int) -> np.ndarray:
+        """Daily closes, shape (len(symbols), length), the last at or before day ``end``"""
+        stored = [i for i, symbol in enumerate(symbols) if is_storable(symbol)]
+        if len(stored) == len(symbols):
+            closes = self.store.matrix(symbols, length, to_timestamp(end) + 86399)
+        else:
+            closes = np.full((len(symbols), length), np.nan)
+            if stored:
+                closes[stored] = self.store.matrix(
+                    [symbols[i] for i in stored], length, to_timestamp(end) + 86399
+                )
+        short = np.flatnonzero(np.isnan(closes).any(axis=1))
+        if len(short):
+            if self.fallback is None:
+                raise KeyError(f"Not enough price history for {symbols[short[0]]}")
+            closes[short] = self.fallback.closes([symbols[i] for i in short], end, length)
+        return closes
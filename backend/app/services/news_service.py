@@ -1,5 +1,31 @@
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import base64
+import bisect
+from app.core.metrics import timed
+from app.schemas.news import NewsItem
+from app.services.rng import stable_hash
+
+NewsCursor = Tuple[datetime, str]
+
+def encode_cursor(item: NewsItem) -> str:
+    """Encode an item's (publishedAt, id) sort key as an opaque cursor"""
+    raw = f"{item.publishedAt.isoformat()},{item.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> NewsCursor:
+    """Decode a cursor from encode_cursor, raising ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        published_at, item_id = raw.split(",", 1)
+        published_at = datetime.fromisoformat(published_at)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    
+    # Index timestamps are naive UTC
+    if published_at.tzinfo is not None:
+        published_at = published_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return published_at, item_id
 
 class NewsService:
     """Mock news service with deterministic results"""
@@ -26,40 +52,125 @@ class NewsService:
         
         self.symbols = ["AAPL", "NVDA", "TSLA", "MSFT", "GOOGL", "AMZN", "META", "NFLX"]
     
-    def get_news(self, symbol: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        # Precomputed feeds, rebuilt when the UTC hour they are anchored to changes
+        self._index: Tuple[Optional[datetime], List[List[NewsItem]], List[List[NewsCursor]]] = (
+            None, [], []
+        )
+        self._symbol_offsets = {symbol: self._symbol_offset(symbol) for symbol in self.symbols}
+        self._get_feeds(datetime.utcnow())
+    
+    @timed("news")
+    def get_news(
+        self,
+        symbol: Optional[str] = None,
+        limit: int = 20,
+        before: Optional[NewsCursor] = None,
+    ) -> List[NewsItem]:
         """
-        Get mock news items, optionally filtered by symbol
+        Get mock news items, newest first, optionally filtered by symbol and
+        starting strictly after the ``before`` cursor.
+        Items are shared with the precomputed index and must not be mutated.
         """
+        feed, start = self._locate(symbol, before)
+        return feed[start:start + limit]
+    
+    def version(self, now: Optional[datetime] = None) -> str:
+        """
+        Key that changes whenever the feeds change: they are rebuilt from
+        fixed headlines at the start of every UTC hour
+        """
+        anchor = (now or datetime.utcnow()).replace(minute=0, second=0, microsecond=0)
+        return f"news:{anchor.isoformat()}"
+    
+    @staticmethod
+    def seconds_until_rebuild(now: Optional[datetime] = None) -> int:
+        """Seconds until the next hourly rebuild changes the feeds"""
+        now = now or datetime.utcnow()
+        return int(3600 - (now.minute * 60 + now.second + now.microsecond / 1e6))
+    
+    def iter_news(
+        self, symbol: Optional[str] = None, before: Optional[NewsCursor] = None
+    ) -> Iterator[NewsItem]:
+        """Lazily yield news items, newest first, for streaming responses"""
+        feed, start = self._locate(symbol, before)
+        for i in range(start, len(feed)):
+            yield feed[i]
+    
+    def _locate(
+        self, symbol: Optional[str], before: Optional[NewsCursor]
+    ) -> Tuple[List[NewsItem], int]:
+        """Return the feed for symbol and the index of the first item to serve"""
+        feeds, feed_keys = self._get_feeds(datetime.utcnow())
+        
         # Filter headlines based on symbol if provided
+        offset = 0
         if symbol:
-            # Use symbol to create deterministic filtering
-            symbol_seed = hash(symbol) % len(self.news_pool)
-            filtered_headlines = self.news_pool[symbol_seed:symbol_seed + limit]
-        else:
-            filtered_headlines = self.news_pool[:limit]
+            offset = self._symbol_offsets.get(symbol)
+            if offset is None:
+                offset = self._symbol_offset(symbol)
         
-        news_items = []
-        base_time = datetime.utcnow()
+        feed = feeds[offset]
+        if before is None:
+            return feed, 0
+        # Keys ascend while the feed descends: items older than the cursor
+        # are the last bisect_left(...) entries of the feed
+        older = bisect.bisect_left(feed_keys[offset], before)
+        return feed, len(feed) - older
+    
+    def _symbol_offset(self, symbol: str) -> int:
+        """Use a stable hash of the symbol to pick its deterministic slice"""
+        return stable_hash(symbol) % len(self.news_pool)
+    
+    def _get_feeds(self, now: datetime) -> Tuple[List[List[NewsItem]], List[List[NewsCursor]]]:
+        """
+        Return the feed for every slice offset, rebuilding the index when the
+        hour changes. Timestamps are anchored to the start of the UTC hour so
+        every worker process serves identical items.
+        """
+        anchor = now.replace(minute=0, second=0, microsecond=0)
+        index_anchor, feeds, feed_keys = self._index
+        if anchor != index_anchor:
+            feeds = self._build_feeds(anchor)
+            # Ascending (publishedAt, id) sort keys for cursor lookups
+            feed_keys = [
+                [(item.publishedAt, item.id) for item in reversed(feed)] for feed in feeds
+            ]
+            self._index = (anchor, feeds, feed_keys)
+        return feeds, feed_keys
+    
+    @timed("news", "build_feeds")
+    def _build_feeds(self, base_time: datetime) -> List[List[NewsItem]]:
+        """
+        Build one feed per slice offset. An item's timestamp and sentiment
+        depend on its position within the slice, so each offset gets its own
+        list of items, sorted newest first.
+        """
+        item_ids = [f"n_{stable_hash(headline) % 10000}" for headline in self.news_pool]
         
-        for i, headline in enumerate(filtered_headlines):
-            # Create deterministic news item
-            item_id = f"n_{hash(headline) % 10000}"
-            published_at = base_time - timedelta(hours=i * 2)
-            
-            news_items.append({
-                "id": item_id,
-                "headline": headline,
-                "publishedAt": published_at,
-                "url": f"https://example.com/news/{item_id}",
-                "sentiment": "Positive" if i % 3 == 0 else "Neutral" if i % 3 == 1 else "Negative",
-                "sentimentScore": round(0.3 + (i % 7) * 0.1, 2)
-            })
+        feeds = []
+        for offset in range(len(self.news_pool)):
+            feed = []
+            for i, headline in enumerate(self.news_pool[offset:]):
+                # Create deterministic news item
+                item_id = item_ids[offset + i]
+                feed.append(NewsItem(
+                    id=item_id,
+                    headline=headline,
+                    publishedAt=base_time - timedelta(hours=i * 2),
+                    url=f"https://example.com/news/{item_id}",
+                    sentiment="Positive" if i % 3 == 0 else "Neutral" if i % 3 == 1 else "Negative",
+                    sentimentScore=round(0.3 + (i % 7) * 0.1, 2)
+                ))
+            feeds.append(feed)
         
-        return news_items[:limit]
+        return feeds
     
-    def get_symbol_news(self, symbol: str, limit: int = 20) -> List[Dict[str, Any]]:
+    @timed("news")
+    def get_symbol_news(
+        self, symbol: str, limit: int = 20, before: Optional[NewsCursor] = None
+    ) -> List[NewsItem]:
         """Get news specifically for a symbol"""
-        return self.get_news(symbol=symbol, limit=limit)
+        return self.get_news(symbol=symbol, limit=limit, before=before)
     
     # TODO: Replace with real news API integration
     def _get_real_news(self, symbol: str, limit: int) -> List[Dict[str, Any]]:
@@ -0,0 +1,287 @@
+"""
+Precompute predictions for the whole symbol universe into the predictions table.
+
+The universe is every symbol on a watchlist, in an active alert or in the
+price store. Every supported window is scored for the given day (default:
+tomorrow), and rows already stored for that day are replaced, so re-running
+a day is safe. A full run is recorded as complete in prediction_runs. Run it
+after the day's closing prices have been imported.
+
+Run from the backend directory:
+    python -m app.services.prediction_precompute --date 2025-01-17
+"""
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from datetime import date, datetime, time as dt_time, timedelta
+import argparse
+import asyncio
+import logging
+import time
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, async_engine
+from app.models import user  # noqa: F401 - Imported to register models with SQLAlchemy
+from app.models.alert import Alert
+from app.models.prediction import Prediction, PredictionRun
+from app.models.watchlist import WatchlistItem
+from app.services.market_data import StoredMarketData
+from app.services.prediction_service import PredictionService, SUPPORTED_WINDOWS
+
+logger = logging.getLogger(__name__)
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, datetime.min.time())
+
+async def symbol_universe(db: AsyncSession, prediction_service: PredictionService) -> List[str]:
+    """Symbols on any watchlist, in any active alert or in the price store"""
+    symbols = set((await db.execute(select(WatchlistItem.symbol).distinct())).scalars())
+    symbols.update((await db.execute(
+        select(Alert.symbol).where(Alert.is_active == "active").distinct()
+    )).scalars())
+    market_data = prediction_service.predictor.market_data
+    if isinstance(market_data, StoredMarketData):
+        symbols.update(market_data.store.symbols())
+    return sorted(symbol.upper() for symbol in symbols)
+
+async def load_precomputed(
+    db: AsyncSession,
+    prediction_service: PredictionService,
+    symbols: Sequence[str],
+    windows: Iterable[str],
+    now: Optional[datetime] = None,
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """
+    Load the stored predictions for symbols and windows at now into the
+    service's cache, returning them by (symbol, window). Rows from another
+    model version are ignored. Database errors are logged and treated as no
+    rows, so callers fall back to live scoring.
+    """
+    now = now or datetime.now()
+    query = select(
+        Prediction.symbol, Prediction.window, Prediction.delta_pct, Prediction.confidence
+    ).where(
+        Prediction.as_of == prediction_service.prediction_time(now),
+        Prediction.model_version == prediction_service.model_version,
+        Prediction.symbol.in_(list(symbols)),
+        Prediction.window.in_(list(windows)),
+    )
+    try:
+        rows = (await db.execute(query)).all()
+    except SQLAlchemyError:
+        logger.warning("Precomputed prediction lookup failed", exc_info=True)
+        return {}
+    return {
+        (symbol, window): prediction_service.prime(symbol, window, now, delta_pct, confidence)
+        for symbol, window, delta_pct, confidence in rows
+    }
+
+class PredictionPrecomputer:
+    """
+    Materializes every window's prediction for the symbol universe.
+
+    Symbols are scored ``batch_size`` at a time on a worker thread, one
+    predict call per window. Each chunk replaces the chunk's stored rows for
+    the day with one executemany INSERT and is committed on its own. A run
+    over the whole universe marks its ``prediction_runs`` row complete.
+
+    The background loop catches up on today (and tomorrow, once the daily
+    run time has passed) at startup, then runs at ``at`` local time every
+    day for the next day. A worker only runs a day after claiming its
+    ``prediction_runs`` row, so with several workers one does the work. An
+    incomplete run whose holder stopped heartbeating for ``lease_seconds``
+    is claimed again and redone.
+    """
+
+    def __init__(
+        self,
+        prediction_service: Optional[PredictionService] = None,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+    ):
+        self.prediction_service = prediction_service or PredictionService()
+        self.batch_size = batch_size or settings.PREDICTION_PRECOMPUTE_BATCH_SIZE
+        self.lease = timedelta(seconds=lease_seconds or settings.PREDICTION_PRECOMPUTE_LEASE_SECONDS)
+        self._task: Optional[asyncio.Task] = None
+
+    async def precompute(
+        self, db: AsyncSession, day: date, symbols: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Store predictions for day and return run statistics"""
+        start = time.perf_counter()
+        complete = symbols is None
+        if complete:
+            symbols = await symbol_universe(db, self.prediction_service)
+        symbols = list(dict.fromkeys(symbols))
+        as_of = self.prediction_service.prediction_time(_day_start(day))
+        loop = asyncio.get_running_loop()
+        written = 0
+        for i in range(0, len(symbols), self.batch_size):
+            chunk = symbols[i:i + self.batch_size]
+            rows = await loop.run_in_executor(None, self._rows, chunk, day)
+            await db.execute(
+                delete(Prediction.__table__).where(
+                    Prediction.as_of == as_of, Prediction.symbol.in_(chunk)
+                )
+            )
+            await db.execute(insert(Prediction.__table__), rows)
+            await db.execute(
+                self._run_update(as_of).where(PredictionRun.completed_at.is_(None)).values(
+                    heartbeat_at=datetime.utcnow()
+                )
+            )
+            await db.commit()
+            written += len(rows)
+
+        if complete:
+            await self._mark_complete(db, as_of)
+        return {
+            "day": day.isoformat(),
+            "symbols": len(symbols),
+            "rows": written,
+            "seconds": time.perf_counter() - start,
+        }
+
+    def _rows(self, symbols: List[str], day: date) -> List[Dict[str, Any]]:
+        service = self.prediction_service
+        as_of = service.prediction_time(_day_start(day))
+        rows = []
+        for window in SUPPORTED_WINDOWS:
+            delta_pct, confidence = service.predictor.predict(symbols, window, day)
+            rows.extend(
+                {
+                    "symbol": symbol,
+                    "window": window,
+                    "as_of": as_of,
+                    "delta_pct": delta,
+                    "confidence": conf,
+                    "model_type": service.model_type,
+                    "model_version": service.model_version,
+                }
+                for symbol, delta, conf in zip(symbols, delta_pct.tolist(), confidence.tolist())
+            )
+        return rows
+
+    def _run_update(self, as_of: datetime):
+        return update(PredictionRun.__table__).where(
+            PredictionRun.as_of == as_of,
+            PredictionRun.model_version == self.prediction_service.model_version,
+        )
+
+    async def _mark_complete(self, db: AsyncSession, as_of: datetime):
+        now = datetime.utcnow()
+        result = await db.execute(self._run_update(as_of).values(heartbeat_at=now, completed_at=now))
+        if result.rowcount == 0:
+            await db.execute(insert(PredictionRun.__table__).values(
+                as_of=as_of, model_version=self.prediction_service.model_version,
+                heartbeat_at=now, completed_at=now,
+            ))
+        await db.commit()
+
+    async def is_precomputed(self, db: AsyncSession, day: date) -> bool:
+        """Whether a full run of the current model completed for day"""
+        query = select(PredictionRun.id).where(
+            PredictionRun.as_of == self.prediction_service.prediction_time(_day_start(day)),
+            PredictionRun.model_version == self.prediction_service.model_version,
+            PredictionRun.completed_at.is_not(None),
+        )
+        return (await db.execute(query)).first() is not None
+
+    async def claim(self, db: AsyncSession, day: date) -> bool:
+        """
+        Claim day's run for this worker. Fails if the run is complete or
+        another worker heartbeated it within the lease.
+        """
+        as_of = self.prediction_service.prediction_time(_day_start(day))
+        now = datetime.utcnow()
+        run = (await db.execute(
+            select(PredictionRun.heartbeat_at, PredictionRun.completed_at).where(
+                PredictionRun.as_of == as_of,
+                PredictionRun.model_version == self.prediction_service.model_version,
+            )
+        )).first()
+        if run is None:
+            try:
+                await db.execute(insert(PredictionRun.__table__).values(
+                    as_of=as_of, model_version=self.prediction_service.model_version, heartbeat_at=now,
+                ))
+                await db.commit()
+            except IntegrityError:
+                # Another worker inserted the row first
+                await db.rollback()
+                return False
+            return True
+        if run.completed_at is not None or run.heartbeat_at > now - self.lease:
+            return False
+
+        # Take over a stalled run unless another worker already has
+        result = await db.execute(
+            self._run_update(as_of).where(
+                PredictionRun.heartbeat_at == run.heartbeat_at,
+                PredictionRun.completed_at.is_(None),
+            ).values(heartbeat_at=now)
+        )
+        await db.commit()
+        return result.rowcount == 1
+
+    async def run(self, session_factory: async_sessionmaker, at: dt_time):
+        """Precompute missing days, then the next day at ``at`` daily, until cancelled"""
+        while True:
+            now = datetime.now()
+            days = [now.date()]
+            if now.time() >= at:
+                days.append(now.date() + timedelta(days=1))
+            for day in days:
+                try:
+                    async with session_factory() as db:
+                        if await self.claim(db, day):
+                            stats = await self.precompute(db, day)
+                            logger.info("Precomputed predictions: %s", stats)
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("Prediction precompute for %s failed", day)
+
+            next_run = datetime.combine(now.date(), at)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep(max((next_run - datetime.now()).total_seconds(), 0))
+
+    def start(self, session_factory: async_sessionmaker, at: dt_time):
+        """Start the background precompute loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(session_factory, at))
+
+    async def stop(self):
+        """Cancel the background precompute loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", type=date.fromisoformat, help="prediction day (default: tomorrow)")
+    parser.add_argument("--symbols", help="comma-separated symbols to compute instead of the universe")
+    parser.add_argument("--batch-size", type=int, default=settings.PREDICTION_PRECOMPUTE_BATCH_SIZE)
+    args = parser.parse_args()
+
+    day = args.date or date.today() + timedelta(days=1)
+    symbols = [s.strip().upper() for s in args.symbols.split(",") if s.strip()] if args.symbols else None
+    precomputer = PredictionPrecomputer(batch_size=args.batch_size)
+
+    async def run():
+        try:
+            async with AsyncSessionLocal() as db:
+                return await precomputer.precompute(db, day, symbols)
+        finally:
+            await async_engine.dispose()
+
+    stats = asyncio.run(run())
+    print(f"stored {stats['rows']} predictions for {stats['symbols']} symbols on {stats['day']} in {stats['seconds']:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,186 @@
-from typing import Dict, Any
-from datetime import datetime
-import hashlib
-import random
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from datetime import date, datetime, timedelta
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import timed
+from app.core.singleflight import SingleFlight
+from app.services.ensemble import EnsemblePredictor, load_predictor
+
+SUPPORTED_WINDOWS = ("1d", "1w", "1m")
 
 class PredictionService:
-    """Mock prediction service with deterministic results"""
+    """
+    Next-window return predictions from the SVR/RF ensemble.
+    
+    The model artifact is loaded once per process (see
+    app.services.ensemble.load_predictor) and shared by every instance.
+    Cache misses are scored together: a batch builds one feature matrix for
+    all its uncached symbols and makes one predict call per window, and
+    identical misses from concurrent threads are scored once.
+    """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cache_size: Optional[int] = None,
+        predictor: Optional[EnsemblePredictor] = None,
+        single_flight: bool = True,
+    ):
+        self.predictor = predictor or load_predictor()
         self.model_type = "svr_rf_ensemble"
-        self.model_version = "0.0.1-mock"
+        self.model_version = self.predictor.version
+        # Predictions are fixed for a (symbol, window, date), so they are
+        # memoized until the next date rollover
+        self.cache = TTLCache(maxsize=cache_size or settings.PREDICTION_CACHE_SIZE)
+        self.flight = SingleFlight("prediction") if single_flight else None
+    
+    @timed("prediction")
+    def get_prediction(
+        self, symbol: str, window: str = "1d", now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Predict symbol's return over window from the history before now's date.
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        now = now or datetime.now()
+        if self.flight is None:
+            return self._get_many([symbol], window, now)[0]
+        prediction = self.cached(symbol, window, now)
+        if prediction is None:
+            prediction = self.flight.call(
+                self.version(symbol, window, now), self._score_one, symbol, window, now
+            )
+        return prediction
+    
+    def version(self, symbol: str, window: str, now: Optional[datetime] = None) -> str:
+        """
+        Key that changes whenever get_prediction(symbol, window) would return
+        different content, computed without generating the prediction
+        """
+        date_str = (now or datetime.now()).strftime("%Y-%m-%d")
+        return f"prediction:{symbol}:{window}:{date_str}:{self.model_type}:{self.model_version}"
     
-    def get_prediction(self, symbol: str, window: str = "1d") -> Dict[str, Any]:
+    @timed("prediction")
+    def get_predictions_batch(
+        self,
+        symbols: Iterable[str],
+        windows: Iterable[str] = ("1d",),
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Generate deterministic mock prediction based on symbol and date
+        Generate predictions for every (symbol, window) pair in one pass.
+        The date and timestamp are resolved once for the whole batch,
+        duplicate symbols or windows are only looked up once, and the
+        uncached symbols of each window are scored in one model call.
         """
-        # Create deterministic seed from symbol and current date
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        seed_input = f"{symbol}_{date_str}"
-        seed = int(hashlib.md5(seed_input.encode()).hexdigest()[:8], 16)
-        random.seed(seed)
+        now = now or datetime.now()
+        symbols = list(dict.fromkeys(symbols))
+        by_window = {window: self._get_many(symbols, window, now) for window in dict.fromkeys(windows)}
+        
+        results = []
+        for i in range(len(symbols)):
+            for window, predictions in by_window.items():
+                results.append(dict(predictions[i], window=window))
         
-        # Generate deterministic pseudo-random values
-        delta_pct = random.uniform(-10.0, 10.0)
-        confidence = random.uniform(0.5, 0.95)
+        return results
+    
+    def cached(self, symbol: str, window: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached prediction for (symbol, window) at now, or None"""
+        date_str = (now or datetime.now()).strftime("%Y-%m-%d")
+        return self.cache.get((symbol, window, date_str))
+    
+    def missing(
+        self, symbols: Iterable[str], windows: Iterable[str], now: Optional[datetime] = None
+    ) -> List[str]:
+        """Symbols with at least one of windows not cached at now"""
+        date_str = (now or datetime.now()).strftime("%Y-%m-%d")
+        windows = list(windows)
+        return [
+            symbol for symbol in dict.fromkeys(symbols)
+            if any((symbol, window, date_str) not in self.cache for window in windows)
+        ]
+    
+    def prime(
+        self, symbol: str, window: str, now: datetime, delta_pct: float, confidence: float
+    ) -> Dict[str, Any]:
+        """Cache a prediction scored elsewhere (e.g. precomputed) and return it"""
+        prediction = self._build_response(symbol, delta_pct, confidence, self.prediction_time(now))
+        self.cache.set(
+            (symbol, window, now.strftime("%Y-%m-%d")), prediction, expires_at=self.next_rollover(now)
+        )
+        return prediction
+    
+    @timed("prediction")
+    def predict_many(self, requests: Sequence[Tuple[str, str, datetime]]) -> List[Dict[str, Any]]:
+        """
+        Score (symbol, window, now) requests gathered from concurrent callers,
+        one model call per (window, date). Requests are assumed to be cache
+        misses already (see cached), so the cache is written but not read.
+        """
+        groups: Dict[Tuple[str, date], List[str]] = {}
+        for symbol, window, now in requests:
+            groups.setdefault((window, now.date()), []).append(symbol)
+        scored: Dict[Tuple[str, str, date], Dict[str, Any]] = {}
+        for (window, day), symbols in groups.items():
+            symbols = list(dict.fromkeys(symbols))
+            now = datetime.combine(day, datetime.min.time())
+            for symbol, prediction in zip(symbols, self._score(symbols, window, now)):
+                scored[(symbol, window, day)] = prediction
+        return [scored[(symbol, window, now.date())] for symbol, window, now in requests]
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for the prediction cache"""
+        return self.cache.stats()
+    
+    def _get_many(self, symbols: Sequence[str], window: str, now: datetime) -> List[Dict[str, Any]]:
+        """Look up predictions in the cache, scoring all misses in one model call"""
+        date_str = now.strftime("%Y-%m-%d")
+        predictions = [self.cache.get((symbol, window, date_str)) for symbol in symbols]
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        if missing:
+            scored = self._score([symbols[i] for i in missing], window, now)
+            for i, prediction in zip(missing, scored):
+                predictions[i] = prediction
+        return predictions
+    
+    def _score_one(self, symbol: str, window: str, now: datetime) -> Dict[str, Any]:
+        return self._score([symbol], window, now)[0]
+    
+    def _score(self, symbols: Sequence[str], window: str, now: datetime) -> List[Dict[str, Any]]:
+        """Score symbols in one model call and cache the results"""
+        date_str = now.strftime("%Y-%m-%d")
+        delta_pct, confidence = self.predictor.predict(list(symbols), window, now.date())
+        as_of = self.prediction_time(now)
+        expires_at = self.next_rollover(now)
+        predictions = []
+        for symbol, delta, conf in zip(symbols, delta_pct.tolist(), confidence.tolist()):
+            prediction = self._build_response(symbol, delta, conf, as_of)
+            self.cache.set((symbol, window, date_str), prediction, expires_at=expires_at)
+            predictions.append(prediction)
+        return predictions
+    
+    @staticmethod
+    def prediction_time(now: datetime) -> datetime:
+        """
+        asOf of the predictions served at now: the (naive UTC) local midnight
+        that started the day, so every process reports the same value
+        """
+        midnight = datetime.combine(now.date(), datetime.min.time())
+        return datetime.utcfromtimestamp(midnight.timestamp())
+    
+    @staticmethod
+    def next_rollover(now: datetime) -> float:
+        """Timestamp of the next local midnight, when the prediction date changes"""
+        tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return tomorrow.timestamp()
+    
+    def _build_response(
+        self, symbol: str, delta_pct: float, confidence: float, as_of: datetime
+    ) -> Dict[str, Any]:
         direction = "up" if delta_pct > 0 else "down"
         
         return {
             "symbol": symbol,
-            "asOf": datetime.utcnow(),
+            "asOf": as_of,
             "prediction": {
                 "deltaPct": round(delta_pct, 2),
                 "direction": direction,
@@ -38,12 +191,3 @@ class PredictionService:
                 "version": self.model_version
             }
         }
-    
-    # TODO: Replace with real ML model inference
-    def _get_real_prediction(self, symbol: str, window: str) -> Dict[str, Any]:
-        """
-        Placeholder for real ML model inference
-        This would integrate with actual SVR/RF models
-        """
-        pass
-
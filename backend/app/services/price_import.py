@@ -0,0 +1,104 @@
+"""
+Import OHLCV history from CSV files into the price store.
+
+Each file needs a header with ``date`` (ISO date or datetime, UTC) or
+``timestamp`` (Unix seconds), ``open``, ``high``, ``low``, ``close`` and
+``volume`` columns, plus ``symbol`` for files holding several symbols;
+otherwise the symbol is ``--symbol`` or the file name (``AAPL.csv``).
+Directories are searched for ``*.csv``. Bars at or before a symbol's last
+stored bar are skipped, so re-running an import only appends new bars.
+
+Run from the backend directory:
+    python -m app.services.price_import data/history/ --store ./data/prices
+"""
+from typing import Dict, List, Optional
+import argparse
+import csv
+import glob
+import os
+import time
+import numpy as np
+from app.core.config import settings
+from app.services.price_store import COLUMNS, PriceStore
+
+def _timestamps(header: str, values: List[str]) -> np.ndarray:
+    if header == "timestamp":
+        return np.asarray(values, dtype=np.float64).astype(np.int64)
+    return np.asarray(values, dtype="datetime64[s]").astype(np.int64)
+
+def import_csv(store: PriceStore, path: str, symbol: Optional[str] = None) -> Dict[str, int]:
+    """Append the bars in one CSV file; returns bars written per symbol"""
+    with open(path, newline="") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        time_column = "timestamp" if "timestamp" in header else "date"
+        required = [time_column, *COLUMNS[1:]]
+        missing = [name for name in required if name not in header]
+        if missing:
+            raise ValueError(f"{path}: missing columns {missing}")
+        has_symbol = "symbol" in header
+        positions = [header.index(name) for name in required]
+        symbol_position = header.index("symbol") if has_symbol else None
+
+        columns: List[List[str]] = [[] for _ in required]
+        symbols: List[str] = []
+        for row in reader:
+            if not row:
+                continue
+            for values, position in zip(columns, positions):
+                values.append(row[position])
+            if has_symbol:
+                symbols.append(row[symbol_position].strip().upper())
+
+    if not columns[0]:
+        return {}
+    timestamps = _timestamps(time_column, columns[0])
+    data = {name: np.asarray(values, dtype=np.float64) for name, values in zip(COLUMNS[1:], columns[1:])}
+    if has_symbol:
+        labels = np.asarray(symbols)
+    else:
+        name = symbol or os.path.splitext(os.path.basename(path))[0]
+        labels = np.full(len(timestamps), name.upper())
+
+    written = {}
+    # Group by symbol, then time; np.unique keeps the first of duplicate bars
+    order = np.lexsort((timestamps, labels))
+    labels, timestamps = labels[order], timestamps[order]
+    data = {name: values[order] for name, values in data.items()}
+    boundaries = np.flatnonzero(labels[1:] != labels[:-1]) + 1
+    for lo, hi in zip(np.r_[0, boundaries], np.r_[boundaries, len(labels)]):
+        name = str(labels[lo])
+        stamps, first = np.unique(timestamps[lo:hi], return_index=True)
+        rows = lo + first
+        last = store.last(name, 1, columns=("timestamp",))["timestamp"]
+        if len(last):
+            newer = stamps > last[0]
+            stamps, rows = stamps[newer], rows[newer]
+        bars = {"timestamp": stamps, **{column: data[column][rows] for column in COLUMNS[1:]}}
+        written[name] = store.append(name, bars)
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="CSV files or directories of CSV files")
+    parser.add_argument("--store", default=settings.PRICE_STORE_PATH, help="price store directory (default: PRICE_STORE_PATH)")
+    parser.add_argument("--symbol", help="symbol for single-symbol files without a symbol column")
+    args = parser.parse_args()
+    if not args.store:
+        parser.error("--store is required when PRICE_STORE_PATH is not set")
+
+    files = []
+    for path in args.paths:
+        files.extend(sorted(glob.glob(os.path.join(path, "*.csv"))) if os.path.isdir(path) else [path])
+
+    store = PriceStore(args.store)
+    start = time.perf_counter()
+    symbols, bars = set(), 0
+    for path in files:
+        written = import_csv(store, path, args.symbol)
+        symbols.update(written)
+        bars += sum(written.values())
+    print(f"imported {bars} bars for {len(symbols)} symbols from {len(files)} files in {time.perf_counter() - start:.1f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import os
+import re
+import threading
+import numpy as np
+
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+DTYPES = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f8"),
+    "high": np.dtype("<f8"),
+    "low": np.dtype("<f8"),
+    "close": np.dtype("<f8"),
+    "volume": np.dtype("<f8"),
+}
+
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9.\-]{0,14}$")
+
+TimeLike = Union[int, date, datetime, np.datetime64, str]
+
+def is_storable(symbol: str) -> bool:
+    """Whether symbol can name a directory in the store"""
+    return bool(_SYMBOL_PATTERN.match(symbol))
+
+def to_timestamp(value: TimeLike) -> int:
+    """Unix seconds for a bar time; naive datetimes and dates are taken as UTC"""
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp())
+    if isinstance(value, date):
+        return int(datetime(value.year, value.month, value.day, tzinfo=timezone.utc).timestamp())
+    return int(np.datetime64(value, "s").astype(np.int64))
+
+class PriceStore:
+    """
+    Append-only columnar store of OHLCV bars, memory-mapped with NumPy.
+
+    Each symbol has a directory with one raw little-endian file per column
+    (``timestamp`` as int64 Unix seconds, the rest float64), so a symbol's
+    bars for a date range are a contiguous slice of each file. Reads return
+    read-only views into the memory maps: no copy, and the OS page cache is
+    shared by every worker process.
+
+    Appends must be newer than the last stored bar. Data columns are
+    written before ``timestamp`` and the row count is taken from the
+    timestamp file, so an interrupted append is invisible to readers and
+    trimmed by the next append. Open maps are kept in an LRU of at most
+    ``max_open`` columns (each holds a file descriptor); maps opened before
+    another process appended keep showing the older bars until ``refresh``.
+    """
+
+    def __init__(self, root: str, max_open: int = 4096):
+        self.root = root
+        self.max_open = max_open
+        self._maps: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol: str, column: str) -> str:
+        if not _SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol: {symbol!r}")
+        return os.path.join(self.root, symbol, f"{column}.bin")
+
+    def _file_rows(self, symbol: str, column: str) -> int:
+        try:
+            return os.path.getsize(self._path(symbol, column)) // DTYPES[column].itemsize
+        except FileNotFoundError:
+            return 0
+
+    def _column(self, symbol: str, column: str) -> np.ndarray:
+        key = (symbol, column)
+        with self._lock:
+            array = self._maps.get(key)
+            if array is not None:
+                self._maps.move_to_end(key)
+                return array
+
+        rows = self._file_rows(symbol, column)
+        if column != "timestamp":
+            rows = min(rows, len(self._column(symbol, "timestamp")))
+        if rows == 0:
+            # Empty files cannot be mapped; nothing to cache either
+            return np.empty(0, dtype=DTYPES[column])
+        array = np.memmap(self._path(symbol, column), dtype=DTYPES[column], mode="r", shape=(rows,))
+
+        with self._lock:
+            self._maps[key] = array
+            while len(self._maps) > self.max_open:
+                self._maps.popitem(last=False)
+        return array
+
+    def refresh(self, symbol: Optional[str] = None) -> None:
+        """Drop cached maps (of one symbol, or all) so the next read sees new bars"""
+        with self._lock:
+            for key in [key for key in self._maps if symbol is None or key[0] == symbol]:
+                del self._maps[key]
+
+    def symbols(self) -> List[str]:
+        return sorted(
+            name for name in os.listdir(self.root)
+            if _SYMBOL_PATTERN.match(name) and os.path.exists(self._path(name, "timestamp"))
+        )
+
+    def __len__(self) -> int:
+        return len(self.symbols())
+
+    def length(self, symbol: str) -> int:
+        """Number of stored bars for symbol"""
+        return len(self._column(symbol, "timestamp"))
+
+    def append(self, symbol: str, bars: Mapping[str, Iterable]) -> int:
+        """
+        Append bars (a value sequence per column in COLUMNS, timestamps as
+        anything ``to_timestamp`` accepts or an int64/datetime64 array) and
+        return the number written. Timestamps must be strictly increasing
+        and newer than the last stored bar.
+        """
+        missing = set(COLUMNS) - set(bars)
+        if missing:
+            raise ValueError(f"Missing columns: {sorted(missing)}")
+        timestamps = np.asarray(bars["timestamp"])
+        if np.issubdtype(timestamps.dtype, np.datetime64):
+            timestamps = timestamps.astype("datetime64[s]").astype(np.int64)
+        elif not np.issubdtype(timestamps.dtype, np.integer):
+            timestamps = np.array([to_timestamp(value) for value in timestamps], dtype=np.int64)
+        columns = {"timestamp": timestamps.astype(DTYPES["timestamp"])}
+        for column in COLUMNS[1:]:
+            columns[column] = np.asarray(bars[column], dtype=DTYPES[column])
+            if columns[column].shape != timestamps.shape:
+                raise ValueError(f"Column {column} has {columns[column].shape[0]} values, expected {len(timestamps)}")
+        if len(timestamps) == 0:
+            return 0
+        if (np.diff(columns["timestamp"]) <= 0).any():
+            raise ValueError("Timestamps must be strictly increasing")
+
+        os.makedirs(os.path.dirname(self._path(symbol, "timestamp")), exist_ok=True)
+        stored = self._file_rows(symbol, "timestamp")
+        if stored and columns["timestamp"][0] <= self._last_timestamp(symbol, stored):
+            raise ValueError(f"Bars for {symbol} must be newer than the last stored bar")
+
+        for column in COLUMNS[1:] + ("timestamp",):
+            path = self._path(symbol, column)
+            with open(path, "ab") as f:
+                # Trim rows left by an interrupted append before writing
+                f.truncate(stored * DTYPES[column].itemsize)
+                f.write(columns[column].tobytes())
+        self.refresh(symbol)
+        return len(timestamps)
+
+    def _last_timestamp(self, symbol: str, stored: int) -> int:
+        with open(self._path(symbol, "timestamp"), "rb") as f:
+            f.seek((stored - 1) * DTYPES["timestamp"].itemsize)
+            return int(np.frombuffer(f.read(DTYPES["timestamp"].itemsize), dtype=DTYPES["timestamp"])[0])
+
+    def _bounds(self, symbol: str, start: Optional[TimeLike], end: Optional[TimeLike]) -> Tuple[int, int]:
+        timestamps = self._column(symbol, "timestamp")
+        lo = 0 if start is None else int(np.searchsorted(timestamps, to_timestamp(start), side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, to_timestamp(end), side="right"))
+        return lo, hi
+
+    def window(
+        self,
+        symbol: str,
+        start: Optional[TimeLike] = None,
+        end: Optional[TimeLike] = None,
+        columns: Sequence[str] = COLUMNS,
+    ) -> Dict[str, np.ndarray]:
+        """Zero-copy views of symbol's bars with start <= timestamp <= end"""
+        lo, hi = self._bounds(symbol, start, end)
+        return {column: self._column(symbol, column)[lo:hi] for column in columns}
+
+    def last(
+        self,
+        symbol: str,
+        count: int,
+        end: Optional[TimeLike] = None,
+        columns: Sequence[str] = COLUMNS,
+    ) -> Dict[str, np.ndarray]:
+        """Zero-copy views of the last count bars at or before end (fewer if history is short)"""
+        _, hi = self._bounds(symbol, None, end)
+        lo = max(0, hi - count)
+        return {column: self._column(symbol, column)[lo:hi] for column in columns}
+
+    def matrix(
+        self, symbols: Sequence[str], count: int, end: Optional[TimeLike] = None, column: str = "close"
+    ) -> np.ndarray:
+        """
+        The last count values of column at or before end for each symbol, as
+        a (len(symbols), count) array. Rows with shorter history are padded
+        with NaN at the start.
+        """
+        out = np.full((len(symbols), count), np.nan)
+        for i, symbol in enumerate(symbols):
+            values = self.last(symbol, count, end, (column,))[column]
+            if len(values):
+                out[i, count - len(values):] = values
+        return out
@@ -0,0 +1,56 @@
+"""
+Stateless, counter-based deterministic random numbers for the mock services.
+
+Every draw is a pure function of ``(seed, counter)``: the seed is a stable
+64-bit hash of some text (symbol and date, a headline, ...) and the counter
+selects the n-th value for that seed. There is no shared generator state, so
+draws are thread-safe without locks, identical across processes (unlike the
+salted builtin ``hash``), and can be computed for whole NumPy arrays of seeds
+at once. The mixing function is SplitMix64.
+"""
+from typing import Iterable
+import hashlib
+import numpy as np
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_INV_2_53 = 1.0 / (1 << 53)
+
+def stable_hash(text: str) -> int:
+    """Return a 64-bit hash of text that is the same in every process"""
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+def stable_hash_array(texts: Iterable[str]) -> np.ndarray:
+    """Return stable_hash for each text as a uint64 array"""
+    return np.fromiter((stable_hash(text) for text in texts), dtype=np.uint64)
+
+def _mix64(z: int) -> int:
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+def random_bits(seed: int, counter: int = 0) -> int:
+    """Return the counter-th 64-bit random value for seed"""
+    return _mix64((seed + (counter + 1) * _GOLDEN_GAMMA) & _MASK64)
+
+def uniform(seed: int, counter: int = 0, low: float = 0.0, high: float = 1.0) -> float:
+    """Return the counter-th value for seed, uniform in [low, high)"""
+    unit = (random_bits(seed, counter) >> 11) * _INV_2_53
+    return low + (high - low) * unit
+
+def uniform_array(
+    seeds: np.ndarray, counter: int = 0, low: float = 0.0, high: float = 1.0
+) -> np.ndarray:
+    """
+    Vectorized uniform: one value per seed, equal element-wise to
+    ``uniform(seed, counter, low, high)``.
+    """
+    z = np.asarray(seeds, dtype=np.uint64) + np.uint64(((counter + 1) * _GOLDEN_GAMMA) & _MASK64)
+    # uint64 array arithmetic wraps modulo 2**64, as SplitMix64 expects
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    z = z ^ (z >> np.uint64(31))
+    unit = (z >> np.uint64(11)).astype(np.float64) * _INV_2_53
+    return low + (high - low) * unit
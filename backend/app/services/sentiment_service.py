@@ -1,11 +1,40 @@
-from typing import List, Dict, Any
-import hashlib
-import random
+from typing import List, Dict, Any, Optional, Sequence, Union
+import json
+import numpy as np
+from app.core.config import settings
+from app.core.metrics import timed
+from app.services.keyword_matcher import KeywordMatcher, inflections
+from app.services.rng import stable_hash, stable_hash_array, uniform, uniform_array
+
+SENTIMENT_LABELS = np.array(["Negative", "Neutral", "Positive"])
+
+def _is_keyword(entry: Any) -> bool:
+    return isinstance(entry, str) or (
+        isinstance(entry, list) and bool(entry) and all(isinstance(form, str) for form in entry)
+    )
+
+def load_lexicon(path: str) -> Dict[str, List[str]]:
+    """
+    Load a keyword lexicon from a JSON file of the form
+    {"positive": [...], "negative": [...]}. Either key may be omitted.
+    Entries are matched exactly as written; an entry may be a list of forms
+    counted as one keyword, e.g. ["buyback", "buybacks"].
+    """
+    with open(path, encoding="utf-8") as f:
+        lexicon = json.load(f)
+    
+    unknown = set(lexicon) - {"positive", "negative"}
+    if unknown:
+        raise ValueError(f"Unknown lexicon keys: {', '.join(sorted(unknown))}")
+    for key, words in lexicon.items():
+        if not isinstance(words, list) or not all(_is_keyword(word) for word in words):
+            raise ValueError(f"Lexicon '{key}' must be a list of strings or lists of strings")
+    return lexicon
 
 class SentimentService:
     """Mock sentiment analysis service with deterministic results"""
     
-    def __init__(self):
+    def __init__(self, lexicon_path: Optional[str] = None):
         # Simple keyword-based sentiment mapping
         self.positive_keywords = [
             "beat", "exceed", "growth", "profit", "gain", "rise", "up", "strong",
@@ -15,41 +44,124 @@ class SentimentService:
             "miss", "decline", "loss", "fall", "down", "weak", "negative",
             "bearish", "pessimistic", "fail", "drop", "crash", "plunge"
         ]
+        
+        # Lists supplied in a lexicon file replace the defaults and, unlike
+        # the defaults, are not inflected
+        self._inflect_positive = self._inflect_negative = True
+        lexicon_path = lexicon_path or settings.SENTIMENT_LEXICON_PATH
+        if lexicon_path:
+            lexicon = load_lexicon(lexicon_path)
+            self.positive_keywords = lexicon.get("positive", self.positive_keywords)
+            self.negative_keywords = lexicon.get("negative", self.negative_keywords)
+            self._inflect_positive = "positive" not in lexicon
+            self._inflect_negative = "negative" not in lexicon
+        
+        self._compile_keywords()
+    
+    def _compile_keywords(self):
+        """Compile both keyword lists into one matcher, built once per service"""
+        self._matcher = KeywordMatcher(
+            self._forms(self.positive_keywords, self._inflect_positive)
+            + self._forms(self.negative_keywords, self._inflect_negative),
+            inflect=False,
+        )
+        self._n_positive = len(self.positive_keywords)
+        self._keyword_polarity = np.array(
+            [1] * len(self.positive_keywords) + [-1] * len(self.negative_keywords),
+            dtype=np.int8,
+        )
+    
+    @staticmethod
+    def _forms(keywords: Sequence[Union[str, List[str]]], inflect: bool) -> List[Union[str, List[str]]]:
+        return [
+            inflections(keyword) if inflect and isinstance(keyword, str) else keyword
+            for keyword in keywords
+        ]
     
+    @timed("sentiment")
     def analyze_sentiment(self, headline: str) -> Dict[str, Any]:
         """
         Analyze sentiment of a news headline
         Returns deterministic results based on headline content
         """
-        headline_lower = headline.lower()
-        
-        # Count positive and negative keywords
-        positive_count = sum(1 for word in self.positive_keywords if word in headline_lower)
-        negative_count = sum(1 for word in self.negative_keywords if word in headline_lower)
+        # Count distinct positive and negative keywords, on word boundaries
+        matched = set(self._matcher.find(headline))
+        positive_count = sum(1 for keyword_id in matched if keyword_id < self._n_positive)
+        negative_count = len(matched) - positive_count
         
         # Create deterministic seed from headline
-        seed = int(hashlib.md5(headline.encode()).hexdigest()[:8], 16)
-        random.seed(seed)
+        seed = stable_hash(headline)
         
         # Determine sentiment
         if positive_count > negative_count:
             sentiment = "Positive"
-            base_score = 0.6 + random.uniform(0, 0.3)
+            base_score = 0.6 + uniform(seed, high=0.3)
         elif negative_count > positive_count:
             sentiment = "Negative"
-            base_score = 0.2 + random.uniform(0, 0.3)
+            base_score = 0.2 + uniform(seed, high=0.3)
         else:
             sentiment = "Neutral"
-            base_score = 0.4 + random.uniform(0, 0.2)
+            base_score = 0.4 + uniform(seed, high=0.2)
         
         return {
             "sentiment": sentiment,
             "sentimentScore": round(base_score, 2)
         }
     
+    @timed("sentiment")
     def analyze_batch(self, headlines: List[str]) -> List[Dict[str, Any]]:
         """Analyze sentiment for multiple headlines"""
-        return [self.analyze_sentiment(headline) for headline in headlines]
+        labels, scores = self._score_batch(headlines)
+        return [
+            {"sentiment": label, "sentimentScore": round(score, 2)}
+            for label, score in zip(labels.tolist(), scores.tolist())
+        ]
+    
+    @timed("sentiment")
+    def analyze_columns(self, headlines: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Analyze sentiment for many headlines and return columnar results:
+        ``sentiment`` (str array), ``sentimentScore`` (float64 array) and the
+        ``positiveCount``/``negativeCount`` keyword counts (int64 arrays)
+        """
+        labels, scores, positive_count, negative_count = self._score_batch(
+            headlines, with_counts=True
+        )
+        return {
+            "sentiment": labels,
+            "sentimentScore": np.round(scores, 2),
+            "positiveCount": positive_count,
+            "negativeCount": negative_count,
+        }
+    
+    def _score_batch(self, headlines: List[str], with_counts: bool = False):
+        """
+        Vectorized equivalent of analyze_sentiment over a list of headlines.
+
+        The keyword matcher finds every (headline, keyword) match in one pass,
+        and counting, labelling and scoring are done with array operations.
+        """
+        n = len(headlines)
+        rows, keyword_ids = self._matcher.find_batch(headlines)
+        
+        # Each keyword counts once per headline, however often it occurs
+        n_keywords = len(self._keyword_polarity)
+        pairs = np.unique(rows * n_keywords + keyword_ids)
+        rows, keyword_ids = np.divmod(pairs, n_keywords)
+        polarity = self._keyword_polarity[keyword_ids]
+        positive_count = np.bincount(rows[polarity > 0], minlength=n)
+        negative_count = np.bincount(rows[polarity < 0], minlength=n)
+        
+        # 0 = Negative, 1 = Neutral, 2 = Positive
+        label_idx = np.sign(positive_count - negative_count) + 1
+        base = np.array([0.2, 0.4, 0.6])[label_idx]
+        spread = np.array([0.3, 0.2, 0.3])[label_idx]
+        scores = base + uniform_array(stable_hash_array(headlines), 0, 0.0, 1.0) * spread
+        labels = SENTIMENT_LABELS[label_idx]
+        
+        if with_counts:
+            return labels, scores, positive_count, negative_count
+        return labels, scores
     
     # TODO: Replace with real LLM-based sentiment analysis
     def _get_real_sentiment(self, headline: str) -> Dict[str, Any]:
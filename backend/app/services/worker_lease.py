@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.lease import WorkerLease
+
+async def claim_lease(db: AsyncSession, name: str, holder: str, seconds: float) -> bool:
+    """
+    Take or renew the lease on name for seconds. Succeeds if holder already
+    holds it, nobody does, or the current lease has expired; the row is
+    updated in one guarded statement, so two workers cannot both win.
+    """
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=seconds)
+    result = await db.execute(
+        update(WorkerLease.__table__)
+        .where(
+            WorkerLease.name == name,
+            or_(WorkerLease.holder == holder, WorkerLease.expires_at <= now),
+        )
+        .values(holder=holder, expires_at=expires_at)
+    )
+    if result.rowcount == 1:
+        await db.commit()
+        return True
+    try:
+        await db.execute(
+            insert(WorkerLease.__table__).values(name=name, holder=holder, expires_at=expires_at)
+        )
+        await db.commit()
+    except IntegrityError:
+        # Another worker holds the lease
+        await db.rollback()
+        return False
+    return True
@@ -0,0 +1,86 @@
+"""
+Time one alert evaluation cycle over a large table of active alerts.
+
+Builds a throwaway SQLite database with ``--alerts`` active alerts spread
+over ``--symbols`` symbols, then runs AlertEvaluator.evaluate once and
+reports the time per cycle and the throughput.
+
+Run from the backend directory:
+    python -m benchmarks.bench_alert_evaluator --alerts 1000000 --symbols 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.session import Base
+from app.models import user, watchlist, alert  # noqa: F401 - Imported to register models with SQLAlchemy
+from app.services.alert_evaluator import AlertEvaluator, OPERATORS
+
+
+def _load(db_path: str, alerts: int, symbols: int):
+    Base.metadata.create_all(create_engine(f"sqlite:///{db_path}"))
+    rng = random.Random(0)
+    ops = [op for op, _ in OPERATORS]
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO users (id, email, hashed_password, is_active) VALUES (1, 'bench@example.com', 'x', 1)")
+    conn.executemany(
+        "INSERT INTO alerts (user_id, symbol, rule, is_active, created_at) "
+        "VALUES (1, ?, ?, 'active', '2025-01-01 00:00:00')",
+        (
+            (
+                f"SYM{rng.randrange(symbols):05d}",
+                json.dumps({
+                    "metric": "predictedDeltaPct",
+                    "op": rng.choice(ops),
+                    "value": round(rng.uniform(-15, 15), 2),
+                }),
+            )
+            for _ in range(alerts)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def _evaluate(db_path: str, batch_size: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    evaluator = AlertEvaluator(batch_size=batch_size)
+    async with session_factory() as db:
+        stats = await evaluator.evaluate(db)
+    await engine.dispose()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        _load(db_path, args.alerts, args.symbols)
+        print(f"Loaded {args.alerts} alerts over {args.symbols} symbols "
+              f"in {time.perf_counter() - start:.1f} s")
+
+        stats = asyncio.run(_evaluate(db_path, args.batch_size))
+        print(
+            f"Evaluated {stats['scanned']} alerts ({stats['metrics']} metric lookups) "
+            f"in {stats['seconds']:.2f} s  "
+            f"({stats['scanned'] / stats['seconds']:,.0f} alerts/s), "
+            f"triggered {stats['triggered']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
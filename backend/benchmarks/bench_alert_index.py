@@ -0,0 +1,108 @@
+"""
+Compare AlertThresholdIndex.matching_alerts against scanning every rule.
+
+Generates ``--alerts`` random predictedDeltaPct rules over ``--symbols``
+symbols, builds the index, then times lookups for random (symbol, value)
+pairs with the index, with a NumPy scan over all rules, and with a plain
+Python scan.
+
+Run from the backend directory:
+    python -m benchmarks.bench_alert_index --alerts 1000000 --symbols 5000
+"""
+import argparse
+import operator
+import random
+import statistics
+import time
+
+import numpy as np
+from app.services.alert_evaluator import OPERATORS
+from app.services.alert_index import AlertThresholdIndex
+
+METRIC = "predictedDeltaPct"
+PY_OPERATORS = {
+    "<=": operator.le, ">=": operator.ge, "<": operator.lt,
+    ">": operator.gt, "==": operator.eq, "!=": operator.ne,
+}
+
+
+def _time_lookups(fn, queries) -> list:
+    timings = []
+    for symbol, value in queries:
+        start = time.perf_counter()
+        fn(symbol, value)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    ops = [op for op, _ in OPERATORS]
+    rows = [
+        (
+            alert_id,
+            f"SYM{rng.randrange(args.symbols):05d}",
+            METRIC,
+            rng.choice(ops),
+            round(rng.uniform(-15, 15), 2),
+        )
+        for alert_id in range(1, args.alerts + 1)
+    ]
+    queries = [
+        (f"SYM{rng.randrange(args.symbols):05d}", round(rng.uniform(-10, 10), 2))
+        for _ in range(args.lookups)
+    ]
+
+    index = AlertThresholdIndex()
+    start = time.perf_counter()
+    index.load_rows(rows)
+    print(f"Built index over {len(index)} alerts in {time.perf_counter() - start:.2f} s")
+
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    symbols = np.array([row[1] for row in rows])
+    op_codes = np.array([ops.index(row[3]) for row in rows], dtype=np.int64)
+    thresholds = np.array([row[4] for row in rows], dtype=np.float64)
+
+    def numpy_scan(symbol, value):
+        candidates = symbols == symbol
+        hit = np.zeros(len(ids), dtype=bool)
+        for code, (_, compare) in enumerate(OPERATORS):
+            mask = candidates & (op_codes == code)
+            hit[mask] = compare(value, thresholds[mask])
+        return ids[hit]
+
+    def python_scan(symbol, value):
+        return [
+            alert_id for alert_id, rule_symbol, metric, op, threshold in rows
+            if rule_symbol == symbol and metric == METRIC
+            and PY_OPERATORS[op](value, threshold)
+        ]
+
+    # The scans must find the same alerts as the index
+    for symbol, value in queries[:5]:
+        expected = sorted(index.matching_alerts(symbol, METRIC, value))
+        assert sorted(numpy_scan(symbol, value).tolist()) == expected
+        assert sorted(python_scan(symbol, value)) == expected
+
+    lookups = (
+        ("index", lambda symbol, value: index.matching_alerts(symbol, METRIC, value), queries),
+        ("numpy scan", numpy_scan, queries),
+        ("python scan", python_scan, queries[:max(1, args.lookups // 20)]),
+    )
+    for name, fn, sample in lookups:
+        timings = _time_lookups(fn, sample)
+        print(
+            f"{name:>12}: {len(sample)} lookups  "
+            f"median {statistics.median(timings):10.4f} ms  "
+            f"p99 {np.percentile(timings, 99):10.4f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Throughput and latency of every read API route plus login.
+
+Seeds a fresh temporary SQLite database (any DATABASE_URL in the
+environment is ignored) with ``--users`` users, each with ``--watchlist``
+watchlist items and ``--alerts`` alerts, then drives the prediction,
+batch prediction, news, watchlist, alerts and login endpoints with
+``--concurrency`` concurrent clients and reports requests/s and
+p50/p95/p99 latency per endpoint:
+
+- ``inprocess``: httpx against the ASGI app on the benchmark's own event
+  loop (no sockets; client and server share the loop and the CPU)
+- ``uvicorn``: HTTP against ``uvicorn app.main:app --workers N``
+
+Results are written as JSON (git commit, arguments, dataset and per-mode,
+per-endpoint numbers); pass a previous file to ``--compare`` to print the
+change for each endpoint. The data, request order and symbols are fixed by
+``--seed``. The background alert evaluator is disabled so the dataset does
+not change during a run.
+
+Run from the backend directory:
+    python -m benchmarks.bench_api --users 100 --watchlist 20 --alerts 10 --requests 2000
+    python -m benchmarks.bench_api --mode uvicorn --workers 4 --compare old.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Always a throwaway database: seeding inserts fixed ids, which would
+# collide with (or write into) a DATABASE_URL set in the environment
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench_api.db"
+os.environ.setdefault("ALERT_EVAL_INTERVAL_SECONDS", "0")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+from app.core.security import create_access_token, get_password_hash  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.models.alert import Alert  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.watchlist import WatchlistItem  # noqa: E402
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "benchpassword"
+SYMBOLS = [
+    "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "JPM", "V", "UNH",
+    "XOM", "JNJ", "WMT", "PG", "MA", "HD", "CVX", "KO", "PEP", "COST",
+]
+METRICS = ("predictedDeltaPct", "predictedConfidence")
+OPERATORS = ("<=", ">=", "<", ">")
+
+
+def seed(users: int, watchlist: int, alerts: int, rng: random.Random) -> dict:
+    """Create the tables and insert the benchmark dataset with Core bulk inserts"""
+    init_db()
+    # Every user shares one hash; bcrypt per user would dominate seeding
+    hashed = get_password_hash(PASSWORD)
+    symbols = SYMBOLS + [f"SYM{i:03d}" for i in range(max(0, watchlist - len(SYMBOLS)))]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i + 1, "email": f"bench{i}@example.com", "hashed_password": hashed}
+            for i in range(users)
+        ])
+        conn.execute(insert(WatchlistItem), [
+            {"user_id": i + 1, "symbol": symbol}
+            for i in range(users)
+            for symbol in rng.sample(symbols, min(watchlist, len(symbols)))
+        ])
+        conn.execute(insert(Alert), [
+            {
+                "user_id": i + 1,
+                "symbol": rng.choice(SYMBOLS),
+                "rule": {
+                    "metric": rng.choice(METRICS),
+                    "op": rng.choice(OPERATORS),
+                    "value": round(rng.uniform(-5, 5), 2),
+                },
+                "is_active": "active",
+            }
+            for i in range(users)
+            for _ in range(alerts)
+        ])
+    return {"users": users, "watchlist_per_user": watchlist, "alerts_per_user": alerts}
+
+
+def scenarios(users: int, rng: random.Random):
+    """Per endpoint, a function of the request index returning (method, path, json body, headers)"""
+    tokens = [create_access_token({"sub": str(i + 1)}) for i in range(users)]
+
+    def auth(i):
+        return {"Authorization": f"Bearer {tokens[i % users]}"}
+
+    symbol = lambda i: SYMBOLS[(i * 7) % len(SYMBOLS)]  # noqa: E731
+    batches = [rng.sample(SYMBOLS, 10) for _ in range(64)]
+    return {
+        "prediction": lambda i: ("GET", f"/api/tickers/{symbol(i)}/prediction", None, None),
+        "predictions_batch": lambda i: (
+            "POST", "/api/tickers/predictions",
+            {"symbols": batches[i % len(batches)], "windows": ["1d", "1w"]}, None,
+        ),
+        "news": lambda i: ("GET", "/api/news?limit=20", None, None),
+        "symbol_news": lambda i: ("GET", f"/api/tickers/{symbol(i)}/news?limit=20", None, None),
+        "watchlist": lambda i: ("GET", "/api/watchlist", None, auth(i)),
+        "alerts": lambda i: ("GET", "/api/alerts", None, auth(i)),
+        "login": lambda i: (
+            "POST", "/auth/login",
+            {"email": f"bench{i % users}@example.com", "password": PASSWORD}, None,
+        ),
+    }
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_endpoint(client: httpx.AsyncClient, make_request, requests: int, concurrency: int) -> dict:
+    """Send requests with concurrency workers; latency in ms per request"""
+    async def send(i):
+        method, path, body, headers = make_request(i)
+        return await client.request(method, path, json=body, headers=headers)
+
+    for i in range(min(50, max(1, requests // 10))):
+        await send(i)
+
+    latencies = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index, errors
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            start = time.perf_counter()
+            response = await send(i)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "rps": round(requests / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+    }
+
+
+async def run_suite(client: httpx.AsyncClient, args, rng: random.Random) -> dict:
+    results = {}
+    for name, make_request in scenarios(args.users, rng).items():
+        if args.endpoints and name not in args.endpoints:
+            continue
+        # bcrypt makes each login roughly a thousand times slower than a read
+        requests = max(20, args.requests // 20) if name == "login" else args.requests
+        results[name] = await run_endpoint(client, make_request, requests, args.concurrency)
+        _print_row(name, results[name])
+    return results
+
+
+async def run_inprocess(args, rng: random.Random) -> dict:
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            return await run_suite(client, args, rng)
+    finally:
+        await app.router.shutdown()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_uvicorn(args, rng: random.Random) -> dict:
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers), "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            deadline = time.monotonic() + 30
+            while True:
+                try:
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if server.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("uvicorn did not start")
+                await asyncio.sleep(0.2)
+            return await run_suite(client, args, rng)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def _print_row(name: str, result: dict):
+    print(
+        f"  {name:>18}: {result['rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f} ms  "
+        f"p95 {result['p95_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  errors {result['errors']}"
+    )
+
+
+def _commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(baseline: dict, current: dict):
+    """Print the relative change of throughput and p95 for endpoints in both runs"""
+    print(f"\nchange vs {baseline['meta']['commit']} (positive rps / negative p95 is better)")
+    if baseline["dataset"] != current["dataset"]:
+        print(f"  note: datasets differ ({baseline['dataset']} vs {current['dataset']})")
+    for mode, endpoints in current["modes"].items():
+        for name, result in endpoints.items():
+            old = baseline["modes"].get(mode, {}).get(name)
+            if old is None:
+                continue
+            rps = (result["rps"] / old["rps"] - 1) * 100
+            p95 = (result["p95_ms"] / old["p95_ms"] - 1) * 100
+            print(f"  {mode:>9} {name:>18}: rps {rps:+7.1f}%  p95 {p95:+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn", "both"), default="both")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--watchlist", type=int, default=20, help="watchlist items per user")
+    parser.add_argument("--alerts", type=int, default=10, help="alerts per user")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint (login: 1/20th)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=2, help="uvicorn worker processes")
+    parser.add_argument("--endpoints", nargs="*", help="only run these endpoints")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="bench_api_results.json")
+    parser.add_argument("--compare", help="previous results file to compare against")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    dataset = seed(args.users, args.watchlist, args.alerts, rng)
+    results = {
+        "meta": {
+            "commit": _commit(),
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+        "dataset": dataset,
+        "modes": {},
+    }
+
+    modes = ("inprocess", "uvicorn") if args.mode == "both" else (args.mode,)
+    for mode in modes:
+        print(f"{mode}:")
+        runner = run_inprocess if mode == "inprocess" else run_uvicorn
+        results["modes"][mode] = asyncio.run(runner(args, random.Random(args.seed)))
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nwrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Measure per-request overhead of the CORS layer.
+
+Drives three ASGI stacks directly (no sockets, no TestClient) over the same
+routes: no CORS at all, the previous Starlette CORSMiddleware plus the
+``@app.middleware("http")`` header rewriter, and the pure ASGI
+app.core.cors.CORSMiddleware. Routes are the prediction endpoint and a
+streaming response of ``--chunks`` 1 KiB chunks.
+
+Run from the backend directory:
+    python -m benchmarks.bench_cors --requests 2000 --chunks 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware as StarletteCORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.api import tickers
+from app.core.cors import CORSMiddleware
+
+CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization, X-Requested-With, Accept, Origin",
+    "Access-Control-Max-Age": "86400",
+}
+
+
+def _base_app(chunks: int) -> FastAPI:
+    app = FastAPI()
+    app.include_router(tickers.router, prefix="/api/tickers")
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            chunk = b"x" * 1024
+            for _ in range(chunks):
+                yield chunk
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    return app
+
+
+def _legacy_app(chunks: int) -> FastAPI:
+    """The middleware stack app/main.py used before the pure ASGI layer"""
+    app = _base_app(chunks)
+    app.add_middleware(
+        StarletteCORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=False,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+
+    @app.middleware("http")
+    async def add_cors_headers(request: Request, call_next):
+        if request.method == "OPTIONS":
+            return JSONResponse(content={}, headers=CORS_HEADERS)
+        response = await call_next(request)
+        for name, value in CORS_HEADERS.items():
+            response.headers[name] = value
+        return response
+
+    return app
+
+
+def _asgi_app(chunks: int) -> FastAPI:
+    app = _base_app(chunks)
+    app.add_middleware(CORSMiddleware, allow_origins=["*"])
+    return app
+
+
+async def _request(app, path: str, query: bytes = b""):
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query,
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"origin", b"http://localhost:5173")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Later calls wait for a disconnect that never comes, like an open socket
+        await asyncio.Event().wait()
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _time(app, path: str, requests: int) -> float:
+    for _ in range(50):
+        await _request(app, path)
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _request(app, path)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+async def _run(requests: int, chunks: int):
+    stacks = (
+        ("no cors", _base_app(chunks)),
+        ("legacy", _legacy_app(chunks)),
+        ("pure asgi", _asgi_app(chunks)),
+    )
+    for path, count in (("/api/tickers/AAPL/prediction", requests), ("/stream", max(1, requests // 20))):
+        print(f"\n{path}")
+        baseline = None
+        for name, app in stacks:
+            median = await _time(app, path, count)
+            baseline = baseline if baseline is not None else median
+            print(f"{name:>10}: median {median:9.1f} us  overhead {median - baseline:+9.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--chunks", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.requests, args.chunks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Per-symbol versus batched SVR/RF ensemble inference.
+
+Scores ``--symbols`` symbols with the bundled artifact one predict call per
+symbol and then in a single call, splitting the batched time into feature
+construction (synthetic history plus feature matrix) and the model itself.
+The prediction cache is bypassed throughout.
+
+Run from the backend directory:
+    python -m benchmarks.bench_ensemble_inference --symbols 500
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+
+from app.services.ensemble import load_predictor
+
+
+def _median_ms(fn, rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    load_predictor.cache_clear()
+    predictor = load_predictor()
+    print(f"load artifact: {(time.perf_counter() - start) * 1000:.1f} ms (version {predictor.version})")
+
+    symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+    as_of = date.today()
+    for window in predictor.windows:
+        model = predictor.bundle.models[window]
+        per_symbol = _median_ms(
+            lambda: [predictor.predict([symbol], window, as_of) for symbol in symbols], args.rounds
+        )
+        batched = _median_ms(lambda: predictor.predict(symbols, window, as_of), args.rounds)
+        features = _median_ms(lambda: predictor.features(symbols, as_of), args.rounds)
+        X = predictor.features(symbols, as_of)
+        scoring = _median_ms(lambda: model.predict(X), args.rounds)
+        print(
+            f"{window}: per-symbol {per_symbol:8.2f} ms ({per_symbol / args.symbols * 1000:6.1f} us/symbol)  "
+            f"batched {batched:7.2f} ms ({batched / args.symbols * 1000:5.1f} us/symbol, "
+            f"features {features:6.2f} ms, model {scoring:6.2f} ms)  {per_symbol / batched:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
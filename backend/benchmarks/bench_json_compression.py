@@ -0,0 +1,95 @@
+"""
+Compare JSON rendering paths and compressed payload sizes.
+
+For news and alert list payloads of 100 and ``--items`` entries, times
+FastAPI's default path (jsonable_encoder + JSONResponse) against
+app.core.responses.FastJSONResponse, then reports the raw, gzip and (if the
+optional ``brotli`` package is installed) brotli sizes that
+CompressionMiddleware would send.
+
+Run from the backend directory:
+    python -m benchmarks.bench_json_compression --items 10000
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.core.compression import CompressionMiddleware, brotli
+from app.core.responses import FastJSONResponse
+from app.schemas.alert import Alert, AlertResponse, AlertRule
+from app.schemas.news import NewsItem, NewsResponse
+
+START = datetime(2024, 1, 1)
+
+
+def _news(count: int) -> NewsResponse:
+    items = [
+        NewsItem(
+            id=f"news-{i}",
+            headline=f"Company {i % 500} beats estimates as quarterly revenue grows",
+            publishedAt=START - timedelta(minutes=i),
+            url=f"https://news.example.com/articles/{i}",
+            sentiment=("Positive", "Negative", "Neutral")[i % 3],
+            sentimentScore=round((i % 200) / 100 - 1, 3),
+        )
+        for i in range(count)
+    ]
+    return NewsResponse(symbol="AAPL", items=items, nextCursor="cursor")
+
+
+def _alerts(count: int) -> AlertResponse:
+    items = [
+        Alert(
+            id=i,
+            symbol=f"SYM{i % 500}",
+            rule=AlertRule(metric="predictedDeltaPct", op=">=", value=(i % 100) / 10),
+            is_active="active",
+            created_at=START + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+    return AlertResponse(items=items)
+
+
+def _time(render, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _report(name: str, payload, repeat: int):
+    default_ms = _time(lambda: JSONResponse(jsonable_encoder(payload)), repeat)
+    fast_ms = _time(lambda: FastJSONResponse(payload), repeat)
+    body = FastJSONResponse(payload).body
+
+    middleware = CompressionMiddleware(app=None)
+    sizes = f"raw {len(body):>9,} B  gzip {len(middleware._compress(b'gzip', body)):>8,} B"
+    if brotli is not None:
+        sizes += f"  br {len(middleware._compress(b'br', body)):>8,} B"
+    print(
+        f"{name:>12}: default {default_ms:8.2f} ms  fast {fast_ms:8.2f} ms "
+        f"({default_ms / fast_ms:4.1f}x)  {sizes}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("brotli not installed; reporting gzip only")
+    for count in (100, args.items):
+        _report(f"news {count}", _news(count), args.repeat)
+        _report(f"alerts {count}", _alerts(count), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
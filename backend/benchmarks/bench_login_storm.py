@@ -0,0 +1,104 @@
+"""
+Measure /health latency while a storm of logins runs on the same worker.
+
+Logins are driven in-process through the ASGI app, so the probe and the
+logins share one event loop exactly like a single uvicorn worker. The run
+is repeated with bcrypt inline on the loop and in the password hash pool.
+It always uses a fresh temporary SQLite database; any DATABASE_URL in the
+environment is ignored.
+
+Run from the backend directory:
+    python -m benchmarks.bench_login_storm --logins 100 --concurrency 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+# Always a throwaway database: the storm creates its own benchmark users,
+# which must not land in a DATABASE_URL set in the environment
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/bench.db"
+
+import httpx  # noqa: E402
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.executor import BoundedExecutor  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+N_USERS = 10
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def _probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.005)
+
+
+async def _storm(client: httpx.AsyncClient, logins: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login(i: int):
+        async with semaphore:
+            response = await client.post("/auth/login", json={
+                "email": f"storm{i % N_USERS}@example.com",
+                "password": "stormpassword",
+            })
+            return response.status_code
+
+    return await asyncio.gather(*(login(i) for i in range(logins)))
+
+
+async def _run(mode: str, pool: BoundedExecutor, logins: int, concurrency: int):
+    security.password_hash_pool = pool
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        latencies = []
+        stop = asyncio.Event()
+        probe = asyncio.create_task(_probe_health(client, stop, latencies))
+        start = time.perf_counter()
+        statuses = await _storm(client, logins, concurrency)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    print(
+        f"{mode:>7}: {logins} logins in {elapsed:6.2f}s  "
+        f"statuses {sorted(set(statuses))}  "
+        f"/health n={len(latencies)} "
+        f"p50 {statistics.median(latencies):7.2f} ms  "
+        f"p99 {_percentile(latencies, 99):7.2f} ms  "
+        f"max {max(latencies):7.2f} ms"
+    )
+    if pool.max_workers:
+        print(f"{'':>9}pool stats: {pool.stats()}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    # Create the users up front so the storm exercises password verification
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        await _storm(client, N_USERS, N_USERS)
+
+    await _run("inline", BoundedExecutor(0, 0), args.logins, args.concurrency)
+    await _run("pool", BoundedExecutor(
+        settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_QUEUE, name="password-hash"
+    ), args.logins, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Measure the cost of request, database and service instrumentation.
+
+Times the prediction route through the ASGI app with and without
+app.core.metrics.MetricsMiddleware, the timed() decorator against the bare
+service call, and a raw Histogram.observe, then renders /metrics once with
+every series populated.
+
+Run from the backend directory:
+    python -m benchmarks.bench_metrics --requests 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from app.api import tickers
+from app.core import metrics
+from benchmarks.bench_cors import _request
+
+
+def _app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    app.include_router(tickers.router, prefix="/api/tickers")
+    if instrumented:
+        app.add_middleware(metrics.MetricsMiddleware)
+    return app
+
+
+async def _median_request_us(app, requests: int) -> float:
+    for _ in range(50):
+        await _request(app, "/api/tickers/AAPL/prediction")
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await _request(app, "/api/tickers/AAPL/prediction")
+        timings.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(timings)
+
+
+def _per_call_ns(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    bare = asyncio.run(_median_request_us(_app(False), args.requests))
+    instrumented = asyncio.run(_median_request_us(_app(True), args.requests))
+    print(f"request      bare {bare:8.1f} us  instrumented {instrumented:8.1f} us  "
+          f"overhead {instrumented - bare:+6.1f} us")
+
+    service = tickers.prediction_service
+    raw = service.get_prediction.__wrapped__
+    untimed = _per_call_ns(lambda: raw(service, "AAPL"), args.calls // 10)
+    timed = _per_call_ns(lambda: service.get_prediction("AAPL"), args.calls // 10)
+    print(f"service      bare {untimed:8.0f} ns  timed        {timed:8.0f} ns  "
+          f"overhead {timed - untimed:+6.0f} ns")
+
+    histogram = metrics.registry.histogram("bench_observe_seconds", "Benchmark", ("route",))
+    observe = _per_call_ns(lambda: histogram.observe(0.003, "/bench"), args.calls)
+    print(f"observe      {observe:8.0f} ns per call")
+
+    start = time.perf_counter()
+    text = metrics.registry.render()
+    print(f"render       {(time.perf_counter() - start) * 1000:8.2f} ms for {len(text.splitlines())} lines")
+
+
+if __name__ == "__main__":
+    main()
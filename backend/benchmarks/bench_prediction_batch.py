@@ -0,0 +1,58 @@
+"""
+Compare per-symbol prediction requests against the batch endpoint.
+
+Run from the backend directory:
+    python -m benchmarks.bench_prediction_batch --symbols 50 --rounds 20
+"""
+import argparse
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def _time_rounds(fn, rounds: int) -> list:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+
+    def per_symbol():
+        for symbol in symbols:
+            response = client.get(f"/api/tickers/{symbol}/prediction?window=1d")
+            response.raise_for_status()
+
+    def batch():
+        response = client.post(
+            "/api/tickers/predictions", json={"symbols": symbols, "windows": ["1d"]}
+        )
+        response.raise_for_status()
+
+    # Warm up routing and validation caches
+    per_symbol()
+    batch()
+
+    for name, fn in (("per-symbol", per_symbol), ("batch", batch)):
+        timings = _time_rounds(fn, args.rounds)
+        print(
+            f"{name:>10}: {args.symbols} symbols  "
+            f"median {statistics.median(timings):8.2f} ms  "
+            f"min {min(timings):8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
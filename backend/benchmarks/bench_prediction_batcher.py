@@ -0,0 +1,107 @@
+"""
+Concurrent single-symbol prediction misses with and without micro-batching.
+
+Fires ``--requests`` prediction lookups for distinct symbols (every one a
+cache miss) from ``--concurrency`` concurrent clients, the way the
+``GET /api/tickers/{symbol}/prediction`` handler serves them, and reports
+throughput, latency percentiles and the batch sizes the MicroBatcher formed:
+
+- unbatched: each request calls PredictionService.get_prediction
+- batched: misses go through a MicroBatcher running inline on the loop
+- batched+executor: the same, scored in a one-thread BoundedExecutor
+
+Run from the backend directory:
+    python -m benchmarks.bench_prediction_batcher --requests 4000 --concurrency 256
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from app.core.batching import MicroBatcher
+from app.core.executor import BoundedExecutor
+from app.services.prediction_service import PredictionService
+
+
+def _percentiles(latencies):
+    p50, p95, p99 = np.percentile(np.asarray(latencies) * 1000, [50, 95, 99])
+    return p50, p95, p99
+
+
+async def _run(lookup, requests: int, concurrency: int):
+    symbols = iter([f"SYM{i:05d}" for i in range(requests)])
+    latencies = []
+
+    async def client():
+        for symbol in symbols:
+            start = time.perf_counter()
+            await lookup(symbol)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def _report(label: str, elapsed: float, latencies, sizes=None):
+    p50, p95, p99 = _percentiles(latencies)
+    line = f"{label:<18} {len(latencies) / elapsed:9.0f} req/s  p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  p99 {p99:7.2f} ms"
+    if sizes:
+        line += f"  mean batch {np.mean(sizes):5.1f}"
+    print(line)
+    return len(latencies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    window = "1d"
+    now = datetime.now()
+
+    service = PredictionService(cache_size=args.requests * 2)
+
+    async def unbatched(symbol):
+        return service.get_prediction(symbol, window, now)
+
+    service.get_prediction("WARMUP", window, now)
+    elapsed, latencies = asyncio.run(_run(unbatched, args.requests, args.concurrency))
+    baseline = _report("unbatched", elapsed, latencies)
+
+    for label, workers in (("batched", 0), ("batched+executor", 1)):
+        service = PredictionService(cache_size=args.requests * 2)
+        sizes = []
+
+        def process(items):
+            sizes.append(len(items))
+            return service.predict_many(items)
+
+        batcher = MicroBatcher(
+            process,
+            max_batch_size=args.max_batch_size,
+            max_wait=args.max_wait_ms / 1000,
+            max_queue=args.requests,
+            executor=BoundedExecutor(workers, max_queue=0),
+            name=label,
+        )
+
+        async def batched(symbol):
+            prediction = service.cached(symbol, window, now)
+            if prediction is None:
+                prediction = await batcher.submit((symbol, window, now))
+            return prediction
+
+        elapsed, latencies = asyncio.run(_run(batched, args.requests, args.concurrency))
+        throughput = _report(label, elapsed, latencies, sizes)
+        histogram = sorted(Counter(sizes).items())
+        print(f"{'':<18} {throughput / baseline:.1f}x unbatched; batch sizes {histogram[:8]}{' ...' if len(histogram) > 8 else ''}")
+
+
+if __name__ == "__main__":
+    main()
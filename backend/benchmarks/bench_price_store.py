@@ -0,0 +1,134 @@
+"""
+Read 5-year daily windows for thousands of symbols from the price store.
+
+Writes ``--years`` of daily OHLCV bars for ``--symbols`` symbols into a
+temporary PriceStore, then times:
+
+- the zero-copy close/timestamp windows for every symbol, opened from
+  scratch and again with the maps cached, each followed by a sum over the
+  data so every page is actually read
+- the (symbols, days) close matrix used for feature generation
+- the same window for ``--sqlite-symbols`` symbols from an indexed SQLite
+  table of rows, extrapolated to ``--symbols``
+- importing a CSV of ``--csv-symbols`` symbols with app.services.price_import
+
+Run from the backend directory:
+    python -m benchmarks.bench_price_store --symbols 5000 --years 5
+"""
+import argparse
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from app.services.market_data import SyntheticMarketData
+from app.services.price_import import import_csv
+from app.services.price_store import PriceStore, to_timestamp
+
+
+def _bars(market_data: SyntheticMarketData, symbols, end: date, days: int):
+    closes = market_data.closes(symbols, end, days)
+    timestamps = to_timestamp(end) - np.arange(days - 1, -1, -1, dtype=np.int64) * 86400
+    for i, symbol in enumerate(symbols):
+        close = closes[i]
+        yield symbol, {
+            "timestamp": timestamps,
+            "open": close * 0.999,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.full(days, 1e6),
+        }
+
+
+def _timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<44} {elapsed * 1000:10.1f} ms")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--sqlite-symbols", type=int, default=200)
+    parser.add_argument("--csv-symbols", type=int, default=100)
+    args = parser.parse_args()
+
+    days = args.years * 252
+    end = date(2024, 6, 28)
+    start = end - timedelta(days=days - 1)
+    symbols = [f"SYM{i:05d}" for i in range(args.symbols)]
+    market_data = SyntheticMarketData()
+    root = tempfile.mkdtemp()
+    try:
+        store = PriceStore(os.path.join(root, "prices"), max_open=4 * args.symbols)
+
+        def write():
+            for chunk in range(0, len(symbols), 500):
+                for symbol, bars in _bars(market_data, symbols[chunk:chunk + 500], end, days):
+                    store.append(symbol, bars)
+        _timed(f"append {args.symbols} x {days} bars", write)
+
+        def read_windows():
+            total = 0.0
+            for symbol in symbols:
+                window = store.window(symbol, start, end, ("timestamp", "close"))
+                total += window["close"].sum()
+            return total
+
+        store.refresh()
+        _timed(f"windows, maps opened ({args.symbols} symbols)", read_windows)
+        _, warm = _timed(f"windows, maps cached ({args.symbols} symbols)", read_windows)
+        matrix, _ = _timed(f"close matrix {args.symbols} x {days}", lambda: store.matrix(symbols, days, end))
+        assert not np.isnan(matrix).any()
+
+        conn = sqlite3.connect(os.path.join(root, "prices.db"))
+        conn.execute("CREATE TABLE bars (symbol TEXT, ts INTEGER, open REAL, high REAL, low REAL, close REAL, volume REAL)")
+        conn.execute("CREATE INDEX ix_bars_symbol_ts ON bars (symbol, ts)")
+        sqlite_symbols = symbols[:args.sqlite_symbols]
+        with conn:
+            for symbol, bars in _bars(market_data, sqlite_symbols, end, days):
+                conn.executemany(
+                    "INSERT INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    zip([symbol] * days, *(bars[name].tolist() for name in ("timestamp", "open", "high", "low", "close", "volume"))),
+                )
+
+        def read_sqlite():
+            lo, hi = to_timestamp(start), to_timestamp(end)
+            for symbol in sqlite_symbols:
+                rows = conn.execute(
+                    "SELECT ts, close FROM bars WHERE symbol = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                    (symbol, lo, hi),
+                ).fetchall()
+                np.asarray(rows, dtype=np.float64)[:, 1].sum()
+
+        read_sqlite()
+        _, sqlite_elapsed = _timed(f"sqlite windows ({args.sqlite_symbols} symbols)", read_sqlite)
+        extrapolated = sqlite_elapsed * args.symbols / args.sqlite_symbols
+        print(f"{'sqlite windows, extrapolated to ' + str(args.symbols):<44} {extrapolated * 1000:10.1f} ms"
+              f"  ({extrapolated / warm:.0f}x the cached store)")
+        conn.close()
+
+        csv_path = os.path.join(root, "history.csv")
+        with open(csv_path, "w") as f:
+            f.write("date,symbol,open,high,low,close,volume\n")
+            for symbol, bars in _bars(market_data, [f"CSV{i:04d}" for i in range(args.csv_symbols)], end, days):
+                dates = bars["timestamp"].astype("datetime64[s]").astype("datetime64[D]").astype(str)
+                for row in zip(dates, *(bars[name] for name in ("open", "high", "low", "close", "volume"))):
+                    f.write(f"{row[0]},{symbol},{row[1]:.4f},{row[2]:.4f},{row[3]:.4f},{row[4]:.4f},{row[5]:.0f}\n")
+        written, elapsed = _timed(
+            f"import csv ({args.csv_symbols} symbols)", lambda: import_csv(store, csv_path)
+        )
+        print(f"{'':<44} {sum(written.values()) / elapsed:10.0f} bars/s")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
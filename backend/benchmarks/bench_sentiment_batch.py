@@ -0,0 +1,52 @@
+"""
+Compare per-headline sentiment scoring with the vectorized batch engine.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sentiment_batch --headlines 100000
+"""
+import argparse
+import time
+
+from app.services.news_service import NewsService
+from app.services.sentiment_service import SentimentService
+
+
+def _make_headlines(count: int) -> list:
+    pool = NewsService().news_pool
+    # Suffix keeps headlines distinct so every score gets its own seed
+    return [f"{pool[i % len(pool)]} #{i}" for i in range(count)]
+
+
+def _throughput(fn, headlines: list, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn(headlines)
+        best = min(best, time.perf_counter() - start)
+    return len(headlines) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--headlines", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    service = SentimentService()
+    headlines = _make_headlines(args.headlines)
+
+    def per_headline(items):
+        return [service.analyze_sentiment(headline) for headline in items]
+
+    candidates = (
+        ("per-headline", per_headline),
+        ("analyze_batch", service.analyze_batch),
+        ("analyze_columns", service.analyze_columns),
+    )
+    for name, fn in candidates:
+        rate = _throughput(fn, headlines, args.rounds)
+        print(f"{name:>16}: {rate:12,.0f} headlines/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Work per request for a burst of identical lookups, with and without
+single-flight coalescing.
+
+For each concurrency level, fires that many simultaneous requests for one
+uncached key and counts the work actually done:
+
+- prediction (threads): PredictionService.get_prediction from a thread pool,
+  counting symbols scored by the model
+- prediction (async): the ``GET /api/tickers/{symbol}/prediction`` miss
+  path, a MicroBatcher with and without the handler's SingleFlight, counting
+  batch slots used and symbols scored
+
+Every round uses a fresh symbol so the first request is always a miss.
+
+Run from the backend directory:
+    python -m benchmarks.bench_singleflight --concurrency 1 8 64 256
+"""
+import argparse
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import count
+
+from app.core.batching import MicroBatcher
+from app.core.singleflight import SingleFlight
+from app.services.ensemble import load_predictor
+from app.services.prediction_service import PredictionService
+
+_symbols = (f"HOT{i:05d}" for i in count())
+
+
+class CountingPredictor:
+    """Ensemble predictor wrapper counting the symbols it scores"""
+
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.version = predictor.version
+        self.scored = 0
+
+    def predict(self, symbols, window, as_of):
+        self.scored += len(symbols)
+        return self.predictor.predict(symbols, window, as_of)
+
+
+def _burst(concurrency: int, fn):
+    """Call fn from concurrency threads released at the same moment"""
+    barrier = threading.Barrier(concurrency)
+
+    def worker(_):
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+
+
+def prediction_threads(concurrency: int, single_flight: bool):
+    predictor = CountingPredictor(load_predictor())
+    service = PredictionService(cache_size=1024, predictor=predictor, single_flight=single_flight)
+    symbol, now = next(_symbols), datetime.now()
+    _burst(concurrency, lambda: service.get_prediction(symbol, "1d", now))
+    return predictor.scored / concurrency
+
+
+def prediction_async(concurrency: int, single_flight: bool):
+    predictor = CountingPredictor(load_predictor())
+    service = PredictionService(cache_size=1024, predictor=predictor, single_flight=False)
+    items = []
+
+    def process(batch):
+        items.extend(batch)
+        return service.predict_many(batch)
+
+    batcher = MicroBatcher(process, max_batch_size=64, max_wait=0.002, max_queue=100000, name="bench")
+    flight = SingleFlight("bench")
+    symbol, now = next(_symbols), datetime.now()
+    key = service.version(symbol, "1d", now)
+
+    async def lookup():
+        prediction = service.cached(symbol, "1d", now)
+        if prediction is None:
+            if single_flight:
+                prediction = await flight.do(key, batcher.submit, (symbol, "1d", now))
+            else:
+                prediction = await batcher.submit((symbol, "1d", now))
+        return prediction
+
+    async def main():
+        await asyncio.gather(*(lookup() for _ in range(concurrency)))
+
+    asyncio.run(main())
+    return len(items) / concurrency, predictor.scored / concurrency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64, 256])
+    args = parser.parse_args()
+
+    load_predictor()
+    columns = ("threads: scored", "async: batch slots", "async: scored")
+    print("work per request, single-flight off -> on")
+    print(f"{'concurrency':>11}" + "".join(f"{name:>22}" for name in columns))
+    for concurrency in args.concurrency:
+        off = [prediction_threads(concurrency, False), *prediction_async(concurrency, False)]
+        on = [prediction_threads(concurrency, True), *prediction_async(concurrency, True)]
+        print(f"{concurrency:>11}" + "".join(f"{a:>12.3f} -> {b:<6.3f}" for a, b in zip(off, on)))
+
+
+if __name__ == "__main__":
+    main()
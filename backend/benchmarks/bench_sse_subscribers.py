@@ -0,0 +1,66 @@
+"""
+Measure the cost of idle event-stream subscribers and of fanning out to them.
+
+Opens ``--subscribers`` SSE streams in-process (the same generator the
+/api/events endpoint serves, without sockets), reports memory per idle
+subscriber, then times publishing to one topic they all share until every
+stream has yielded the event.
+
+Run from the backend directory:
+    python -m benchmarks.bench_sse_subscribers --subscribers 10000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import tracemalloc
+
+from app.api import events
+
+
+async def _consume(stream, received: asyncio.Queue):
+    async for frame in stream:
+        if frame.startswith("event:"):
+            received.put_nowait(time.perf_counter())
+
+
+async def _run(subscribers: int, rounds: int):
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    received = asyncio.Queue()
+    tasks = [
+        asyncio.create_task(_consume(events._event_stream([f"user:{i}", "broadcast"]), received))
+        for i in range(subscribers)
+    ]
+    await asyncio.sleep(0.1)
+    idle = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    print(f"{subscribers} idle subscribers: {idle / subscribers / 1024:.2f} KiB each "
+          f"({idle / 2**20:.1f} MiB total)")
+
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        await events.pubsub.publish("broadcast", "ping", {"round": i})
+        for _ in range(subscribers):
+            await received.get()
+        timings.append((time.perf_counter() - start) * 1000)
+    print(f"fan-out to {subscribers}: median {statistics.median(timings):.1f} ms  "
+          f"min {min(timings):.1f} ms  ({subscribers / (min(timings) / 1000):,.0f} deliveries/s)")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    assert not events.pubsub.topics()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_run(args.subscribers, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
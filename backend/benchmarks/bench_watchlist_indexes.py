@@ -0,0 +1,118 @@
+"""
+Show query plans and latencies for the hot watchlist/alert queries before and
+after the composite index migration.
+
+Builds a throwaway SQLite database at the baseline schema (revision 0001),
+loads ``--rows`` watchlist items and alerts, measures, upgrades to head and
+measures again.
+
+Run from the backend directory:
+    python -m benchmarks.bench_watchlist_indexes --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from alembic import command
+from alembic.config import Config
+
+SYMBOLS_PER_USER = 100
+
+QUERIES = {
+    "watchlist by user": (
+        "SELECT symbol FROM watchlist_items WHERE user_id = ?", 1
+    ),
+    "watchlist by user+symbol": (
+        "SELECT id FROM watchlist_items WHERE user_id = ? AND symbol = ?", 2
+    ),
+    "alerts by user": (
+        "SELECT * FROM alerts WHERE user_id = ?", 1
+    ),
+    "alerts by user+symbol": (
+        "SELECT * FROM alerts WHERE user_id = ? AND symbol = ?", 2
+    ),
+}
+
+
+def _alembic_config(db_path: str) -> Config:
+    config = Config("alembic.ini")
+    config.set_main_option("sqlalchemy.url", f"sqlite:///{db_path}")
+    return config
+
+
+def _load(conn: sqlite3.Connection, rows: int):
+    users = max(1, rows // SYMBOLS_PER_USER)
+    rule = json.dumps({"type": "price_above", "value": 100.0})
+    conn.executemany(
+        "INSERT INTO users (id, email, hashed_password, is_active) VALUES (?, ?, 'x', 1)",
+        ((user_id, f"user{user_id}@example.com") for user_id in range(1, users + 1)),
+    )
+    conn.executemany(
+        "INSERT INTO watchlist_items (user_id, symbol, added_at) "
+        "VALUES (?, ?, '2025-01-01 00:00:00')",
+        ((i % users + 1, f"SYM{i // users:04d}") for i in range(rows)),
+    )
+    conn.executemany(
+        "INSERT INTO alerts (user_id, symbol, rule, is_active, created_at) "
+        "VALUES (?, ?, ?, 'active', '2025-01-01 00:00:00')",
+        ((i % users + 1, f"SYM{i // users:04d}", rule) for i in range(rows)),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    return users
+
+
+def _measure(conn: sqlite3.Connection, users: int, samples: int, label: str):
+    print(f"\n== {label} ==")
+    rng = random.Random(0)
+    for name, (sql, arity) in QUERIES.items():
+        params = [
+            (rng.randint(1, users), f"SYM{rng.randrange(SYMBOLS_PER_USER):04d}")[:arity]
+            for _ in range(samples)
+        ]
+        plan = "; ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params[0]))
+        timings = []
+        for args in params:
+            start = time.perf_counter()
+            conn.execute(sql, args).fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{name:>26}: median {statistics.median(timings):9.3f} ms  "
+              f"max {max(timings):9.3f} ms  plan: {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--samples", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        config = _alembic_config(db_path)
+        command.upgrade(config, "0001")
+
+        conn = sqlite3.connect(db_path)
+        start = time.perf_counter()
+        users = _load(conn, args.rows)
+        print(f"Loaded {args.rows} watchlist items and {args.rows} alerts "
+              f"for {users} users in {time.perf_counter() - start:.1f} s")
+        _measure(conn, users, args.samples, "before (revision 0001)")
+        conn.close()
+
+        start = time.perf_counter()
+        command.upgrade(config, "head")
+        print(f"\nMigrated to head in {time.perf_counter() - start:.1f} s")
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("ANALYZE")
+        _measure(conn, users, args.samples, "after (head)")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
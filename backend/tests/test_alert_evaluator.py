@@ -0,0 +1,118 @@
+import asyncio
+from sqlalchemy import Update, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.session import Base
+from app.models.user import User
+from app.models.alert import Alert
+from app.models import watchlist  # noqa: F401 - Imported to register models with SQLAlchemy
+from app.services.alert_evaluator import AlertEvaluator
+from app.services.prediction_service import PredictionService
+
+def _run_cycle(alerts, batch_size=2):
+    """Evaluate alerts in a fresh in-memory database and return their states by symbol"""
+    evaluator = AlertEvaluator(batch_size=batch_size)
+    
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add(User(id=1, email="alerts@example.com", hashed_password="x"))
+            db.add_all(Alert(user_id=1, **alert) for alert in alerts)
+            await db.commit()
+            stats = await evaluator.evaluate(db)
+            rows = (await db.execute(select(Alert).order_by(Alert.id))).scalars().all()
+        await engine.dispose()
+        return stats, [(row.is_active, row.triggered_at is not None) for row in rows]
+    
+    return evaluator, asyncio.run(main())
+
+def test_evaluator_triggers_matching_rules():
+    """Test rules are compared against the current prediction for their symbol"""
+    delta = PredictionService().get_prediction("AAPL", "1d")["prediction"]["deltaPct"]
+    alerts = [
+        {"symbol": "AAPL", "rule": {"metric": "predictedDeltaPct", "op": ">=", "value": delta}},
+        {"symbol": "AAPL", "rule": {"metric": "predictedDeltaPct", "op": ">", "value": delta}},
+        {"symbol": "AAPL", "rule": {"metric": "predictedDeltaPct", "op": "<", "value": delta + 1}},
+        {"symbol": "AAPL", "rule": {"metric": "predictedDeltaPct", "op": "==", "value": delta}},
+        {"symbol": "AAPL", "rule": {"metric": "price", "op": "!=", "value": 1}},
+        {"symbol": "AAPL", "rule": {"metric": "predictedDeltaPct", "op": "<=", "value": delta},
+         "is_active": "disabled"},
+        {"symbol": "MSFT", "rule": {"metric": "predictedConfidence", "op": "<=", "value": 1}},
+    ]
+    _, (stats, states) = _run_cycle(alerts)
+    
+    assert states == [
+        ("triggered", True),
+        ("active", False),
+        ("triggered", True),
+        ("triggered", True),
+        ("active", False),  # unknown metric
+        ("disabled", False),
+        ("triggered", True),
+    ]
+    assert stats["scanned"] == 6
+    assert stats["triggered"] == 4
+
+def test_evaluator_computes_each_metric_once():
+    """Test each (symbol, metric) pair is evaluated once per cycle across chunks"""
+    alerts = [
+        {"symbol": symbol, "rule": {"metric": "predictedDeltaPct", "op": ">", "value": 100}}
+        for symbol in ["AAPL", "MSFT"] * 5
+    ]
+    evaluator, (stats, states) = _run_cycle(alerts, batch_size=3)
+    
+    assert stats["metrics"] == 2
+    assert evaluator.prediction_service.cache_stats()["misses"] == 2
+    assert all(state == ("active", False) for state in states)
+
+def test_evaluator_notifies_only_alerts_it_moved():
+    """Test an alert triggered elsewhere after the scan is neither notified nor dropped again"""
+    class Recorder:
+        def __init__(self):
+            self.published = []
+        
+        async def publish(self, topic, event_type, data):
+            self.published.append((topic, [item["id"] for item in data["items"]]))
+    
+    class Index:
+        def __init__(self):
+            self.removed = []
+        
+        def remove_many(self, alert_ids):
+            self.removed.extend(alert_ids)
+    
+    pubsub, index = Recorder(), Index()
+    evaluator = AlertEvaluator(batch_size=10, index=index, pubsub=pubsub)
+    rule = {"metric": "predictedConfidence", "op": "<=", "value": 1}
+    
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            db.add(User(id=1, email="alerts@example.com", hashed_password="x"))
+            db.add_all([
+                Alert(id=1, user_id=1, symbol="AAPL", rule=rule),
+                Alert(id=2, user_id=1, symbol="MSFT", rule=rule),
+            ])
+            await db.commit()
+            
+            # Another worker's cycle triggers alert 1 between this scan and its UPDATE
+            execute = db.execute
+            
+            async def racing_execute(statement, *args, **kwargs):
+                if isinstance(statement, Update):
+                    await execute(update(Alert.__table__).where(Alert.id == 1).values(is_active="triggered"))
+                return await execute(statement, *args, **kwargs)
+            
+            db.execute = racing_execute
+            stats = await evaluator.evaluate(db)
+        await engine.dispose()
+        return stats
+    
+    stats = asyncio.run(main())
+    assert stats["triggered"] == 1
+    assert index.removed == [2]
+    assert pubsub.published == [("user:1", [2])]
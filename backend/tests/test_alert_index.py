@@ -0,0 +1,55 @@
+import operator
+import random
+from app.services.alert_index import AlertThresholdIndex
+
+OPS = {
+    "<=": operator.le, ">=": operator.ge, "<": operator.lt,
+    ">": operator.gt, "==": operator.eq, "!=": operator.ne,
+}
+
+def _brute_force(rules, symbol, metric, value):
+    return sorted(
+        alert_id for alert_id, (rule_symbol, rule) in rules.items()
+        if rule_symbol == symbol and rule["metric"] == metric
+        and OPS[rule["op"]](value, rule["value"])
+    )
+
+def test_matching_alerts_agrees_with_full_scan():
+    """Test bisect lookups match a brute-force check of every rule"""
+    rng = random.Random(0)
+    rules = {
+        alert_id: (rng.choice(["AAPL", "MSFT"]), {
+            "metric": rng.choice(["predictedDeltaPct", "predictedConfidence"]),
+            "op": rng.choice(list(OPS)),
+            "value": float(rng.randint(-5, 5)),
+        })
+        for alert_id in range(1, 2001)
+    }
+    index = AlertThresholdIndex()
+    index.load_rows(
+        (alert_id, symbol, rule["metric"], rule["op"], rule["value"])
+        for alert_id, (symbol, rule) in list(rules.items())[:1000]
+    )
+    for alert_id, (symbol, rule) in list(rules.items())[1000:]:
+        index.add(alert_id, symbol, rule)
+    for alert_id in range(1, 2001, 3):
+        assert index.remove(alert_id)
+        del rules[alert_id]
+    
+    assert len(index) == len(rules)
+    for symbol in ("AAPL", "MSFT", "TSLA"):
+        for value in (-6.0, -5.0, -0.5, 0.0, 3.0, 5.0, 7.5):
+            matches = index.matching_alerts(symbol, "predictedDeltaPct", value)
+            assert sorted(matches) == _brute_force(rules, symbol, "predictedDeltaPct", value)
+
+def test_add_replaces_existing_alert():
+    """Test re-adding an alert id moves it instead of duplicating it"""
+    index = AlertThresholdIndex()
+    index.add(1, "AAPL", {"metric": "predictedDeltaPct", "op": ">=", "value": 1})
+    index.add(1, "AAPL", {"metric": "predictedDeltaPct", "op": "<=", "value": 1})
+    
+    assert index.matching_alerts("AAPL", "predictedDeltaPct", 0) == [1]
+    assert index.matching_alerts("AAPL", "predictedDeltaPct", 2) == []
+    assert index.remove(1)
+    assert not index.remove(1)
+    assert index.keys() == []
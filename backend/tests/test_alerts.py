@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.alerts import alert_index
+
+client = TestClient(app)
+
+def test_alert_handlers_update_threshold_index(setup_database):
+    """Test creating and deleting alerts keeps the threshold index current"""
+    login_response = client.post("/auth/login", json={
+        "email": "alerts@example.com",
+        "password": "testpassword"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    response = client.post("/api/alerts", json={
+        "symbol": "aapl",
+        "rule": {"metric": "predictedDeltaPct", "op": "<=", "value": -5}
+    }, headers=headers)
+    alert_id = response.json()["id"]
+    assert alert_index.matching_alerts("AAPL", "predictedDeltaPct", -6) == [alert_id]
+    assert alert_index.matching_alerts("AAPL", "predictedDeltaPct", -4) == []
+    
+    assert client.delete(f"/api/alerts/{alert_id}", headers=headers).status_code == 204
+    assert alert_index.matching_alerts("AAPL", "predictedDeltaPct", -6) == []
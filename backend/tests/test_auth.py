@@ -1,33 +1,12 @@
-import pytest
+import asyncio
+import httpx
 from fastapi.testclient import TestClient
 from app.main import app
-from app.db.session import get_db
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from app.db.session import Base
-
-# Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-app.dependency_overrides[get_db] = override_get_db
+from app.core.deps import invalidate_user
+from app.models.user import User
 
 client = TestClient(app)
 
-@pytest.fixture(scope="module")
-def setup_database():
-    Base.metadata.create_all(bind=engine)
-    yield
-    Base.metadata.drop_all(bind=engine)
-
 def test_login_success(setup_database):
     """Test successful login"""
     response = client.post("/auth/login", json={
@@ -71,3 +50,49 @@ def test_get_me_authorized(setup_database):
     data = response.json()
     assert data["email"] == "test@example.com"
 
+
+def test_get_me_uses_cached_user(setup_database):
+    """Test repeat requests are served from the user cache until invalidated"""
+    login_response = client.post("/auth/login", json={
+        "email": "cache@example.com",
+        "password": "testpassword"
+    })
+    token = login_response.json()["access_token"]
+    user_id = login_response.json()["user"]["id"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/auth/me", headers=headers).json()["email"] == "cache@example.com"
+    
+    # A bulk UPDATE bypasses ORM events, so the cached snapshot is still served
+    db = setup_database()
+    db.query(User).filter(User.id == user_id).update({"email": "renamed@example.com"})
+    db.commit()
+    assert client.get("/auth/me", headers=headers).json()["email"] == "cache@example.com"
+    
+    invalidate_user(user_id)
+    assert client.get("/auth/me", headers=headers).json()["email"] == "renamed@example.com"
+    
+    # Deactivating through the ORM invalidates the snapshot automatically
+    user = db.query(User).filter(User.id == user_id).first()
+    user.is_active = False
+    db.commit()
+    db.close()
+    response = client.get("/auth/me", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Inactive user"
+
+def test_concurrent_first_logins_share_one_user(setup_database):
+    """Test racing first logins for a new email all resolve to the one stored user"""
+    async def main():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as async_client:
+            return await asyncio.gather(*(
+                async_client.post("/auth/login", json={"email": "race@example.com", "password": password})
+                for password in ["racepassword"] * 4 + ["otherpassword"]
+            ))
+    
+    responses = asyncio.run(main())
+    statuses = [response.status_code for response in responses]
+    ids = {response.json()["user"]["id"] for response in responses if response.status_code == 200}
+    # The wrong password is rejected unless its request created the user
+    assert statuses.count(500) == 0
+    assert len(ids) == 1
+    assert statuses.count(200) == 4 or statuses == [401] * 4 + [200]
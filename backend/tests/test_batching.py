@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from datetime import datetime
+import pytest
+from app.core.batching import BatcherSaturated, MicroBatcher
+from app.core.executor import BoundedExecutor
+from app.core.metrics import registry
+from app.services.prediction_service import PredictionService
+
+def test_concurrent_submits_share_one_batch():
+    """Test items submitted within max_wait are processed in one call, in order"""
+    calls = []
+
+    def process(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=64, max_wait=0.01, name="test-share")
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+    assert asyncio.run(main()) == [i * 2 for i in range(10)]
+    assert calls == [list(range(10))]
+    assert registry.get("batcher_batch_size").count("test-share") == 1
+
+def test_full_batches_dispatch_without_waiting():
+    """Test max_batch_size splits the queue and does not wait for max_wait"""
+    sizes = []
+
+    def process(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait=10, name="test-split")
+
+    async def main():
+        return await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(8))), 1)
+
+    assert asyncio.run(main()) == list(range(8))
+    assert sizes == [4, 4]
+
+def test_items_queue_while_workers_are_busy():
+    """Test items arriving during a running batch form the next, larger batch"""
+    release = threading.Event()
+    sizes = []
+
+    def process(items):
+        sizes.append(len(items))
+        release.wait(1)
+        return items
+
+    batcher = MicroBatcher(
+        process, max_batch_size=64, max_wait=0.001, max_queue=5,
+        executor=BoundedExecutor(1, max_queue=0), name="test-busy",
+    )
+
+    async def main():
+        first = asyncio.ensure_future(batcher.submit(0))
+        await asyncio.sleep(0.05)
+        rest = [asyncio.ensure_future(batcher.submit(i)) for i in range(1, 6)]
+        await asyncio.sleep(0.05)
+        assert batcher.stats()["queued"] == 5
+        with pytest.raises(BatcherSaturated):
+            await batcher.submit(6)
+        release.set()
+        return await asyncio.gather(first, *rest)
+
+    assert asyncio.run(main()) == list(range(6))
+    assert sizes == [1, 5]
+    assert registry.get("batcher_rejected_total").value("test-busy") == 1
+
+def test_batch_errors_reach_every_caller():
+    """Test an exception in process fails each item of the batch"""
+    def process(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(process, max_wait=0.001, name="test-error")
+
+    async def main():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_predict_many_matches_single_predictions():
+    """Test batched scoring returns the same predictions and fills the cache"""
+    now = datetime.now()
+    requests = [("AAPL", "1d", now), ("MSFT", "1w", now), ("AAPL", "1d", now), ("NVDA", "1d", now)]
+    batched = PredictionService(cache_size=16)
+
+    results = batched.predict_many(requests)
+
+    assert results[0] is results[2]
+    single = PredictionService(cache_size=16)
+    for (symbol, window, _), result in zip(requests, results):
+        assert result == single.get_prediction(symbol, window, now)
+        assert batched.cached(symbol, window, now) is result
+
+def test_concurrent_prediction_requests_are_batched():
+    """Test concurrent cache misses on the prediction endpoint share model calls"""
+    from httpx import AsyncClient
+    from app.api import tickers
+    from app.main import app
+
+    symbols = [f"BATCH{i}" for i in range(20)]
+    batches = tickers.prediction_batcher.batches
+
+    async def main():
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            return await asyncio.gather(
+                *(client.get(f"/api/tickers/{symbol}/prediction") for symbol in symbols)
+            )
+
+    responses = asyncio.run(main())
+    assert [response.json()["symbol"] for response in responses] == symbols
+    assert tickers.prediction_batcher.batches - batches < len(symbols)
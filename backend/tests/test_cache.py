@@ -0,0 +1,62 @@
+from app.core.cache import TTLCache
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+def test_cache_lru_eviction():
+    """Test the least recently used entry is evicted when full"""
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" is now most recently used
+    cache.set("c", 3)
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_expiry():
+    """Test entries expire at their ttl or explicit deadline"""
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, ttl=60, timer=timer)
+    cache.set("ttl", "x")
+    cache.set("deadline", "y", expires_at=timer.now + 10)
+    
+    timer.now += 30
+    assert cache.get("ttl") == "x"
+    assert cache.get("deadline") is None
+    
+    timer.now += 60
+    assert cache.get("ttl") is None
+    assert len(cache) == 0
+
+def test_cache_counters():
+    """Test hit and miss counters"""
+    cache = TTLCache(maxsize=10)
+    cache.get("missing")
+    cache.set("key", "value")
+    cache.get("key")
+    cache.get("key")
+    
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+def test_cache_contains_is_not_counted():
+    """Test membership checks respect expiry without touching hit/miss counters"""
+    timer = FakeTimer()
+    cache = TTLCache(maxsize=10, timer=timer)
+    cache.set("a", 1, expires_at=timer.now + 10)
+    
+    assert "a" in cache
+    assert "b" not in cache
+    timer.now += 10
+    assert "a" not in cache
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 0
@@ -0,0 +1,85 @@
+from datetime import datetime
+from fastapi import FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+import json
+from app.core.compression import CompressionMiddleware, _accepted_encodings
+from app.core.responses import FastJSONResponse, fast_json
+from app.schemas.news import NewsItem, NewsResponse
+
+def _news(count):
+    items = [
+        NewsItem(
+            id=f"n{i}",
+            headline=f"Headline number {i}",
+            publishedAt=datetime(2024, 1, 1, 12, i % 60),
+            url=f"https://example.com/{i}",
+            sentiment="Positive",
+            sentimentScore=0.25,
+        )
+        for i in range(count)
+    ]
+    return NewsResponse(symbol="AAPL", items=items, nextCursor=None)
+
+def _client(minimum_size=100):
+    app = FastAPI()
+
+    @app.get("/news")
+    async def news(response: Response, count: int = 20):
+        response.headers["ETag"] = '"v1"'
+        return fast_json(_news(count), response)
+
+    @app.get("/stream")
+    async def stream():
+        async def body():
+            for _ in range(3):
+                yield b"x" * 1000 + b"\n"
+        return StreamingResponse(body(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+    return TestClient(app)
+
+def test_fast_json_matches_default_encoding():
+    """Test FastJSONResponse renders the same JSON as jsonable_encoder"""
+    payload = _news(5)
+    fast = json.loads(FastJSONResponse(payload).body)
+    assert fast == jsonable_encoder(payload)
+
+    plain = {"items": [{"at": datetime(2024, 1, 1), "value": 1.5}]}
+    assert json.loads(FastJSONResponse(plain).body) == jsonable_encoder(plain)
+
+def test_large_responses_are_gzipped():
+    """Test bodies over the threshold are gzipped with a weak ETag"""
+    client = _client()
+    response = client.get("/news", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    # The client decodes the body; it must equal the identity representation
+    identity = client.get("/news", headers={"Accept-Encoding": "identity"})
+    assert int(response.headers["content-length"]) < len(identity.content)
+    assert response.content == identity.content
+
+def test_small_and_identity_responses_are_not_compressed():
+    """Test small bodies and clients without gzip get the identity encoding"""
+    client = _client()
+    small = client.get("/news?count=0", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.headers["etag"] == '"v1"'
+
+    identity = client.get("/news", headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "content-encoding" not in identity.headers
+
+def test_streams_are_not_compressed():
+    """Test streamed NDJSON passes through uncompressed"""
+    client = _client()
+    response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert len(response.content.splitlines()) == 3
+
+def test_accepted_encodings():
+    """Test Accept-Encoding parsing honours q-values"""
+    assert _accepted_encodings(b"gzip, deflate, br") == {b"gzip", b"deflate", b"br"}
+    assert _accepted_encodings(b"br;q=0, GZIP;q=0.5") == {b"gzip"}
@@ -0,0 +1,59 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.cors import CORSMiddleware
+
+def _client(origins):
+    app = FastAPI()
+    
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+    
+    app.add_middleware(CORSMiddleware, allow_origins=origins)
+    return TestClient(app)
+
+def test_allowed_origin_is_echoed():
+    """Test simple cross-origin requests from listed origins get CORS headers"""
+    client = _client(["http://localhost:5173"])
+    response = client.get("/ping", headers={"Origin": "http://localhost:5173"})
+    
+    assert response.json() == {"ok": True}
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+    assert response.headers["vary"] == "Origin"
+    assert "etag" in response.headers["access-control-expose-headers"].lower()
+
+def test_disallowed_origin_gets_no_cors_headers():
+    """Test unlisted origins are served without CORS headers and preflights are rejected"""
+    client = _client(["http://localhost:5173"])
+    response = client.get("/ping", headers={"Origin": "http://evil.example"})
+    assert response.status_code == 200
+    assert "access-control-allow-origin" not in response.headers
+    assert response.headers["vary"] == "Origin"
+    
+    preflight = client.options("/ping", headers={
+        "Origin": "http://evil.example",
+        "Access-Control-Request-Method": "GET",
+    })
+    assert preflight.status_code == 400
+
+def test_preflight_is_answered_without_the_app():
+    """Test preflight requests get the allowed methods, headers and max age"""
+    client = _client(["*"])
+    response = client.options("/ping", headers={
+        "Origin": "http://anywhere.example",
+        "Access-Control-Request-Method": "DELETE",
+        "Access-Control-Request-Headers": "Authorization",
+    })
+    
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert "DELETE" in response.headers["access-control-allow-methods"]
+    assert "Authorization" in response.headers["access-control-allow-headers"]
+    assert response.headers["access-control-max-age"] == "86400"
+
+def test_same_origin_request_passes_through_with_wildcard():
+    """Test requests without Origin are untouched when any origin is allowed"""
+    client = _client(["*"])
+    response = client.get("/ping")
+    assert "access-control-allow-origin" not in response.headers
+    assert "vary" not in response.headers
@@ -0,0 +1,93 @@
+from datetime import date, datetime
+import numpy as np
+from app.services.ensemble import load_ensemble, load_predictor, save_ensemble, DEFAULT_MODEL_PATH
+from app.services.features import FEATURE_NAMES, LOOKBACK, build_features
+from app.services.market_data import SyntheticMarketData
+from app.services.prediction_service import PredictionService
+
+AS_OF = date(2024, 7, 1)
+SYMBOLS = ["AAPL", "NVDA", "MSFT", "TSLA", "XOM"]
+
+def test_bundled_artifact_loads():
+    """Test the bundled ensemble has a model per window on the current features"""
+    bundle = load_ensemble(DEFAULT_MODEL_PATH)
+
+    assert set(bundle.models) == {"1d", "1w", "1m"}
+    assert bundle.metadata["features"] == list(FEATURE_NAMES)
+    assert bundle.version == load_predictor().version
+
+def test_market_data_is_deterministic():
+    """Test synthetic history is identical across calls and independent of the batch"""
+    market_data = SyntheticMarketData()
+    closes = market_data.closes(SYMBOLS, AS_OF, LOOKBACK)
+
+    assert closes.shape == (len(SYMBOLS), LOOKBACK)
+    np.testing.assert_array_equal(closes, market_data.closes(SYMBOLS, AS_OF, LOOKBACK))
+    np.testing.assert_allclose(
+        np.diff(np.log(closes[1:2])), np.diff(np.log(market_data.closes(["NVDA"], AS_OF, LOOKBACK)))
+    )
+    assert build_features(closes).shape == (len(SYMBOLS), len(FEATURE_NAMES))
+
+def test_batched_predict_matches_single_symbol():
+    """Test scoring symbols together gives the same result as one at a time"""
+    predictor = load_predictor()
+    delta, confidence = predictor.predict(SYMBOLS, "1d", AS_OF)
+
+    for i, symbol in enumerate(SYMBOLS):
+        single_delta, single_confidence = predictor.predict([symbol], "1d", AS_OF)
+        np.testing.assert_allclose(single_delta[0], delta[i])
+        np.testing.assert_allclose(single_confidence[0], confidence[i])
+    assert ((confidence >= 0.5) & (confidence <= 0.95)).all()
+
+def test_forest_matches_tree_walk():
+    """Test the vectorized forest descent matches walking each tree node by node"""
+    forest = load_predictor().bundle.models["1w"].forest
+    X = np.random.default_rng(0).normal(size=(20, len(FEATURE_NAMES)))
+
+    expected = np.empty((forest.feature.shape[0], len(X)))
+    for t in range(forest.feature.shape[0]):
+        for i, row in enumerate(X):
+            node = 0
+            while forest.left[t, node] != node:
+                goes_left = row[forest.feature[t, node]] <= forest.threshold[t, node]
+                node = forest.left[t, node] if goes_left else forest.right[t, node]
+            expected[t, i] = forest.value[t, node]
+    np.testing.assert_allclose(forest.predict_trees(X), expected)
+
+def test_artifact_round_trip(tmp_path):
+    """Test saving and reloading an ensemble preserves its predictions"""
+    bundle = load_ensemble(DEFAULT_MODEL_PATH)
+    path = tmp_path / "ensemble.npz"
+    save_ensemble(str(path), bundle)
+    reloaded = load_ensemble(str(path))
+
+    X = load_predictor().features(SYMBOLS, AS_OF)
+    for window, model in bundle.models.items():
+        np.testing.assert_allclose(reloaded.models[window].predict(X), model.predict(X))
+
+def test_service_scores_cache_misses_in_one_call():
+    """Test batch predictions make one model call per window for uncached symbols"""
+    predictor = load_predictor()
+    calls = []
+
+    class CountingPredictor:
+        version = predictor.version
+
+        def predict(self, symbols, window, as_of):
+            calls.append((tuple(symbols), window))
+            return predictor.predict(symbols, window, as_of)
+
+    service = PredictionService(predictor=CountingPredictor())
+    service.get_prediction("AAPL", "1d")
+    items = service.get_predictions_batch(["AAPL", "NVDA", "MSFT"], ["1d", "1w"])
+
+    assert calls == [
+        (("AAPL",), "1d"),
+        (("NVDA", "MSFT"), "1d"),
+        (("AAPL", "NVDA", "MSFT"), "1w"),
+    ]
+    assert len(items) == 6
+
+    delta, _ = predictor.predict(["NVDA"], "1d", datetime.now().date())
+    assert items[2]["prediction"]["deltaPct"] == round(float(delta[0]), 2)
+    assert items[0]["model"] == {"type": "svr_rf_ensemble", "version": predictor.version}
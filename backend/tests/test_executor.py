@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import pytest
+from app.core.executor import BoundedExecutor, ExecutorSaturated
+from app.core.metrics import executor_completed, executor_queued, executor_rejected, executor_running
+
+def test_bounded_executor_runs_off_loop():
+    """Test work runs in pool threads and results are returned"""
+    pool = BoundedExecutor(max_workers=2, max_queue=2)
+    loop_thread = threading.get_ident()
+    
+    async def main():
+        return await asyncio.gather(*(pool.run(threading.get_ident) for _ in range(4)))
+    
+    thread_ids = asyncio.run(main())
+    assert loop_thread not in thread_ids
+    assert pool.stats()["completed"] == 4
+    # Two calls had to wait while both workers were busy
+    assert pool.stats()["max_queued"] == 2
+
+def test_bounded_executor_idle_pool_never_queues():
+    """Test calls that find a free worker are not counted as queued"""
+    pool = BoundedExecutor(max_workers=2, max_queue=2)
+    
+    async def main():
+        for _ in range(3):
+            await pool.run(threading.get_ident)
+        await asyncio.gather(*(pool.run(threading.get_ident) for _ in range(2)))
+    
+    asyncio.run(main())
+    assert pool.stats()["max_queued"] == 0
+    assert pool.stats()["queued"] == 0
+
+def test_bounded_executor_rejects_when_full():
+    """Test calls beyond workers + queue fail fast"""
+    pool = BoundedExecutor(max_workers=1, max_queue=1, name="test-full")
+    release = threading.Event()
+    
+    async def main():
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert pool.stats()["running"] == 1
+        assert pool.stats()["queued"] == 1
+        assert executor_running.value("test-full") == 1
+        assert executor_queued.value("test-full") == 1
+        
+        with pytest.raises(ExecutorSaturated):
+            await pool.run(release.wait)
+        
+        release.set()
+        await asyncio.gather(*running)
+    
+    asyncio.run(main())
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["max_queued"] == 1
+    assert executor_rejected.value("test-full") == 1
+    assert executor_completed.value("test-full") == 2
+    assert executor_running.value("test-full") == executor_queued.value("test-full") == 0
@@ -0,0 +1,59 @@
+from sqlalchemy import create_engine, inspect, text
+from app.db.init_db import init_db
+
+# Schema create_all produced before migrations existed: no unique
+# (user_id, symbol) constraint on watchlist_items and no predictions table
+PRE_MIGRATION_SCHEMA = [
+    "CREATE TABLE users (id INTEGER NOT NULL PRIMARY KEY, email VARCHAR NOT NULL, "
+    "hashed_password VARCHAR NOT NULL, is_active BOOLEAN, created_at DATETIME)",
+    "CREATE UNIQUE INDEX ix_users_email ON users (email)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    "CREATE TABLE watchlist_items (id INTEGER NOT NULL PRIMARY KEY, user_id INTEGER NOT NULL "
+    "REFERENCES users (id), symbol VARCHAR NOT NULL, added_at DATETIME)",
+    "CREATE INDEX ix_watchlist_items_id ON watchlist_items (id)",
+    "CREATE TABLE alerts (id INTEGER NOT NULL PRIMARY KEY, user_id INTEGER NOT NULL "
+    "REFERENCES users (id), symbol VARCHAR NOT NULL, rule JSON NOT NULL, is_active VARCHAR, "
+    "created_at DATETIME, triggered_at DATETIME)",
+    "CREATE INDEX ix_alerts_id ON alerts (id)",
+]
+
+def test_init_db_migrates_pre_migration_database(tmp_path):
+    """Test an unversioned database is stamped at the baseline and upgraded"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        for statement in PRE_MIGRATION_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text("INSERT INTO users (id, email, hashed_password) VALUES (1, 'a@b.c', 'x')"))
+        conn.execute(text("INSERT INTO watchlist_items (user_id, symbol) VALUES (1, 'AAPL'), (1, 'AAPL')"))
+
+    init_db(engine)
+    init_db(engine)
+
+    inspector = inspect(engine)
+    assert {"predictions", "prediction_runs"} <= set(inspector.get_table_names())
+    assert [c["name"] for c in inspector.get_unique_constraints("watchlist_items")] == [
+        "uq_watchlist_items_user_id_symbol"
+    ]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0005"
+        assert conn.execute(text("SELECT COUNT(*) FROM watchlist_items")).scalar() == 1
+
+def test_init_db_creates_new_database(tmp_path):
+    """Test a new database gets the full schema through the migrations"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+    init_db(engine)
+    assert {"users", "watchlist_items", "alerts", "predictions", "prediction_runs", "alembic_version"} <= set(
+        inspect(engine).get_table_names()
+    )
+
+def test_init_db_adopts_create_all_database(tmp_path):
+    """Test an unversioned database that create_all built from the current models upgrades cleanly"""
+    from app.db.session import Base
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'current.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    init_db(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == "0005"
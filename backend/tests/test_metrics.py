@@ -0,0 +1,88 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.core.metrics import MetricsRegistry, instrument_engine, timed, service_call_duration
+from app.db.session import Base, get_async_db
+from app.main import app
+
+def test_histogram_renders_cumulative_buckets():
+    """Test histogram samples are cumulative and end with +Inf, sum and count"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/a")
+    
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 6.05' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+def test_counter_labels_are_escaped():
+    """Test label values with quotes and newlines stay valid exposition text"""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events", ("name",))
+    counter.inc('say "hi"\n')
+    counter.inc('say "hi"\n', amount=2)
+    
+    assert 'events_total{name="say \\"hi\\"\\n"} 3' in registry.render()
+    assert registry.counter("events_total", "Events", ("name",)) is counter
+
+def test_timed_records_service_calls():
+    """Test the timed decorator counts calls, including ones that raise"""
+    @timed("test", "work")
+    def work(fail=False):
+        if fail:
+            raise ValueError("boom")
+        return 1
+    
+    assert work() == 1
+    try:
+        work(fail=True)
+    except ValueError:
+        pass
+    assert service_call_duration.count("test", "work") == 2
+
+def test_metrics_endpoint_reports_routes_db_and_services(tmp_path):
+    """Test /metrics labels requests by route template and includes DB and service timings"""
+    # An instrumented throwaway database instead of the app's; the client is
+    # not entered, so startup never migrates or reads the default database
+    path = tmp_path / "metrics.db"
+    Base.metadata.create_all(bind=create_engine(f"sqlite:///{path}"))
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    instrument_engine(async_engine.sync_engine)
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+    
+    previous = app.dependency_overrides.get(get_async_db)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        client = TestClient(app)
+        # Symbols no other test has cached, so both misses query the table
+        client.get("/api/tickers/METRICSA/prediction")
+        client.get("/api/tickers/METRICSB/prediction")
+        client.get("/does-not-exist")
+        response = client.get("/metrics")
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_async_db)
+        else:
+            app.dependency_overrides[get_async_db] = previous
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/api/tickers/{symbol}/prediction",status="200"}' in body
+    assert 'route="<unmatched>",status="404"' in body
+    assert "METRICSA" not in body
+    assert 'http_requests_in_flight{method="GET"} 1' in body
+    assert 'service_call_duration_seconds_count{service="prediction",method="get_prediction"}' in body
+    assert 'db_query_duration_seconds_count{operation="SELECT"}' in body
+    assert 'executor_queued{executor="password-hash"} 0' in body
+    assert 'executor_rejected_total{executor="prediction-batch"}' in body
@@ -1,5 +1,7 @@
+import json
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services.news_service import NewsService
 
 client = TestClient(app)
 
@@ -66,3 +68,61 @@ def test_get_news_limit_validation():
     response = client.get("/api/news?limit=0")
     assert response.status_code == 422  # Validation error
 
+
+def test_news_service_serves_precomputed_items():
+    """Test news is served from the index and identical across instances"""
+    service = NewsService()
+    first = service.get_symbol_news("AAPL", limit=5)
+    second = service.get_symbol_news("AAPL", limit=5)
+    
+    # Slices of the same precomputed items, not rebuilt per call
+    assert all(a is b for a, b in zip(first, second))
+    # A fresh instance (e.g. another worker) builds the same feed
+    assert NewsService().get_symbol_news("AAPL", limit=5) == first
+    
+    published = [item.publishedAt for item in service.get_news(limit=15)]
+    assert published == sorted(published, reverse=True)
+
+def test_news_cursor_pagination():
+    """Test walking the feed page by page with nextCursor"""
+    full = client.get("/api/news?limit=100").json()["items"]
+    
+    seen = []
+    url = "/api/news?limit=4"
+    while url:
+        data = client.get(url).json()
+        seen.extend(data["items"])
+        url = f"/api/news?limit=4&before={data['nextCursor']}" if data["nextCursor"] else None
+    
+    assert [item["id"] for item in seen] == [item["id"] for item in full]
+
+def test_news_invalid_cursor():
+    """Test malformed cursors are rejected"""
+    response = client.get("/api/tickers/AAPL/news?before=not-a-cursor")
+    assert response.status_code == 400
+
+def test_stream_symbol_news():
+    """Test NDJSON streaming matches the paged endpoint"""
+    page = client.get("/api/tickers/AAPL/news?limit=3").json()
+    response = client.get(f"/api/tickers/AAPL/news/stream?before={page['nextCursor']}")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    streamed = [json.loads(line) for line in response.text.splitlines()]
+    rest = client.get(f"/api/tickers/AAPL/news?limit=100&before={page['nextCursor']}").json()
+    assert streamed == rest["items"]
+
+def test_get_news_conditional_request():
+    """Test news pages carry an ETag per query and If-None-Match returns 304"""
+    response = client.get("/api/news?limit=5", headers={"Accept-Encoding": "identity"})
+    etag = response.headers["etag"]
+    assert "max-age=" in response.headers["cache-control"]
+    
+    assert client.get("/api/news?limit=5", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/api/news?limit=5", headers={"If-None-Match": f'W/{etag}, "x"'}).status_code == 304
+    assert client.get("/api/news?limit=6", headers={"If-None-Match": etag}).status_code == 200
+    
+    symbol_response = client.get("/api/tickers/AAPL/news?limit=5")
+    assert symbol_response.headers["etag"] != etag
+    cached = client.get("/api/tickers/AAPL/news?limit=5", headers={"If-None-Match": symbol_response.headers["etag"]})
+    assert cached.status_code == 304
@@ -1,5 +1,6 @@
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services.prediction_service import PredictionService
 
 client = TestClient(app)
 
@@ -44,3 +45,72 @@ def test_get_prediction_different_symbols():
     assert data1["symbol"] != data2["symbol"]
     # Predictions might be different (though not guaranteed with mock)
 
+
+def test_get_predictions_batch():
+    """Test batch predictions match the per-symbol endpoint"""
+    response = client.post("/api/tickers/predictions", json={
+        "symbols": ["aapl", "NVDA", "AAPL"],
+        "windows": ["1d", "1w"]
+    })
+    
+    assert response.status_code == 200
+    items = response.json()["items"]
+    
+    # Duplicate symbols are collapsed, one item per (symbol, window)
+    assert [(item["symbol"], item["window"]) for item in items] == [
+        ("AAPL", "1d"), ("AAPL", "1w"), ("NVDA", "1d"), ("NVDA", "1w")
+    ]
+    
+    single = client.get("/api/tickers/AAPL/prediction?window=1d").json()
+    assert items[0]["prediction"] == single["prediction"]
+
+def test_get_predictions_batch_validation():
+    """Test batch predictions reject empty symbol lists and bad windows"""
+    response = client.post("/api/tickers/predictions", json={"symbols": []})
+    assert response.status_code == 422
+    
+    response = client.post("/api/tickers/predictions", json={
+        "symbols": ["AAPL"],
+        "windows": ["2y"]
+    })
+    assert response.status_code == 422
+
+def test_prediction_service_cache():
+    """Test repeated predictions are served from the per-day cache"""
+    service = PredictionService(cache_size=2)
+    first = service.get_prediction("AAPL", "1d")
+    second = service.get_prediction("AAPL", "1d")
+    
+    assert second is first
+    assert service.cache_stats()["hits"] == 1
+    assert service.cache_stats()["misses"] == 1
+    
+    # Bounded by cache_size with LRU eviction
+    service.get_prediction("NVDA", "1d")
+    service.get_prediction("TSLA", "1d")
+    assert service.cache_stats()["size"] == 2
+    assert service.cache_stats()["evictions"] == 1
+
+def test_get_prediction_conditional_request():
+    """Test predictions carry a strong ETag and If-None-Match returns 304"""
+    response = client.get("/api/tickers/AAPL/prediction?window=1w")
+    etag = response.headers["etag"]
+    assert not etag.startswith("W/")
+    max_age = int(response.headers["cache-control"].split("max-age=")[1])
+    assert 0 < max_age <= 24 * 3600
+    
+    cached = client.get("/api/tickers/AAPL/prediction?window=1w", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    
+    # A different window is a different representation
+    other = client.get("/api/tickers/AAPL/prediction?window=1d", headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+
+def test_prediction_as_of_is_stable_across_instances():
+    """Test separate service instances return identical predictions, so ETags stay strong"""
+    first = PredictionService().get_prediction("AAPL")
+    second = PredictionService().get_prediction("AAPL")
+    assert first == second
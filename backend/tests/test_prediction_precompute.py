@@ -0,0 +1,154 @@
+import asyncio
+from datetime import date, datetime, timedelta
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.db.session import Base, get_async_db
+from app.main import app
+from app.models.alert import Alert
+from app.models.prediction import Prediction, PredictionRun
+from app.models.user import User
+from app.models.watchlist import WatchlistItem
+from app.services.prediction_precompute import PredictionPrecomputer, load_precomputed
+from app.services.prediction_service import PredictionService
+
+def _with_database(fn):
+    """Run fn(session_factory) against a fresh in-memory database"""
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            return await fn(async_sessionmaker(engine, expire_on_commit=False))
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+def test_precompute_stores_every_window_for_the_universe():
+    """Test the universe comes from watchlists and active alerts and re-runs replace rows"""
+    day = date.today()
+    precomputer = PredictionPrecomputer(PredictionService(cache_size=64), batch_size=2)
+
+    async def run(session_factory):
+        async with session_factory() as db:
+            db.add(User(id=1, email="precompute@example.com", hashed_password="x"))
+            db.add_all([
+                WatchlistItem(user_id=1, symbol="AAPL"),
+                WatchlistItem(user_id=1, symbol="MSFT"),
+                Alert(user_id=1, symbol="NVDA", rule={}),
+                Alert(user_id=1, symbol="TSLA", rule={}, is_active="triggered"),
+            ])
+            await db.commit()
+
+            assert not await precomputer.is_precomputed(db, day)
+            # A run over some symbols does not complete the day
+            await precomputer.precompute(db, day, ["AAPL"])
+            assert not await precomputer.is_precomputed(db, day)
+            first = await precomputer.precompute(db, day)
+            second = await precomputer.precompute(db, day)
+            rows = (await db.execute(
+                select(Prediction.symbol, func.count()).group_by(Prediction.symbol)
+            )).all()
+            return first, second, dict(rows), await precomputer.is_precomputed(db, day)
+
+    first, second, counts, precomputed = _with_database(run)
+    assert first["symbols"] == 3 and first["rows"] == 9
+    assert second["rows"] == 9
+    assert counts == {"AAPL": 3, "MSFT": 3, "NVDA": 3}
+    assert precomputed
+
+def test_claim_lets_one_worker_run_a_day():
+    """Test a claimed or completed day is skipped and a stalled run is taken over"""
+    day = date.today()
+    service = PredictionService(cache_size=64)
+    first = PredictionPrecomputer(service, lease_seconds=600)
+    second = PredictionPrecomputer(service, lease_seconds=600)
+
+    async def run(session_factory):
+        async with session_factory() as a, session_factory() as b:
+            claims = [await first.claim(a, day), await second.claim(b, day)]
+
+            # The first worker stopped heartbeating a lease ago
+            await a.execute(
+                PredictionRun.__table__.update().values(
+                    heartbeat_at=datetime.utcnow() - timedelta(seconds=601)
+                )
+            )
+            await a.commit()
+            claims += [await second.claim(b, day), await first.claim(a, day)]
+
+            await second.precompute(b, day, ["AAPL"])
+            claims.append(await first.claim(a, day))
+            await second.precompute(b, day)
+            claims.append(await first.claim(a, day))
+            return claims, await first.is_precomputed(a, day)
+
+    claims, precomputed = _with_database(run)
+    assert claims == [True, False, True, False, False, False]
+    assert precomputed
+
+def test_load_precomputed_matches_live_predictions():
+    """Test stored rows are served identically to live scoring and prime the cache"""
+    now = datetime.now()
+    service = PredictionService(cache_size=64)
+    precomputer = PredictionPrecomputer(PredictionService(cache_size=64))
+
+    async def run(session_factory):
+        async with session_factory() as db:
+            await precomputer.precompute(db, now.date(), ["AAPL", "GOOGL"])
+            await precomputer.precompute(db, now.date() + timedelta(days=1), ["AAPL"])
+            await db.execute(insert(Prediction.__table__), [{
+                "symbol": "OLD", "window": "1d", "as_of": service.prediction_time(now),
+                "delta_pct": 1.0, "confidence": 0.6, "model_type": service.model_type,
+                "model_version": "0.0.1",
+            }])
+            await db.commit()
+            return await load_precomputed(db, service, ["AAPL", "GOOGL", "OLD"], ["1d", "1m"], now)
+
+    found = _with_database(run)
+    live = PredictionService(cache_size=64)
+    assert sorted(found) == [("AAPL", "1d"), ("AAPL", "1m"), ("GOOGL", "1d"), ("GOOGL", "1m")]
+    for (symbol, window), prediction in found.items():
+        assert prediction == live.get_prediction(symbol, window, now)
+        assert service.cached(symbol, window, now) is prediction
+    assert service.missing(["AAPL", "OLD"], ["1d"], now) == ["OLD"]
+
+def test_prediction_endpoint_serves_precomputed_rows(tmp_path):
+    """Test the endpoint prefers a stored row over live scoring"""
+    url = f"sqlite:///{tmp_path / 'predictions.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.now()
+    with engine.begin() as conn:
+        conn.execute(insert(Prediction.__table__), [{
+            "symbol": "PRECOMP", "window": "1w", "as_of": PredictionService.prediction_time(now),
+            "delta_pct": 12.345, "confidence": 0.9, "model_type": "svr_rf_ensemble",
+            "model_version": PredictionService(cache_size=1).model_version,
+        }])
+    session_factory = async_sessionmaker(
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'predictions.db'}", poolclass=NullPool)
+    )
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    previous = app.dependency_overrides.get(get_async_db)
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        client = TestClient(app)
+        stored = client.get("/api/tickers/PRECOMP/prediction?window=1w").json()
+        live = client.get("/api/tickers/PRECOMP/prediction?window=1d").json()
+        batch = client.post("/api/tickers/predictions", json={"symbols": ["PRECOMP"], "windows": ["1w"]})
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_async_db)
+        else:
+            app.dependency_overrides[get_async_db] = previous
+
+    assert stored["prediction"]["deltaPct"] == 12.35
+    assert stored["prediction"]["confidence"] == 0.9
+    assert live["prediction"]["deltaPct"] != 12.35
+    assert batch.json()["items"][0]["prediction"]["deltaPct"] == 12.35
@@ -0,0 +1,140 @@
+from datetime import date
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from app.services.ensemble import EnsemblePredictor, load_predictor
+from app.services.market_data import StoredMarketData, SyntheticMarketData
+from app.services.price_import import import_csv
+from app.services.price_store import PriceStore, to_timestamp
+
+def _bars(start_day, count, base=100.0):
+    days = np.arange(count) + (np.datetime64(start_day) - np.datetime64("1970-01-01")).astype(int)
+    close = base + np.arange(count, dtype=float)
+    return {
+        "timestamp": days * 86400,
+        "open": close - 0.5,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": np.full(count, 1000.0),
+    }
+
+def test_append_and_window_slices(tmp_path):
+    """Test bars are appended in order and windows are zero-copy slices by date"""
+    store = PriceStore(str(tmp_path))
+    assert store.append("AAPL", _bars("2024-01-01", 10)) == 10
+    assert store.append("AAPL", _bars("2024-01-11", 5, base=110.0)) == 5
+
+    assert store.symbols() == ["AAPL"]
+    assert store.length("AAPL") == 15
+    window = store.window("AAPL", date(2024, 1, 3), date(2024, 1, 12), ("timestamp", "close"))
+    assert window["close"].tolist() == [102.0 + i for i in range(10)]
+    assert window["timestamp"][0] == to_timestamp(date(2024, 1, 3))
+    assert isinstance(window["close"], np.memmap)
+    assert not window["close"].flags.writeable
+
+    last = store.last("AAPL", 3, end="2024-01-13")
+    assert last["close"].tolist() == [110.0, 111.0, 112.0]
+
+def test_append_rejects_old_or_unordered_bars(tmp_path):
+    """Test appends must be newer than the stored history and strictly increasing"""
+    store = PriceStore(str(tmp_path))
+    store.append("MSFT", _bars("2024-01-01", 5))
+
+    with pytest.raises(ValueError):
+        store.append("MSFT", _bars("2024-01-03", 5))
+    unordered = _bars("2024-02-01", 3)
+    unordered["timestamp"] = unordered["timestamp"][::-1]
+    with pytest.raises(ValueError):
+        store.append("MSFT", unordered)
+    with pytest.raises(ValueError):
+        store.append("../x", _bars("2024-01-01", 1))
+    assert store.length("MSFT") == 5
+
+def test_interrupted_append_is_ignored_and_trimmed(tmp_path):
+    """Test rows written to data columns without a timestamp are invisible, then trimmed"""
+    store = PriceStore(str(tmp_path))
+    store.append("TSLA", _bars("2024-01-01", 3))
+    with open(tmp_path / "TSLA" / "close.bin", "ab") as f:
+        f.write(np.array([999.0]).tobytes())
+    store.refresh()
+
+    assert store.window("TSLA")["close"].tolist() == [100.0, 101.0, 102.0]
+    store.append("TSLA", _bars("2024-01-04", 1, base=103.0))
+    assert store.window("TSLA")["close"].tolist() == [100.0, 101.0, 102.0, 103.0]
+
+def test_matrix_pads_short_history(tmp_path):
+    """Test matrix reads aligned trailing windows and pads missing history with NaN"""
+    store = PriceStore(str(tmp_path))
+    store.append("AAPL", _bars("2024-01-01", 10))
+    store.append("NVDA", _bars("2024-01-08", 3, base=500.0))
+
+    matrix = store.matrix(["AAPL", "NVDA", "NONE"], 4, end="2024-01-10")
+    assert matrix[0].tolist() == [106.0, 107.0, 108.0, 109.0]
+    assert np.isnan(matrix[1, 0]) and matrix[1, 1:].tolist() == [500.0, 501.0, 502.0]
+    assert np.isnan(matrix[2]).all()
+
+def test_import_csv_is_resumable(tmp_path):
+    """Test CSV import groups by symbol and skips bars already stored"""
+    csv_path = tmp_path / "history.csv"
+    csv_path.write_text(
+        "Date,Symbol,Open,High,Low,Close,Volume\n"
+        "2024-01-03,aapl,1,2,0.5,1.5,100\n"
+        "2024-01-02,AAPL,1,2,0.5,1.0,100\n"
+        "2024-01-02,NVDA,5,6,4,5.5,200\n"
+    )
+    store = PriceStore(str(tmp_path / "store"))
+
+    assert import_csv(store, str(csv_path)) == {"AAPL": 2, "NVDA": 1}
+    assert store.window("AAPL")["close"].tolist() == [1.0, 1.5]
+    assert import_csv(store, str(csv_path)) == {"AAPL": 0, "NVDA": 0}
+
+    single = tmp_path / "MSFT.csv"
+    single.write_text("timestamp,open,high,low,close,volume\n1704240000,1,1,1,7,1\n")
+    assert import_csv(store, str(single)) == {"MSFT": 1}
+
+def test_stored_market_data_falls_back(tmp_path):
+    """Test stored closes are used where history suffices and synthetic history elsewhere"""
+    store = PriceStore(str(tmp_path))
+    store.append("AAPL", _bars("2024-01-01", 30))
+    fallback = SyntheticMarketData()
+    market_data = StoredMarketData(store, fallback=fallback)
+
+    closes = market_data.closes(["AAPL", "NVDA"], date(2024, 1, 30), 22)
+    assert closes[0].tolist() == [108.0 + i for i in range(22)]
+    np.testing.assert_array_equal(closes[1], fallback.closes(["NVDA"], date(2024, 1, 30), 22)[0])
+    with pytest.raises(KeyError):
+        StoredMarketData(store).closes(["NVDA"], date(2024, 1, 30), 22)
+
+def test_unstorable_symbols_fall_back(tmp_path):
+    """Test symbols the store cannot name are served by the fallback instead of raising"""
+    store = PriceStore(str(tmp_path))
+    store.append("AAPL", _bars("2024-01-01", 30))
+    fallback = SyntheticMarketData()
+    market_data = StoredMarketData(store, fallback=fallback)
+
+    closes = market_data.closes(["AAPL", "BRK/B", "BRK B"], date(2024, 1, 30), 22)
+    assert closes[0].tolist() == [108.0 + i for i in range(22)]
+    np.testing.assert_array_equal(closes[1:], fallback.closes(["BRK/B", "BRK B"], date(2024, 1, 30), 22))
+    with pytest.raises(KeyError):
+        StoredMarketData(store).closes(["BRK/B"], date(2024, 1, 30), 22)
+
+def test_prediction_endpoints_accept_unstorable_symbols(tmp_path, monkeypatch):
+    """Test single and batch predictions for symbols the store cannot name still succeed"""
+    from app.api import tickers
+    from app.main import app
+
+    store = PriceStore(str(tmp_path))
+    store.append("AAPL", _bars("2024-01-01", 30))
+    predictor = EnsemblePredictor(
+        load_predictor().bundle, market_data=StoredMarketData(store, fallback=SyntheticMarketData())
+    )
+    monkeypatch.setattr(tickers.prediction_service, "predictor", predictor)
+    client = TestClient(app)
+
+    single = client.get("/api/tickers/BRK%20B/prediction")
+    assert single.status_code == 200
+    assert single.json()["symbol"] == "BRK B"
+    batch = client.post("/api/tickers/predictions", json={"symbols": ["AAPL", "BRK/B"]})
+    assert batch.status_code == 200
+    assert [item["symbol"] for item in batch.json()["items"]] == ["AAPL", "BRK/B"]
@@ -0,0 +1,104 @@
+import asyncio
+import json
+from datetime import datetime
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.pubsub import PubSub, prediction_topic, user_topic
+from app.api import events
+from app.db.session import Base
+from app.models.prediction import Prediction
+from app.services.prediction_service import PredictionService
+
+def test_publish_fans_out_to_topic_subscribers():
+    """Test events reach every subscriber of the topic and no one else"""
+    async def main():
+        pubsub = PubSub()
+        first = pubsub.subscribe([user_topic(1), prediction_topic("AAPL")])
+        second = pubsub.subscribe([user_topic(2)])
+        await pubsub.publish(user_topic(1), "alerts", {"items": []})
+        await pubsub.publish(prediction_topic("AAPL"), "prediction", {"symbol": "AAPL"})
+        
+        assert await first.get() == 'event: alerts\ndata: {"items":[]}\n\n'
+        assert await first.get() == 'event: prediction\ndata: {"symbol":"AAPL"}\n\n'
+        assert len(second) == 0
+        
+        pubsub.unsubscribe(first)
+        assert pubsub.topics() == {user_topic(2)}
+    
+    asyncio.run(main())
+
+def test_full_queue_drops_oldest_without_blocking():
+    """Test a slow subscriber loses its oldest events instead of stalling publishers"""
+    async def main():
+        pubsub = PubSub(queue_size=2)
+        subscription = pubsub.subscribe(["t"])
+        for i in range(5):
+            await pubsub.publish("t", "n", {"i": i})
+        
+        assert subscription.take_dropped() == 3
+        assert subscription.take_dropped() == 0
+        assert await subscription.get() == 'event: n\ndata: {"i":3}\n\n'
+    
+    asyncio.run(main())
+
+def test_event_stream_reports_lag_and_unsubscribes():
+    """Test the SSE stream emits a lagged frame after drops and cleans up on close"""
+    async def main():
+        stream = events._event_stream([user_topic(7)])
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        subscription = next(iter(events.pubsub._topics[user_topic(7)]))
+        for i in range(events.pubsub.queue_size + 1):
+            events.pubsub.publish_local(user_topic(7), "alerts", {"i": i})
+        
+        assert await stream.__anext__() == 'event: lagged\ndata: {"dropped":1}\n\n'
+        assert await stream.__anext__() == 'event: alerts\ndata: {"i":1}\n\n'
+        assert subscription.take_dropped() == 0
+        await stream.aclose()
+        assert not events.pubsub.has_subscribers(user_topic(7))
+    
+    asyncio.run(main())
+
+def test_prediction_refresh_targets_subscribed_symbols():
+    """Test refreshed predictions are pushed only for symbols with subscribers"""
+    async def main():
+        subscription = events.pubsub.subscribe([prediction_topic("MSFT")])
+        try:
+            assert await events.publish_prediction_refreshes(PredictionService()) == 1
+            message = await subscription.get()
+        finally:
+            events.pubsub.unsubscribe(subscription)
+        assert message.startswith("event: prediction\n")
+        assert '"symbol":"MSFT"' in message and '"window":"1d"' in message
+    
+    asyncio.run(main())
+
+def test_prediction_refresh_prefers_precomputed_rows():
+    """Test refreshes batch every subscribed symbol and serve stored rows over live scoring"""
+    service = PredictionService(cache_size=64)
+    now = datetime.now()
+    
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Prediction.__table__), [{
+                "symbol": "STORED", "window": "1d", "as_of": service.prediction_time(now),
+                "delta_pct": 12.345, "confidence": 0.9, "model_type": service.model_type,
+                "model_version": service.model_version,
+            }])
+        subscription = events.pubsub.subscribe([prediction_topic("STORED"), prediction_topic("LIVE")])
+        try:
+            published = await events.publish_prediction_refreshes(
+                service, async_sessionmaker(engine, expire_on_commit=False)
+            )
+            messages = [await subscription.get() for _ in range(2)]
+        finally:
+            events.pubsub.unsubscribe(subscription)
+            await engine.dispose()
+        return published, messages
+    
+    published, messages = asyncio.run(main())
+    data = {item["symbol"]: item for item in (json.loads(m.split("data: ", 1)[1]) for m in messages)}
+    assert published == 2
+    assert data["STORED"]["prediction"]["deltaPct"] == 12.35
+    assert data["LIVE"]["prediction"] == service.get_prediction("LIVE", "1d", now)["prediction"]
@@ -0,0 +1,90 @@
+import json
+import pytest
+from app.services.keyword_matcher import KeywordMatcher
+from app.services.news_service import NewsService
+from app.services.sentiment_service import SentimentService
+
+sentiment_service = SentimentService()
+
+HEADLINES = NewsService().news_pool + [
+    "",
+    "Shares crash, then rise and surge higher",
+    "İstanbul exchange reports strong growth",
+]
+
+def test_analyze_sentiment():
+    """Test single headline sentiment is deterministic and labelled"""
+    result = sentiment_service.analyze_sentiment("Company beats earnings with strong growth")
+    
+    assert result["sentiment"] == "Positive"
+    assert 0.6 <= result["sentimentScore"] <= 0.9
+    assert sentiment_service.analyze_sentiment("Company beats earnings with strong growth") == result
+
+def test_analyze_batch_matches_single():
+    """Test the vectorized batch engine agrees with analyze_sentiment"""
+    expected = [sentiment_service.analyze_sentiment(headline) for headline in HEADLINES]
+    assert sentiment_service.analyze_batch(HEADLINES) == expected
+    assert sentiment_service.analyze_batch([]) == []
+
+def test_analyze_columns():
+    """Test columnar results have one entry per headline"""
+    columns = sentiment_service.analyze_columns(HEADLINES)
+    
+    assert set(columns) == {"sentiment", "sentimentScore", "positiveCount", "negativeCount"}
+    for column in columns.values():
+        assert len(column) == len(HEADLINES)
+    assert columns["sentiment"].tolist() == [
+        item["sentiment"] for item in sentiment_service.analyze_batch(HEADLINES)
+    ]
+
+def test_keywords_match_on_word_boundaries():
+    """Test keywords no longer match inside longer words"""
+    result = sentiment_service.analyze_sentiment("Analyst upgrade lifts window makers despite disruption")
+    assert result["sentiment"] == "Neutral"
+    
+    # Inflected forms of a keyword still match
+    assert sentiment_service.analyze_sentiment("Shares surged and dropped, then dropped again")["sentiment"] == "Neutral"
+    assert sentiment_service.analyze_sentiment("Chipmaker beats estimates")["sentiment"] == "Positive"
+
+def test_inflections_are_real_words():
+    """Test only listed forms match, including irregular ones, and no suffix-rule non-words"""
+    matcher = KeywordMatcher(["win", "beat", "rise", "wine"])
+    
+    assert matcher.find("wins won winning beats beaten rose risen") == [0, 0, 0, 1, 1, 2, 2]
+    assert matcher.find("wines wined wining winned beates beated beatted rised") == []
+    assert matcher.find("Winery tour, wine tasting") == [3]
+    assert sentiment_service.analyze_sentiment("Shares fell as the company won nothing")["sentiment"] == "Neutral"
+    assert sentiment_service.analyze_sentiment("Exporter wined and dined buyers")["sentiment"] == "Neutral"
+
+def test_keyword_matcher_phrases():
+    """Test multi-word and overlapping patterns are all found in one pass"""
+    matcher = KeywordMatcher(["price target cut", "target", "a b a c"], inflect=False)
+    
+    assert matcher.find("Price target cut; target raised") == [1, 0, 1]
+    assert matcher.find("a b a b a c") == [2]
+    
+    rows, keyword_ids = matcher.find_batch(["price target", "price target cut", "a b", "a c"])
+    assert rows.tolist() == [0, 1, 1]
+    assert keyword_ids.tolist() == [1, 1, 0]
+
+def test_lexicon_file(tmp_path):
+    """Test keyword lists loaded from a lexicon file replace the defaults"""
+    path = tmp_path / "lexicon.json"
+    path.write_text(json.dumps({"positive": ["buyback", "record high", ["upgrade", "upgraded"], "beat"]}))
+    service = SentimentService(lexicon_path=str(path))
+    
+    assert service.analyze_sentiment("Board approves buyback")["sentiment"] == "Positive"
+    assert service.analyze_sentiment("Analyst upgraded the stock")["sentiment"] == "Positive"
+    # File keywords are matched as written, without inflections
+    assert service.analyze_sentiment("Board approves buybacks")["sentiment"] == "Neutral"
+    assert service.analyze_sentiment("Company beats estimates")["sentiment"] == "Neutral"
+    assert service.analyze_sentiment("Index closes at a record high")["sentiment"] == "Positive"
+    assert service.analyze_sentiment("Stock drops")["sentiment"] == "Negative"
+    
+    path.write_text(json.dumps({"neutral": ["flat"]}))
+    with pytest.raises(ValueError):
+        SentimentService(lexicon_path=str(path))
+    
+    path.write_text(json.dumps({"positive": [["buyback", 1]]}))
+    with pytest.raises(ValueError):
+        SentimentService(lexicon_path=str(path))
@@ -0,0 +1,12 @@
+from app.core.config import settings
+from app.db.session import sync_engine_options
+
+def test_sync_engine_options_only_pass_sqlite_connect_args_to_sqlite():
+    """Test check_same_thread is SQLite-only and other backends get the pool settings"""
+    assert sync_engine_options("sqlite:///./feather.db") == {"connect_args": {"check_same_thread": False}}
+
+    options = sync_engine_options("postgresql://feather:secret@db/feather")
+    assert "connect_args" not in options
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import pytest
+from app.core.singleflight import SingleFlight
+from app.services.ensemble import load_predictor
+from app.services.prediction_service import PredictionService
+
+def test_call_shares_one_run_across_threads():
+    """Test identical concurrent calls run once and all get the leader's result"""
+    flight = SingleFlight("test-threads")
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def work():
+        runs.append(1)
+        started.set()
+        release.wait(1)
+        return object()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.call, "key", work)
+        started.wait(1)
+        followers = [pool.submit(flight.call, "key", work) for _ in range(7)]
+        while flight.followers < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(runs) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 7}
+    # Nothing is cached once the call has finished
+    flight.call("key", work)
+    assert len(runs) == 2
+
+def test_call_shares_exceptions():
+    """Test followers receive the leader's exception and the key is released"""
+    flight = SingleFlight("test-errors")
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("lookup failed")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.call, "key", fail)
+        started.wait(1)
+        follower = pool.submit(flight.call, "key", fail)
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert flight.stats()["in_flight"] == 0
+
+def test_do_coalesces_coroutines_and_survives_cancellation():
+    """Test concurrent awaits share one coroutine run that a cancelled caller cannot stop"""
+    flight = SingleFlight("test-async")
+    runs = []
+
+    async def work(value):
+        runs.append(value)
+        await asyncio.sleep(0.02)
+        return value * 2
+
+    async def main():
+        callers = [asyncio.ensure_future(flight.do("key", work, 21)) for _ in range(5)]
+        await asyncio.sleep(0)
+        callers[0].cancel()
+        results = await asyncio.gather(*callers[1:])
+        assert callers[0].cancelled()
+        return results
+
+    assert asyncio.run(main()) == [42] * 4
+    assert runs == [21]
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "followers": 4}
+
+def test_prediction_misses_from_threads_are_scored_once():
+    """Test concurrent identical get_prediction misses make one model call"""
+    predictor = load_predictor()
+    calls = []
+
+    class SlowPredictor:
+        version = predictor.version
+
+        def predict(self, symbols, window, as_of):
+            calls.append(list(symbols))
+            time.sleep(0.05)
+            return predictor.predict(symbols, window, as_of)
+
+    service = PredictionService(cache_size=16, predictor=SlowPredictor())
+    now = datetime.now()
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda _: service.get_prediction("HOT", "1d", now), range(16)))
+
+    assert calls == [["HOT"]]
+    assert all(result is results[0] for result in results)
@@ -0,0 +1,57 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+def test_add_to_watchlist_rejects_duplicate(setup_database):
+    """Test adding a symbol twice hits the unique constraint and returns 400"""
+    login_response = client.post("/auth/login", json={
+        "email": "watchlist@example.com",
+        "password": "testpassword"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    
+    response = client.post("/api/watchlist", json={"symbol": "aapl"}, headers=headers)
+    assert response.status_code == 200
+    response = client.post("/api/watchlist", json={"symbol": "AAPL"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Symbol already in watchlist"
+    assert client.get("/api/watchlist", headers=headers).json()["items"] == ["AAPL"]
+
+def test_bulk_watchlist_operations(setup_database):
+    """Test bulk add/remove/replace report per-symbol outcomes"""
+    login_response = client.post("/auth/login", json={
+        "email": "bulk@example.com",
+        "password": "testpassword"
+    })
+    headers = {"Authorization": f"Bearer {login_response.json()['access_token']}"}
+    client.post("/api/watchlist", json={"symbol": "MSFT"}, headers=headers)
+    
+    response = client.post("/api/watchlist/bulk/add", json={
+        "symbols": ["aapl", "MSFT", "AAPL", "not a symbol", "brk.b"]
+    }, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"symbol": "AAPL", "status": "added"},
+        {"symbol": "MSFT", "status": "exists"},
+        {"symbol": "AAPL", "status": "duplicate"},
+        {"symbol": "not a symbol", "status": "invalid"},
+        {"symbol": "BRK.B", "status": "added"},
+    ]
+    
+    response = client.post("/api/watchlist/bulk/remove", json={
+        "symbols": ["BRK.B", "TSLA"]
+    }, headers=headers)
+    assert response.json()["results"] == [
+        {"symbol": "BRK.B", "status": "removed"},
+        {"symbol": "TSLA", "status": "not_found"},
+    ]
+    
+    response = client.put("/api/watchlist", json={"symbols": ["NVDA", "AAPL"]}, headers=headers)
+    assert response.json()["results"] == [
+        {"symbol": "NVDA", "status": "added"},
+        {"symbol": "AAPL", "status": "exists"},
+        {"symbol": "MSFT", "status": "removed"},
+    ]
+    items = client.get("/api/watchlist", headers=headers).json()["items"]
+    assert sorted(items) == ["AAPL", "NVDA"]
@@ -0,0 +1,33 @@
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.db.session import Base
+from app.models.lease import WorkerLease
+from app.services.worker_lease import claim_lease
+
+def test_claim_lease_admits_one_holder_until_expiry():
+    """Test only the holder renews a live lease and an expired one passes to another worker"""
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        claims = []
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            claims.append(await claim_lease(db, "job", "a", 60))
+            claims.append(await claim_lease(db, "job", "b", 60))
+            claims.append(await claim_lease(db, "job", "a", 60))
+            claims.append(await claim_lease(db, "other", "b", 60))
+            
+            await db.execute(
+                update(WorkerLease.__table__)
+                .where(WorkerLease.name == "job")
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+            await db.commit()
+            claims.append(await claim_lease(db, "job", "b", 60))
+            claims.append(await claim_lease(db, "job", "a", 60))
+        await engine.dispose()
+        return claims
+    
+    assert asyncio.run(main()) == [True, False, True, True, True, False]